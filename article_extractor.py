@@ -0,0 +1,537 @@
+"""
+기사 본문 추출과 요약
+
+RSS에는 제목과 링크만 있어 Gemini가 분석 내용을 지어내기 쉬우므로, 프롬프트에 넣을 기사는
+원문 페이지를 받아 본문을 뽑고 토큰 예산에 맞게 요약해 함께 넣습니다.
+
+- 링크 풀기: 구글 뉴스 링크(news.google.com/rss/articles/...)를 언론사 원문 주소로 바꿈
+  (예전 형식은 링크 안에 주소가 들어 있어 네트워크 없이, 새 형식은 batchexecute 요청 한 번으로)
+- 본문 추출: 스크립트/메뉴/광고/댓글 등을 건너뛰고 링크 비율이 낮은 긴 문단만 남기는
+  가벼운 보일러플레이트 제거 (표준 라이브러리 HTMLParser, 추가 패키지 없음)
+- 요약: 단어 빈도/제목 겹침/위치로 문장 점수를 매겨 예산 안에서 고르는 추출 요약
+- 캐시: 정규화한 원문 주소(canonical URL)를 키로 본문을 저장하고, 구글 뉴스 링크/리다이렉트 주소도
+  같은 기사로 연결해 두어 같은 기사를 실행이 바뀌어도 두 번 받지 않음
+"""
+
+import base64
+import json
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+from html.parser import HTMLParser
+
+import requests
+
+import telemetry
+from cache_store import cache_path
+from news_dedup import canonicalize_link
+from prompt_builder import estimate_tokens
+
+GOOGLE_NEWS_HOST = 'news.google.com'
+GOOGLE_BATCH_URL = 'https://news.google.com/_/DotsSplashUi/data/batchexecute'
+USER_AGENT = 'Mozilla/5.0 (compatible; finance-autopost/1.0)'
+
+# 본문을 통째로 저장할 최대 글자 수 (요약 예산이 바뀌어도 다시 받지 않도록 요약 전 본문을 저장)
+MAX_STORED_CHARS = 20000
+# 본문으로 인정할 문단 최소 길이와 최대 링크 비율
+MIN_BLOCK_CHARS = 60
+MAX_LINK_DENSITY = 0.33
+
+# ==========================================
+# 구글 뉴스 링크 풀기
+# ==========================================
+def is_google_news_link(link):
+    return urllib.parse.urlsplit(link).netloc.lower() == GOOGLE_NEWS_HOST
+
+def _article_id(link):
+    parts = urllib.parse.urlsplit(link).path.split('/')
+    return parts[-1] if 'articles' in parts else None
+
+def decode_google_news_link(link):
+    """
+    예전 형식(CBMi...)의 구글 뉴스 링크에 들어 있는 원문 주소를 꺼냅니다. (네트워크 없음)
+    새 형식이거나 해석할 수 없으면 None을 돌려줍니다.
+    """
+    article_id = _article_id(link)
+    if not article_id:
+        return None
+    try:
+        data = base64.urlsafe_b64decode(article_id + '=' * (-len(article_id) % 4))
+    except ValueError:
+        return None
+    # protobuf: 08 13 22 <길이(varint)> <주소> ...
+    if not data.startswith(b'\x08\x13"'):
+        return None
+    data = data[3:]
+    length, shift, position = 0, 0, 0
+    while position < len(data):
+        byte = data[position]
+        length |= (byte & 0x7f) << shift
+        position += 1
+        if not byte & 0x80:
+            break
+        shift += 7
+    url = data[position:position + length].decode('utf-8', errors='ignore')
+    return url if url.startswith(('http://', 'https://')) else None
+
+def resolve_google_news_link(session, link, timeout):
+    """
+    새 형식의 구글 뉴스 링크를 원문 주소로 바꿉니다.
+    기사 페이지에서 서명(data-n-a-sg)과 시각(data-n-a-ts)을 읽어 batchexecute로 주소를 받습니다.
+    """
+    article_id = _article_id(link)
+    if not article_id:
+        return None
+    page = session.get(f"https://{GOOGLE_NEWS_HOST}/rss/articles/{article_id}", timeout=timeout)
+    page.raise_for_status()
+    signature = re.search(r'data-n-a-sg="([^"]+)"', page.text)
+    timestamp = re.search(r'data-n-a-ts="([^"]+)"', page.text)
+    if not signature or not timestamp:
+        return None
+
+    request = ["Fbv4je", (
+        '["garturlreq",[["X","X",["X","X"],null,null,1,1,"US:en",null,1,null,null,null,null,null,0,1],'
+        f'"X","X",1,[1,1,1],1,1,null,0,0,null,0],"{article_id}",{timestamp.group(1)},"{signature.group(1)}"]'
+    )]
+    response = session.post(
+        GOOGLE_BATCH_URL, timeout=timeout,
+        headers={'Content-Type': 'application/x-www-form-urlencoded;charset=UTF-8'},
+        data=f"f.req={urllib.parse.quote(json.dumps([[request]]))}",
+    )
+    response.raise_for_status()
+    try:
+        payload = json.loads(response.text.split('\n\n')[1])[:-2]
+        url = json.loads(payload[0][2])[1]
+    except (IndexError, TypeError, ValueError):
+        return None
+    return url if isinstance(url, str) and url.startswith(('http://', 'https://')) else None
+
+# ==========================================
+# 본문 추출 (보일러플레이트 제거)
+# ==========================================
+# 안의 내용을 통째로 건너뛰는 태그
+SKIP_TAGS = {'script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form',
+             'iframe', 'svg', 'button', 'select', 'template', 'figcaption'}
+# 문단 경계가 되는 태그
+BLOCK_TAGS = {'p', 'div', 'br', 'li', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'td', 'tr',
+              'table', 'article', 'section', 'blockquote', 'pre', 'dd', 'dt', 'main', 'figure'}
+VOID_TAGS = {'br', 'img', 'meta', 'link', 'input', 'hr', 'source', 'wbr'}
+# class/id가 이런 이름이면 메뉴/광고/댓글 등으로 보고 건너뜀
+BOILERPLATE_NAMES = re.compile(
+    r'comment|reply|footer|gnb|lnb|menu|sidebar|related|recommend|popular|ranking|share|sns|'
+    r'banner|advert|(?:^|[\s_-])ads?(?:[\s_-]|$)|promo|subscribe|copyright|breadcrumb|byline|reporter|tag[-_]?list',
+    re.I,
+)
+# 본문 컨테이너로 보이는 class/id/itemprop
+CONTENT_NAMES = re.compile(r'article|news[-_]?(body|text|view|content)|story|post[-_]?content|entry|articleBody', re.I)
+# 본문 끝에 붙는 저작권/기자 정보 문단
+FOOTER_LINE = re.compile(r'무단\s*전재|재배포\s*금지|저작권자|ⓒ|©|copyright|[\w.-]+@[\w-]+\.[\w.]+', re.I)
+# 첫 문단 앞의 '(서울=연합뉴스)' 같은 발신지 표시
+DATELINE = re.compile(r'^[(\[][^)\]=]{1,15}=[^)\]]{1,20}[)\]]\s*')
+
+class _ArticleParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self.meta = {}
+        self.title = ''
+        self._text = []
+        self._link_chars = 0
+        self._in_link = 0
+        self._in_title = False
+        self._skip = None
+        self._content_depth = []
+        self._depth = 0
+
+    def _flush(self):
+        text = ' '.join(''.join(self._text).split())
+        if text:
+            self.blocks.append({
+                'text': text,
+                'link_density': min(1.0, self._link_chars / len(text)),
+                'content': bool(self._content_depth),
+            })
+        self._text = []
+        self._link_chars = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip:
+            if tag == self._skip[0]:
+                self._skip[1] += 1
+            return
+        attrs = dict(attrs)
+        if tag == 'meta':
+            key = (attrs.get('property') or attrs.get('name') or '').lower()
+            if key in ('og:url', 'og:title', 'og:description', 'description') and attrs.get('content'):
+                self.meta.setdefault(key, attrs['content'].strip())
+            return
+        if tag == 'link':
+            if 'canonical' in (attrs.get('rel') or '').lower().split() and attrs.get('href'):
+                self.meta.setdefault('canonical', attrs['href'].strip())
+            return
+        if tag == 'title':
+            self._in_title = True
+            return
+        names = ' '.join(filter(None, (attrs.get('class'), attrs.get('id'), attrs.get('itemprop'))))
+        if tag in SKIP_TAGS or (names and BOILERPLATE_NAMES.search(names) and not CONTENT_NAMES.search(names)):
+            if tag not in VOID_TAGS:
+                self._flush()
+                self._skip = [tag, 1]
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag == 'a':
+            self._in_link += 1
+        if tag not in VOID_TAGS:
+            self._depth += 1
+            if tag in ('article', 'main') or (names and CONTENT_NAMES.search(names)):
+                self._content_depth.append(self._depth)
+
+    def handle_endtag(self, tag):
+        if self._skip:
+            if tag == self._skip[0]:
+                self._skip[1] -= 1
+                if self._skip[1] == 0:
+                    self._skip = None
+            return
+        if tag == 'title':
+            self._in_title = False
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag == 'a':
+            self._in_link = max(0, self._in_link - 1)
+        if tag not in VOID_TAGS:
+            if self._content_depth and self._content_depth[-1] >= self._depth:
+                self._content_depth.pop()
+            self._depth = max(0, self._depth - 1)
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if self._in_title:
+            self.title += data
+            return
+        self._text.append(data)
+        if self._in_link:
+            self._link_chars += len(data.strip())
+
+def extract_article(html):
+    """
+    HTML에서 본문을 뽑습니다.
+
+    - 링크 비율이 낮고 충분히 긴 문단을 본문으로 보고, 그 사이에 낀 짧은 문단도 남김
+    - <article>이나 본문 이름의 컨테이너 안에 본문이 충분하면 그 안의 문단만 사용
+    - 기사 제목과 저작권/기자 이메일 문단은 제외
+
+    Returns:
+        {'title', 'canonical', 'description', 'text'} (본문 문단은 줄바꿈으로 구분)
+    """
+    parser = _ArticleParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        # 깨진 HTML이라도 그때까지 읽은 문단은 사용
+        pass
+    parser._flush()
+
+    title = parser.meta.get('og:title') or ' '.join(parser.title.split())
+    # 본문 위에 다시 나오는 기사 제목(h1)과 저작권/기자 이메일 문단은 제외
+    blocks = [block for block in parser.blocks
+              if not FOOTER_LINE.search(block['text']) and not (title and block['text'] in title)]
+    good = [len(block['text']) >= MIN_BLOCK_CHARS and block['link_density'] < MAX_LINK_DENSITY for block in blocks]
+    for i in range(1, len(blocks) - 1):
+        # 긴 본문 문단 사이에 낀 짧은 문단(소제목, 짧은 인용)도 본문으로 봄
+        if not good[i] and good[i - 1] and good[i + 1] and blocks[i]['link_density'] < MAX_LINK_DENSITY:
+            good[i] = True
+    kept = [block for block, ok in zip(blocks, good) if ok]
+    in_content = [block for block in kept if block['content']]
+    if sum(len(block['text']) for block in in_content) >= 200:
+        kept = in_content
+
+    return {
+        'title': title,
+        'canonical': parser.meta.get('canonical') or parser.meta.get('og:url') or '',
+        'description': parser.meta.get('og:description') or parser.meta.get('description') or '',
+        'text': '\n'.join(DATELINE.sub('', block['text']) for block in kept),
+    }
+
+def decode_html(data, content_type=''):
+    """
+    응답 바이트를 문자열로 바꿉니다. (헤더 → <meta charset> → UTF-8 → CP949 순)
+    """
+    match = re.search(r'charset=["\']?([\w-]+)', content_type or '', re.I)
+    if not match:
+        match = re.search(rb'<meta[^>]+charset=["\']?([\w-]+)', data[:4096], re.I)
+    candidates = []
+    if match:
+        charset = match.group(1)
+        candidates.append(charset.decode('ascii', 'ignore') if isinstance(charset, bytes) else charset)
+    candidates += ['utf-8', 'cp949']
+    for charset in candidates:
+        try:
+            # EUC-KR로 표시된 페이지도 확장 한글이 섞인 경우가 많아 CP949로 읽음
+            return data.decode('cp949' if charset.lower() in ('euc-kr', 'ks_c_5601-1987') else charset)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return data.decode('utf-8', errors='replace')
+
+# ==========================================
+# 추출 요약
+# ==========================================
+_SENTENCE_END = re.compile(r'(?<=[.!?。…])["”’)\]]*\s+')
+_TERM = re.compile(r'[가-힣]+|[A-Za-z]{2,}|\d+(?:[.,]\d+)*%?')
+
+def _terms(text):
+    """
+    문장의 비교용 단어 집합 (한글은 조사가 붙어도 맞도록 두 글자씩 자름)
+    """
+    terms = set()
+    for word in _TERM.findall(text):
+        if word[0] >= '가' and len(word) > 1:
+            terms.update(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            terms.add(word.lower())
+    return terms
+
+def split_sentences(text):
+    sentences = []
+    for paragraph in text.split('\n'):
+        sentences.extend(s.strip() for s in _SENTENCE_END.split(paragraph) if s.strip())
+    return sentences
+
+def summarize_text(text, budget, title='', counter=estimate_tokens):
+    """
+    본문에서 중요한 문장을 골라 budget 토큰 안의 요약을 만듭니다. (원래 문장 순서 유지)
+
+    문장 점수 = 본문 전체 단어 빈도(평균) + 제목과 겹치는 정도 + 앞쪽 문장 가산 + 수치 포함 가산
+    이미 고른 문장과 단어가 많이 겹치는 문장은 건너뜁니다.
+    """
+    sentences = [s for s in split_sentences(text) if len(s) >= 15]
+    if not sentences or budget <= 0:
+        return ''
+    term_sets = [_terms(s) for s in sentences]
+    frequency = {}
+    for terms in term_sets:
+        for term in terms:
+            frequency[term] = frequency.get(term, 0) + 1
+    title_terms = _terms(title)
+
+    scores = []
+    for position, (sentence, terms) in enumerate(zip(sentences, term_sets)):
+        if not terms:
+            scores.append(0.0)
+            continue
+        centrality = sum(frequency[t] for t in terms) / len(terms) / len(sentences)
+        overlap = len(terms & title_terms) / len(title_terms) if title_terms else 0.0
+        lead = 1 / (1 + position * 0.5)
+        numbers = 0.1 if re.search(r'\d', sentence) else 0.0
+        scores.append(centrality + 0.6 * overlap + 0.4 * lead + numbers)
+
+    chosen = []
+    used = 0
+    for i in sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True):
+        cost = counter(sentences[i]) + 1
+        if used + cost > budget:
+            continue
+        if any(len(term_sets[i] & term_sets[j]) > 0.6 * min(len(term_sets[i]), len(term_sets[j]) or 1) for j in chosen):
+            continue
+        chosen.append(i)
+        used += cost
+    if not chosen:
+        # 첫 문장조차 예산보다 길면 앞부분만 자름
+        lead = sentences[0]
+        while lead and counter(lead) > budget:
+            lead = lead[:int(len(lead) * 0.8)]
+        return lead.rstrip() + '…' if lead else ''
+    return ' '.join(sentences[i] for i in sorted(chosen))
+
+# ==========================================
+# 본문 캐시 (canonical URL 기준)
+# ==========================================
+class ArticleCache:
+    """
+    원문 주소 → 추출한 본문 캐시 (SQLite, TTL 적용)
+
+    - articles: 정규화한 원문 주소(canonical)를 키로 제목, 본문, 성공 여부 저장
+    - article_links: 구글 뉴스 링크, 리다이렉트 전후 주소 등 → canonical 연결
+    실패한 기사는 failure_ttl 동안만 기억해 두었다가 다시 시도합니다.
+    """
+
+    def __init__(self, path=None, ttl_days=30, failure_ttl_hours=6):
+        self.path = path or cache_path('articles.db')
+        self.ttl = ttl_days * 86400
+        self.failure_ttl = failure_ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                " url TEXT PRIMARY KEY,"
+                " title TEXT,"
+                " text TEXT NOT NULL,"
+                " ok INTEGER NOT NULL,"
+                " fetched_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS article_links ("
+                " link TEXT PRIMARY KEY,"
+                " url TEXT NOT NULL)"
+            )
+        self.evict_expired()
+
+    def evict_expired(self, now=None):
+        now = now or time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM articles WHERE (ok = 1 AND fetched_at < ?) OR (ok = 0 AND fetched_at < ?)",
+                (now - self.ttl, now - self.failure_ttl),
+            )
+            self._conn.execute("DELETE FROM article_links WHERE url NOT IN (SELECT url FROM articles)")
+
+    def lookup(self, link):
+        """
+        링크(구글 뉴스 링크, 원문 주소 모두 가능)에 해당하는 저장된 기사를 돌려줍니다. (없으면 None)
+        """
+        key = canonicalize_link(link)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, title, text, ok FROM articles WHERE url = ?"
+                " OR url = (SELECT url FROM article_links WHERE link = ?)", (key, key),
+            ).fetchone()
+        if row is None:
+            return None
+        return {'url': row[0], 'title': row[1], 'text': row[2], 'ok': bool(row[3])}
+
+    def store(self, links, url, title='', text='', ok=True, now=None):
+        """
+        기사를 canonical 주소로 저장하고, 같은 기사를 가리키는 링크들을 연결합니다.
+        """
+        key = canonicalize_link(url)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO articles (url, title, text, ok, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (key, title, text[:MAX_STORED_CHARS], int(ok), now or time.time()),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO article_links (link, url) VALUES (?, ?)",
+                [(canonicalize_link(link), key) for link in links if link and canonicalize_link(link) != key],
+            )
+        return {'url': key, 'title': title, 'text': text[:MAX_STORED_CHARS], 'ok': ok}
+
+    def link(self, links, url):
+        """
+        이미 저장된 기사에 링크만 더 연결합니다. (저장 시각은 그대로 두어 TTL이 계속 흐름)
+        """
+        key = canonicalize_link(url)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO article_links (link, url) VALUES (?, ?)",
+                [(canonicalize_link(link), key) for link in links if link and canonicalize_link(link) != key],
+            )
+
+    def store_failure(self, link):
+        """
+        받지 못한 기사를 failure_ttl 동안 기억합니다.
+        주소가 들어 있는 구글 뉴스 링크면 원문 주소로 저장해, 다른 링크로 같은 기사를 만나도 건너뜁니다.
+        """
+        url = decode_google_news_link(link) if is_google_news_link(link) else None
+        return self.store([link], url or link, ok=False)
+
+    def close(self):
+        self._conn.close()
+
+# ==========================================
+# 원문 받기
+# ==========================================
+def new_session(pool_size=8):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+def resolve_news_link(session, link, timeout):
+    """
+    구글 뉴스 링크면 원문 주소로 바꾸고, 아니면 그대로 돌려줍니다. (풀 수 없으면 None)
+    일반 HTTP 리다이렉트는 본문을 받을 때 따라갑니다.
+    """
+    if not is_google_news_link(link):
+        return link
+    decoded = decode_google_news_link(link)
+    if decoded:
+        return decoded
+    started = time.monotonic()
+    try:
+        url = resolve_google_news_link(session, link, timeout)
+    except requests.RequestException:
+        telemetry.record_request('article', seconds=time.monotonic() - started, error=True)
+        raise
+    telemetry.record_request('article', seconds=time.monotonic() - started, error=url is None)
+    return url
+
+def download_page(session, url, timeout, max_bytes):
+    """
+    페이지를 받아 (최종 주소, HTML 문자열)을 돌려줍니다.
+    느리게 흘러오는 응답은 timeout(초)을, 너무 큰 페이지는 max_bytes를 넘는 부분을 버립니다.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    chunks = []
+    size = 0
+    try:
+        with session.get(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            if 'html' not in content_type and 'xml' not in content_type and content_type:
+                raise ValueError(f"HTML이 아닌 응답 ({content_type})")
+            for chunk in response.iter_content(chunk_size=16384):
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"본문 수신 시간 초과 ({timeout}초)")
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= max_bytes:
+                    break
+            final_url = response.url
+    except Exception:
+        telemetry.record_request('article', bytes_in=size, seconds=time.monotonic() - started, error=True)
+        raise
+    telemetry.record_request('article', bytes_in=size, seconds=time.monotonic() - started)
+    return final_url, decode_html(b''.join(chunks)[:max_bytes], content_type)
+
+def fetch_article(session, link, cache=None, timeout=8, max_bytes=2 * 1024 * 1024):
+    """
+    기사 원문을 받아 본문을 추출합니다. 캐시에 있으면 네트워크 요청 없이 돌려줍니다.
+
+    Returns:
+        {'url', 'title', 'text', 'ok'} (본문을 얻지 못하면 ok=False)
+    """
+    record = cache.lookup(link) if cache else None
+    if record is not None:
+        telemetry.count('article_cache_hits')
+        return record
+
+    url = resolve_news_link(session, link, timeout)
+    if not url:
+        raise ValueError("구글 뉴스 링크를 원문 주소로 풀지 못했습니다")
+    record = cache.lookup(url) if cache and url != link else None
+    if record is not None:
+        # 다른 구글 뉴스 링크로 이미 받은 기사
+        telemetry.count('article_cache_hits')
+        cache.link([link], record['url'])
+        return record
+
+    final_url, html = download_page(session, url, timeout, max_bytes)
+    extracted = extract_article(html)
+    text = extracted['text'] or extracted['description']
+    canonical = extracted['canonical'] or final_url
+    if not canonical.startswith(('http://', 'https://')):
+        canonical = urllib.parse.urljoin(final_url, canonical)
+    links = [link, url, final_url]
+    if cache:
+        return cache.store(links, canonical, extracted['title'], text, ok=bool(text))
+    return {'url': canonicalize_link(canonical), 'title': extracted['title'], 'text': text, 'ok': bool(text)}
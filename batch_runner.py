@@ -0,0 +1,78 @@
+"""
+배치 모드: 한 번의 실행으로 여러 주제의 포스트를 생성합니다.
+
+- 모든 주제의 키워드 피드를 한 번만 수집해서 나눠 쓰고
+- Gemini 호출은 동시 실행 수와 요청 간격을 제한해 병렬로 돌리며
+- 완성된 포스트는 모든 주제를 기다리지 않고 WP_BATCH_FLUSH_SIZE개씩(또는 첫 글이 WP_BATCH_FLUSH_SECONDS초
+  기다리면 그때까지 모인 만큼) batch/v1로 묶어 발행합니다. WP_BATCH_PUBLISH=false면 완성되는 대로 한 건씩 발행합니다.
+
+사용법:
+    python batch_runner.py topics.json
+
+topics.json 예시:
+    [
+        {"name": "미국 증시", "keywords": ["미국 증시", "나스닥"], "category_id": 3, "status": "publish"},
+        {"name": "금리", "keywords": ["FOMC", "연준 금리"], "category": "economy", "tags": ["금리", "FOMC"], "status": "draft"}
+    ]
+"""
+
+import json
+import os
+import sys
+
+import wordpress_bot as bot
+
+# 동시에 생성할 최대 포스트 수, Gemini 요청 사이 최소 간격(초)
+BATCH_MAX_CONCURRENCY = int(os.environ.get('BATCH_MAX_CONCURRENCY', 3))
+BATCH_MIN_INTERVAL = float(os.environ.get('BATCH_MIN_INTERVAL', 2))
+
+def load_topics(path):
+    """
+    주제 목록 JSON 파일을 읽고 기본값을 채웁니다.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        topics = json.load(f)
+    
+    specs = []
+    for i, topic in enumerate(topics, 1):
+        keywords = [k.strip() for k in topic.get('keywords', []) if k.strip()]
+        if not keywords:
+            raise ValueError(f"{i}번째 주제에 keywords가 없습니다.")
+        spec = {
+            'name': topic.get('name') or keywords[0],
+            'keywords': keywords,
+            'status': topic.get('status', bot.POST_STATUS),
+        }
+        # category_id 대신 카테고리 이름/슬러그(category)로 지정할 수도 있음
+        if topic.get('category_id'):
+            spec['category_id'] = int(topic['category_id'])
+        elif topic.get('category'):
+            spec['category'] = topic['category']
+        else:
+            spec['category_id'] = bot.WORDPRESS_CATEGORY_ID
+        if topic.get('tags'):
+            spec['tags'] = list(topic['tags'])
+        specs.append(spec)
+    return specs
+
+def run_batch(topics, max_concurrency=BATCH_MAX_CONCURRENCY, min_interval=BATCH_MIN_INTERVAL, run_name='batch'):
+    """
+    여러 주제의 포스트를 한 번에 생성하고 발행합니다.
+    
+    Returns:
+        [(주제 이름, 포스트 URL 또는 None), ...]
+    """
+    print(f"📦 배치 포스팅 시작: {len(topics)}개 주제 (동시 {max_concurrency}개)")
+    results = bot.run_posts(topics, run_name=run_name, generate_concurrency=max_concurrency, min_interval=min_interval)
+    
+    succeeded = sum(1 for _, url in results if url)
+    print(f"\n📊 배치 결과: {succeeded}/{len(results)}개 발행 성공")
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python batch_runner.py topics.json")
+        sys.exit(1)
+    
+    results = run_batch(load_topics(sys.argv[1]))
+    sys.exit(0 if results and all(url for _, url in results) else 1)
@@ -0,0 +1,314 @@
+"""
+전체 흐름(end-to-end) 오프라인 벤치마크
+
+뉴스 수집 → 글 생성 → 이미지 → 발행까지 run_posts() 전체를 실제 서비스 대신 로컬 대역으로 실행합니다.
+    - 구글 뉴스 RSS: 고정 RSS 템플릿을 돌려주는 로컬 서버 (fixtures/news_rss.xml)
+    - Gemini: 기록된 응답(benchmarks/responses)을 재생하는 MockBackend
+    - Unsplash: 사진 목록/다운로드 추적/이미지 파일을 돌려주는 로컬 서버 (fixtures/unsplash_photo.json)
+    - 워드프레스: 글/미디어/태그/batch/v1 최소 REST 구현 (fixtures/wp_post.json)
+대역마다 지연 시간과 오류율을 정할 수 있습니다.
+
+규모(기본 1, 10, 100건)마다 새 프로세스에서 실행하고 처리량(건/분), 단계별 p50/p95 지연(실행 리포트),
+최대 메모리(RSS)를 잽니다. 결과를 기준값(baselines/end_to_end.json)과 비교해 허용 범위를 넘으면
+종료 코드 1을 돌려줍니다. 기준값은 같은 대역 설정으로 잰 것끼리만 비교합니다.
+
+사용법:
+    python benchmarks/bench_end_to_end.py
+    python benchmarks/bench_end_to_end.py --sizes 1,10 --wp-latency 0.2 --wp-error-rate 0.05
+    python benchmarks/bench_end_to_end.py --save-baseline        # 현재 결과를 기준값으로 저장
+"""
+
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+
+from standins import RSSStandIn, UnsplashStandIn, WordPressStandIn
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baselines', 'end_to_end.json')
+DEFAULT_CORPUS = os.path.join(BENCH_DIR, 'responses')
+STAGES = ('news', 'article', 'generate', 'image', 'media', 'publish')
+
+# 기준값 비교에 쓰는 대역 설정 (하나라도 다르면 비교하지 않음)
+SETTING_KEYS = (
+    'rss_latency', 'rss_error_rate', 'llm_latency', 'llm_chars_per_second', 'llm_error_rate',
+    'unsplash_latency', 'unsplash_error_rate', 'wp_latency', 'wp_error_rate',
+    'concurrency', 'derivatives', 'seed',
+)
+
+# ==========================================
+# 자식 프로세스 (봇 실행)
+# ==========================================
+_TITLE = re.compile(r'"title"\s*:\s*"')
+
+def _replay_backend(options):
+    from llm_backends import MockBackend
+
+    class ReplayBackend(MockBackend):
+        """
+        기록된 응답을 재생하되 프롬프트마다 제목 앞에 태그를 붙입니다.
+        (응답 몇 개를 돌려쓰므로 그대로 두면 발행 기록이 같은 글로 보고 발행을 건너뜀)
+        """
+
+        def _plan(self, prompt):
+            text, delay, failed = super()._plan(prompt)
+            tag = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:6]
+            return _TITLE.sub(lambda m: f"{m.group(0)}[{tag}] ", text, count=1), delay, failed
+
+    return ReplayBackend(
+        options['responses'], latency=options['llm_latency'], chars_per_second=options['llm_chars_per_second'],
+        error_rate=options['llm_error_rate'], seed=options['seed'],
+    )
+
+def _peak_memory_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def child_main(config_path):
+    with open(config_path, 'r', encoding='utf-8') as f:
+        options = json.load(f)
+    tracing = False
+    if _peak_memory_mb() is None:
+        # resource 모듈이 없는 Windows에서는 파이썬 할당량 최댓값으로 대신함
+        import tracemalloc
+        tracemalloc.start()
+        tracing = True
+
+    import wordpress_bot
+    wordpress_bot.set_llm_backend(_replay_backend(options))
+    topics = [{
+        'name': f"bench-{i}",
+        'keywords': [f"벤치마크{i}"],
+        'category_id': 1,
+        'tags': ['벤치마크'],
+        'status': 'publish',
+    } for i in range(options['size'])]
+
+    results = wordpress_bot.run_posts(
+        topics, run_name=f"bench-{options['size']}",
+        generate_concurrency=options['concurrency'], min_interval=0,
+    )
+    reports = sorted(glob.glob(os.path.join(os.environ['RUN_REPORT_DIR'], 'run_*.json')))
+    with open(reports[-1], 'r', encoding='utf-8') as f:
+        report = json.load(f)
+
+    if tracing:
+        import tracemalloc
+        peak_mb = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+    else:
+        peak_mb = _peak_memory_mb()
+    published = sum(1 for _, url in results if url)
+    result = {
+        'posts': options['size'],
+        'published': published,
+        'seconds': report['duration_seconds'],
+        'posts_per_minute': round(published / report['duration_seconds'] * 60, 1) if report['duration_seconds'] else 0.0,
+        'stages': {
+            stage: {'p50': data['p50_seconds'], 'p95': data['p95_seconds']}
+            for stage, data in report['stages'].items()
+        },
+        'services': {
+            service: {key: data[key] for key in ('requests', 'errors', 'retries')}
+            for service, data in report['services'].items()
+        },
+        'peak_memory_mb': peak_mb,
+    }
+    with open(options['output'], 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False)
+
+# ==========================================
+# 부모 프로세스 (대역 실행, 결과 비교)
+# ==========================================
+def _jpeg_bytes():
+    """
+    파생본 생성을 재려면 실제로 디코딩 가능한 이미지가 필요하므로 Pillow로 만듭니다.
+    """
+    from PIL import Image
+    image = Image.radial_gradient('L').resize((1080, 720)).convert('RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=90)
+    return buffer.getvalue()
+
+def run_scenario(size, settings, standins, workdir, verbose=False):
+    rss, unsplash, wp = standins
+    directory = os.path.join(workdir, f"size_{size}")
+    os.makedirs(directory, exist_ok=True)
+    config_path = os.path.join(directory, 'config.json')
+    output_path = os.path.join(directory, 'result.json')
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(settings, size=size, output=output_path), f)
+
+    env = dict(
+        os.environ,
+        BOT_CACHE_DIR=os.path.join(directory, 'cache'),
+        RUN_REPORT_DIR=os.path.join(directory, 'reports'),
+        NEWS_FEED_URL=rss.feed_url_template,
+        UNSPLASH_API_URL=unsplash.url,
+        UNSPLASH_ACCESS_KEY='bench',
+        WORDPRESS_URL=wp.url,
+        WORDPRESS_USERNAME='bench',
+        WORDPRESS_APP_PASSWORD='bench',
+        LLM_BACKEND='mock',
+        USE_IMAGE_DERIVATIVES='true' if settings['derivatives'] else 'false',
+        PYTHONIOENCODING='utf-8',
+    )
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', config_path],
+        cwd=ROOT, env=env,
+        stdout=None if verbose else subprocess.DEVNULL,
+        stderr=None if verbose else subprocess.PIPE,
+        text=True,
+    )
+    if completed.returncode != 0 or not os.path.exists(output_path):
+        raise RuntimeError(f"{size}건 실행 실패 (종료 코드 {completed.returncode})\n{(completed.stderr or '')[-2000:]}")
+    with open(output_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare(results, baseline, tolerance, slack):
+    """
+    기준값보다 나빠진 항목을 돌려줍니다.
+
+    - 처리량: 기준값 × (1 - tolerance)보다 낮으면 실패
+    - 단계별 p95: 기준값 × (1 + tolerance) + slack(초)보다 크면 실패
+    - 최대 메모리: 기준값 × (1 + tolerance)보다 크면 실패
+    - 발행 성공 비율이 기준값보다 낮으면 실패
+    """
+    failures = []
+    for size, result in results.items():
+        base = baseline['results'].get(size)
+        if not base:
+            continue
+        if result['posts_per_minute'] < base['posts_per_minute'] * (1 - tolerance):
+            failures.append(f"{size}건 처리량 {result['posts_per_minute']:.1f}건/분 < 기준 {base['posts_per_minute']:.1f}건/분")
+        if result['published'] / result['posts'] < base['published'] / base['posts']:
+            failures.append(f"{size}건 발행 성공 {result['published']}/{result['posts']} < 기준 {base['published']}/{base['posts']}")
+        for stage, data in result['stages'].items():
+            base_stage = base['stages'].get(stage)
+            if base_stage and data['p95'] > base_stage['p95'] * (1 + tolerance) + slack:
+                failures.append(f"{size}건 {stage} p95 {data['p95']:.3f}초 > 기준 {base_stage['p95']:.3f}초")
+        if result['peak_memory_mb'] and base.get('peak_memory_mb'):
+            if result['peak_memory_mb'] > base['peak_memory_mb'] * (1 + tolerance):
+                failures.append(f"{size}건 최대 메모리 {result['peak_memory_mb']:.1f}MB > 기준 {base['peak_memory_mb']:.1f}MB")
+    return failures
+
+def print_results(results):
+    print(f"\n{'규모':>5} {'발행':>5} {'소요(초)':>9} {'처리량(건/분)':>14} {'최대 메모리(MB)':>16}")
+    for size, result in results.items():
+        memory = f"{result['peak_memory_mb']:.1f}" if result['peak_memory_mb'] else '-'
+        print(f"{size:>5} {result['published']:>5} {result['seconds']:>9.2f} {result['posts_per_minute']:>14.1f} {memory:>16}")
+
+    print(f"\n단계별 지연 p50 / p95 (초)")
+    print(f"{'규모':>5} " + ' '.join(f"{stage:>15}" for stage in STAGES))
+    for size, result in results.items():
+        cells = []
+        for stage in STAGES:
+            data = result['stages'].get(stage)
+            cells.append(f"{data['p50']:.2f} / {data['p95']:.2f}" if data else '-')
+        print(f"{size:>5} " + ' '.join(f"{cell:>15}" for cell in cells))
+
+    print(f"\n서비스별 요청 (요청 / 오류 / 재시도)")
+    for size, result in results.items():
+        services = ', '.join(f"{service} {data['requests']}/{data['errors']}/{data['retries']}"
+                             for service, data in result['services'].items())
+        print(f"{size:>5}  {services}")
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 흐름 오프라인 벤치마크")
+    parser.add_argument('--sizes', default='1,10,100', help="실행할 글 수 목록 (쉼표로 구분)")
+    parser.add_argument('--concurrency', type=int, default=3, help="동시에 생성할 최대 글 수")
+    parser.add_argument('--responses', default=DEFAULT_CORPUS, help="재생할 Gemini 응답 폴더")
+    parser.add_argument('--rss-latency', type=float, default=0.05)
+    parser.add_argument('--rss-error-rate', type=float, default=0.0)
+    parser.add_argument('--llm-latency', type=float, default=0.3, help="Gemini 첫 응답까지 지연(초)")
+    parser.add_argument('--llm-chars-per-second', type=float, default=0, help="Gemini 출력 속도 (0이면 즉시)")
+    parser.add_argument('--llm-error-rate', type=float, default=0.0)
+    parser.add_argument('--unsplash-latency', type=float, default=0.1)
+    parser.add_argument('--unsplash-error-rate', type=float, default=0.0)
+    parser.add_argument('--wp-latency', type=float, default=0.05)
+    parser.add_argument('--wp-error-rate', type=float, default=0.0)
+    parser.add_argument('--derivatives', action='store_true', help="반응형 파생본 생성 포함 (Pillow 필요)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="기준값 파일")
+    parser.add_argument('--save-baseline', action='store_true', help="이번 결과를 기준값으로 저장")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="허용 변화 비율 (0.25 = 25%%)")
+    parser.add_argument('--slack', type=float, default=0.05, help="p95 비교 시 더해 주는 여유(초)")
+    parser.add_argument('--verbose', action='store_true', help="봇 출력 보기")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child_main(args.child)
+        return 0
+
+    settings = {key: getattr(args, key) for key in SETTING_KEYS}
+    settings['responses'] = os.path.abspath(args.responses)
+    image_bytes = _jpeg_bytes() if args.derivatives else b''
+    standins = (
+        RSSStandIn(latency=args.rss_latency, error_rate=args.rss_error_rate, seed=args.seed).start(),
+        UnsplashStandIn(image_bytes=image_bytes, latency=args.unsplash_latency,
+                        error_rate=args.unsplash_error_rate, seed=args.seed).start(),
+        WordPressStandIn(latency=args.wp_latency, error_rate=args.wp_error_rate, seed=args.seed).start(),
+    )
+
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='bench_end_to_end_')
+    try:
+        for size in [int(s) for s in args.sizes.split(',') if s.strip()]:
+            print(f"▶️ {size}건 실행 중...", flush=True)
+            results[str(size)] = run_scenario(size, settings, standins, workdir, args.verbose)
+    finally:
+        for standin in standins:
+            standin.stop()
+    print_results(results)
+
+    compared = {key: settings[key] for key in SETTING_KEYS}
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': sys.version.split()[0],
+                'settings': compared,
+                'results': results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 기준값 저장: {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"\n⚠️ 기준값이 없습니다. --save-baseline으로 만드세요: {args.baseline}")
+        return 0
+    if baseline['settings'] != compared:
+        changed = [key for key in SETTING_KEYS if baseline['settings'].get(key) != compared[key]]
+        print(f"\n⚠️ 기준값과 대역 설정이 달라 비교하지 않습니다: {', '.join(changed)}")
+        return 0
+
+    failures = compare(results, baseline, args.tolerance, args.slack)
+    if failures:
+        print("\n❌ 성능 회귀:")
+        for failure in failures:
+            print(f"   - {failure}")
+        return 1
+    print(f"\n✅ 기준값 대비 허용 범위(±{args.tolerance:.0%}) 안")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+글 생성 단계 오프라인 벤치마크
+
+기록된 응답을 재생하는 MockBackend로 generate_blog_content()를 동시에 여러 번 호출해
+처리량과 지연 시간(p50/p95)을 측정합니다. Gemini API를 호출하지 않으므로 할당량을 쓰지 않습니다.
+
+사용법:
+    python benchmarks/bench_generation.py
+    python benchmarks/bench_generation.py --requests 40 --concurrency 1,4,8 --latency 2 --error-rate 0.1
+    python benchmarks/bench_generation.py --responses recorded_responses/
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 벤치마크 결과가 실제 생성 통계/캐시에 섞이지 않도록 임시 캐시 폴더 사용
+os.environ.setdefault('BOT_CACHE_DIR', tempfile.mkdtemp(prefix='bench_generation_'))
+
+import wordpress_bot
+from llm_backends import MockBackend
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'responses')
+
+def percentile(values, ratio):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(ratio * (len(ordered) - 1))))]
+
+def run(backend, requests, concurrency):
+    """
+    Returns:
+        {'seconds', 'latencies', 'failed'}
+    """
+    wordpress_bot.set_llm_backend(backend)
+
+    def call(i):
+        started = time.perf_counter()
+        try:
+            wordpress_bot.generate_blog_content(f"[벤치마크 뉴스 #{i}]", use_cache=False)
+            return time.perf_counter() - started, None
+        except Exception as e:
+            return time.perf_counter() - started, e
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(call, range(requests)))
+    return {
+        'seconds': time.perf_counter() - started,
+        'latencies': [latency for latency, error in results if error is None],
+        'failed': sum(1 for _, error in results if error is not None),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="글 생성 단계 오프라인 벤치마크")
+    parser.add_argument('--responses', default=DEFAULT_CORPUS, help="재생할 응답 폴더")
+    parser.add_argument('--requests', type=int, default=20, help="동시성 단계마다 보낼 생성 요청 수")
+    parser.add_argument('--concurrency', default='1,4', help="동시 요청 수 목록 (쉼표로 구분)")
+    parser.add_argument('--latency', type=float, default=0.5, help="첫 응답까지 지연(초)")
+    parser.add_argument('--chars-per-second', type=float, default=0, help="출력 속도 (0이면 즉시)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="오류 주입 확률")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'동시성':>6} {'요청':>6} {'실패':>6} {'처리량(건/분)':>14} {'p50(초)':>9} {'p95(초)':>9}")
+    for concurrency in [int(c) for c in args.concurrency.split(',') if c.strip()]:
+        backend = MockBackend(
+            args.responses, latency=args.latency, chars_per_second=args.chars_per_second,
+            error_rate=args.error_rate, seed=args.seed,
+        )
+        # 요청마다 찍히는 진행 로그는 숨기고 결과 표만 출력
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run(backend, args.requests, concurrency)
+        per_minute = len(result['latencies']) / result['seconds'] * 60 if result['seconds'] else 0
+        print(f"{concurrency:>6} {args.requests:>6} {result['failed']:>6} {per_minute:>14.1f}"
+              f" {percentile(result['latencies'], 0.5):>9.2f} {percentile(result['latencies'], 0.95):>9.2f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
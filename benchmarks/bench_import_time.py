@@ -0,0 +1,104 @@
+"""
+시작 시간(import) 벤치마크
+
+`python -X importtime`으로 시나리오별 모듈 로딩 시간을 재고, 무거운 모듈(Gemini SDK, feedparser,
+Pillow 등)이 필요 없는 명령에서 불러와지지 않는지 확인합니다.
+시간 기준을 넘거나 금지 모듈이 불러와지면 종료 코드 1을 돌려주므로 CI에서 시작 지연 회귀를 잡을 수 있습니다.
+
+사용법:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --repeat 7 --top 15
+    python benchmarks/bench_import_time.py --budget cli=80,wordpress_bot=500
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (이름, 실행 코드, 기준(ms), 불러오면 안 되는 모듈)
+SCENARIOS = [
+    ('cli', 'import cli; cli.build_parser()', 100,
+     ['wordpress_bot', 'requests', 'feedparser', 'google.generativeai', 'PIL']),
+    ('wordpress_bot', 'import wordpress_bot', 600,
+     ['feedparser', 'google.generativeai', 'grpc', 'PIL']),
+    ('batch_runner', 'import batch_runner', 600,
+     ['feedparser', 'google.generativeai', 'grpc', 'PIL']),
+]
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+def measure(code):
+    """
+    Returns:
+        (최상위 import 누적 시간 합계(ms), {모듈: 자체 시간(ms)})
+    """
+    env = dict(os.environ, BOT_CACHE_DIR=tempfile.mkdtemp(prefix='bench_import_'))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"실행 실패: {code}\n{result.stderr[-2000:]}")
+
+    total_us = 0
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = int(self_us) / 1000
+        # 들여쓰기 1칸 = 최상위 import (하위 모듈 시간은 누적값에 포함됨)
+        if len(indent) == 1:
+            total_us += int(cumulative_us)
+    return total_us / 1000, modules
+
+def main():
+    parser = argparse.ArgumentParser(description="시작 시간(import) 벤치마크")
+    parser.add_argument('--repeat', type=int, default=5, help="시나리오마다 실행할 횟수 (중앙값 사용)")
+    parser.add_argument('--top', type=int, default=10, help="자체 시간이 긴 모듈을 몇 개 보여 줄지")
+    parser.add_argument('--budget', default='', help="시나리오별 기준(ms) 덮어쓰기 (예: cli=80,wordpress_bot=500)")
+    args = parser.parse_args()
+
+    budgets = dict(item.split('=') for item in args.budget.split(',') if '=' in item)
+    failures = []
+
+    print(f"{'시나리오':<16} {'중앙값(ms)':>10} {'최소(ms)':>9} {'기준(ms)':>9}  결과")
+    slowest = {}
+    for name, code, budget, forbidden in SCENARIOS:
+        budget = float(budgets.get(name, budget))
+        runs = [measure(code) for _ in range(args.repeat)]
+        totals = [total for total, _ in runs]
+        median = statistics.median(totals)
+        modules = runs[-1][1]
+        loaded = [module for module in forbidden if module in modules]
+
+        status = '✅'
+        if median > budget:
+            status = '❌ 기준 초과'
+            failures.append(f"{name}: {median:.1f}ms > {budget:.0f}ms")
+        if loaded:
+            status = f"❌ 불러오면 안 되는 모듈: {', '.join(loaded)}"
+            failures.append(f"{name}: {', '.join(loaded)} import됨")
+        print(f"{name:<16} {median:>10.1f} {min(totals):>9.1f} {budget:>9.0f}  {status}")
+        slowest[name] = sorted(modules.items(), key=lambda item: -item[1])[:args.top]
+
+    for name, modules in slowest.items():
+        print(f"\n🐢 {name} - 자체 시간이 긴 모듈")
+        for module, ms in modules:
+            print(f"   {ms:>7.1f}ms  {module}")
+
+    if failures:
+        print("\n❌ 시작 시간 회귀:")
+        for failure in failures:
+            print(f"   - {failure}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+AI 응답 파서 벤치마크
+
+응답 말뭉치(기본값: benchmarks/responses/*.txt)를 대상으로 기존 정규식 추출 방식과
+response_parser.parse_response()의 파싱 시간과 성공률을 비교합니다.
+
+기본 말뭉치는 손으로 만든 합성 경계 사례(synthetic_*.txt)라서 성공률/정답 일치는 실제 응답의
+성능이 아닙니다. 실제 응답을 모으려면 봇 실행 시 RECORD_RESPONSES_DIR 환경 변수를 지정하세요.
+
+사용법:
+    python benchmarks/bench_response_parser.py
+    python benchmarks/bench_response_parser.py recorded_responses/ --repeat 200
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_parser import parse_response
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'responses')
+
+def legacy_parse(ai_response):
+    """
+    이전 __main__의 정규식 추출 방식 (비교 기준)
+    """
+    title_match = re.search(r'"title"\s*:\s*"(.*?)"', ai_response, re.DOTALL)
+    content_match = re.search(r'"content"\s*:\s*"(.*?)"', ai_response, re.DOTALL)
+    meta_match = re.search(r'"meta_description"\s*:\s*"(.*?)"', ai_response, re.DOTALL)
+    if not (title_match and content_match):
+        return {'title': '', 'content': '', 'meta_description': ''}
+    return {
+        'title': title_match.group(1),
+        'content': content_match.group(1).replace('\\n', '<br>').replace('\\"', '"'),
+        'meta_description': meta_match.group(1) if meta_match else '',
+    }
+
+def strict_fields(text):
+    """
+    엄격한 JSON으로 해석 가능한 응답이면 정답 필드를 돌려줍니다. (아니면 None)
+    """
+    stripped = text.strip()
+    if stripped.startswith('```'):
+        stripped = stripped.split('\n', 1)[-1].rsplit('```', 1)[0]
+    try:
+        data = json.loads(stripped)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def load_corpus(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.txt'))))
+        else:
+            files.append(path)
+    corpus = []
+    for file in files:
+        with open(file, 'r', encoding='utf-8') as f:
+            corpus.append((os.path.basename(file), f.read()))
+    return corpus
+
+def run(parser, corpus, repeat):
+    """
+    Returns:
+        {'seconds': 전체 시간, 'success': 제목·본문 추출 수, 'exact': 정답과 본문 일치 수,
+         'checked': 정답이 있는 응답 수, 'chars': 추출한 본문 글자 수 합계}
+    """
+    result = {'seconds': 0.0, 'success': 0, 'exact': 0, 'checked': 0, 'chars': 0}
+    for name, text in corpus:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            parsed = parser(text)
+        result['seconds'] += time.perf_counter() - started
+
+        if parsed['title'] and parsed['content']:
+            result['success'] += 1
+        result['chars'] += len(parsed['content'])
+
+        expected = strict_fields(text)
+        if expected and isinstance(expected.get('content'), str):
+            result['checked'] += 1
+            if parsed['content'].replace('<br>', '\n') == expected['content'].strip():
+                result['exact'] += 1
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="AI 응답 파서 벤치마크")
+    parser.add_argument('paths', nargs='*', default=[DEFAULT_CORPUS], help="응답 파일 또는 폴더")
+    parser.add_argument('--repeat', type=int, default=100, help="응답마다 반복 횟수")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.paths)
+    if not corpus:
+        print("❌ 응답 말뭉치가 비어 있습니다.")
+        return 1
+
+    total_chars = sum(len(text) for _, text in corpus)
+    synthetic = sum(1 for name, _ in corpus if name.startswith('synthetic_'))
+    print(f"📚 응답 {len(corpus)}개 ({total_chars:,}자, 합성 예제 {synthetic}개), 반복 {args.repeat}회")
+    if synthetic:
+        print("⚠️ 합성 예제(synthetic_*)의 성공률/정답 일치는 경계 사례 확인용이며 실제 응답의 성능이 아닙니다.")
+    print()
+    print(f"{'파서':<10} {'성공률':>8} {'정답 일치':>10} {'본문 글자 수':>12} {'응답당 시간(ms)':>16}")
+    for label, func in (('regex', legacy_parse), ('single', parse_response)):
+        result = run(func, corpus, args.repeat)
+        per_call_ms = result['seconds'] / (len(corpus) * args.repeat) * 1000
+        exact = f"{result['exact']}/{result['checked']}"
+        print(f"{label:<10} {result['success'] / len(corpus):>8.0%} {exact:>10} {result['chars']:>12,} {per_call_ms:>16.3f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""
+오프라인 벤치마크용 로컬 대역(stand-in) 서버
+
+실제 서비스 대신 같은 모양의 응답을 돌려주는 HTTP 서버들입니다. 요청마다 지연 시간과 오류를
+주입할 수 있고, 같은 시드면 같은 순서로 오류가 납니다.
+
+- RSSStandIn: 구글 뉴스 RSS (키워드마다 다른 기사, fixtures/news_rss.xml 템플릿)와
+  기사 원문 페이지 (리다이렉트 링크 → fixtures/news_article.html)
+- UnsplashStandIn: /photos/random, 다운로드 추적, 이미지 파일
+- WordPressStandIn: 글/미디어/카테고리/태그 REST API와 batch/v1 (최소 구현)
+
+사용 예:
+    wp = WordPressStandIn(latency=0.05, error_rate=0.01).start()
+    os.environ['WORDPRESS_URL'] = wp.url
+"""
+
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+class StandIn:
+    """
+    지연/오류 주입 기능이 있는 로컬 HTTP 서버 (하위 클래스가 handle()을 구현)
+
+    Args:
+        latency: 응답 지연(초)
+        jitter: 지연 흔들림 비율 (0.2면 ±20%)
+        error_rate: 요청이 error_status로 끝날 확률
+        error_status: 주입할 오류 응답 코드
+        seed: 난수 시드
+    """
+
+    error_status = 503
+
+    def __init__(self, latency=0.0, jitter=0.2, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def _plan(self):
+        with self._lock:
+            self.requests += 1
+            delay = self.latency * (1 + self._rng.uniform(-self.jitter, self.jitter))
+            failed = self._rng.random() < self.error_rate
+            self.errors += 1 if failed else 0
+        return max(0.0, delay), failed
+
+    def handle(self, method, path, query, body):
+        """
+        Returns:
+            (상태 코드, 본문 bytes 또는 JSON으로 보낼 객체, 추가 헤더)
+        """
+        raise NotImplementedError
+
+    def start(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _body(self):
+                if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+                    data = b''
+                    while True:
+                        size = int(self.rfile.readline().strip() or b'0', 16)
+                        if size == 0:
+                            self.rfile.readline()
+                            return data
+                        data += self.rfile.read(size)
+                        self.rfile.readline()
+                return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+            def _dispatch(self):
+                body = self._body()
+                delay, failed = standin._plan()
+                time.sleep(delay)
+                parsed = urllib.parse.urlsplit(self.path)
+                query = dict(urllib.parse.parse_qsl(parsed.query))
+                if failed:
+                    status, payload, headers = standin.error_status, {'code': 'injected_error'}, {}
+                else:
+                    status, payload, headers = standin.handle(self.command, parsed.path, query, body)
+                if not isinstance(payload, bytes):
+                    payload = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                    headers = dict({'Content-Type': 'application/json; charset=UTF-8'}, **headers)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_OPTIONS = _dispatch
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def stats(self):
+        return {'requests': self.requests, 'errors': self.errors}
+
+# ==========================================
+# 구글 뉴스 RSS
+# ==========================================
+class RSSStandIn(StandIn):
+    """
+    /rss/search?q=키워드 로 키워드마다 다른 기사 items개를 돌려줍니다.
+    기사 링크(/articles/...)는 구글 뉴스 링크처럼 원문 페이지(/news/...)로 리다이렉트합니다.
+    NEWS_FEED_URL에는 feed_url_template을 넣습니다.
+    """
+
+    error_status = 500
+
+    def __init__(self, items=10, **kwargs):
+        super().__init__(**kwargs)
+        self.items = items
+        self.template = load_fixture('news_rss.xml')
+        self.item_template = self.template[self.template.index('<item>'):self.template.index('</item>') + len('</item>')]
+        self.article_template = load_fixture('news_article.html')
+
+    @property
+    def feed_url_template(self):
+        return self.url + "/rss/search?q={query}"
+
+    def _article(self, path):
+        _, _, slug, n = path.split('/', 3)
+        html = (self.article_template
+                .replace('{keyword}', urllib.parse.unquote(slug))
+                .replace('{token}', f"{slug}{n}")
+                .replace('{n}', str(int(n) + 1))
+                .replace('{canonical}', f"{self.url}{path}"))
+        return 200, html.encode('utf-8'), {'Content-Type': 'text/html; charset=UTF-8'}
+
+    def handle(self, method, path, query, body):
+        if path.startswith('/articles/'):
+            return 302, b'', {'Location': self.url + '/news/' + path[len('/articles/'):]}
+        if path.startswith('/news/'):
+            return self._article(path)
+        keyword = query.get('q', '')
+        slug = urllib.parse.quote(keyword, safe='')
+        items = []
+        for i in range(self.items):
+            # 키워드마다 다른 단어를 써서 유사 헤드라인(MinHash)으로 묶이지 않도록 함
+            items.append(self.item_template
+                         .replace('{keyword}', keyword)
+                         .replace('{n}', str(i + 1))
+                         .replace('{token}', f"{slug}{i}")
+                         .replace('{link}', f"{self.url}/articles/{slug}/{i}"))
+        xml = self.template.replace(self.item_template, ''.join(items)).replace('{keyword}', keyword)
+        return 200, xml.encode('utf-8'), {'Content-Type': 'application/rss+xml; charset=UTF-8'}
+
+# ==========================================
+# Unsplash
+# ==========================================
+class UnsplashStandIn(StandIn):
+    """
+    /photos/random?count=N 은 매번 새 사진 N장을, /images/<id>.jpg 는 image_bytes를 돌려줍니다.
+    UNSPLASH_API_URL에는 url을 넣습니다.
+    """
+
+    def __init__(self, image_bytes=b'', **kwargs):
+        super().__init__(**kwargs)
+        self.image_bytes = image_bytes or os.urandom(200 * 1024)
+        self.photo = json.loads(load_fixture('unsplash_photo.json'))
+        self._next_id = 0
+
+    def _photo(self):
+        with self._lock:
+            self._next_id += 1
+            photo_id = f"bench{self._next_id:05d}"
+        photo = json.loads(json.dumps(self.photo))
+        photo['id'] = photo_id
+        photo['urls']['regular'] = f"{self.url}/images/{photo_id}.jpg"
+        photo['links']['download_location'] = f"{self.url}/photos/{photo_id}/download"
+        return photo
+
+    def handle(self, method, path, query, body):
+        if path == '/photos/random':
+            return 200, [self._photo() for _ in range(int(query.get('count', 1)))], {'X-Ratelimit-Remaining': '49'}
+        if path.startswith('/photos/') and path.endswith('/download'):
+            return 200, {'url': f"{self.url}/images/{path.split('/')[2]}.jpg"}, {}
+        if path.startswith('/images/'):
+            return 200, self.image_bytes, {'Content-Type': 'image/jpeg'}
+        return 404, {'errors': ['Not found']}, {}
+
+# ==========================================
+# 워드프레스 REST API
+# ==========================================
+class WordPressStandIn(StandIn):
+    """
+    wp/v2/posts, wp/v2/media, wp/v2/categories, wp/v2/tags, batch/v1의 최소 구현
+    WORDPRESS_URL에는 url을 넣습니다.
+    """
+
+    def __init__(self, batch_size=25, **kwargs):
+        super().__init__(**kwargs)
+        self.batch_size = batch_size
+        self.post_template = json.loads(load_fixture('wp_post.json'))
+        self.posts = []
+        self.media = []
+        self.terms = {'categories': [], 'tags': []}
+        self._ids = 0
+
+    def _new_id(self):
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def _create_post(self, data):
+        post_id = self._new_id()
+        post = json.loads(json.dumps(self.post_template))
+        post.update({
+            'id': post_id,
+            'slug': urllib.parse.quote(data.get('slug') or f"post-{post_id}", safe='').lower(),
+            'status': data.get('status', 'publish'),
+            'link': f"{self.url}/?p={post_id}",
+            'categories': data.get('categories', []),
+            'tags': data.get('tags', []),
+            'featured_media': data.get('featured_media', 0),
+        })
+        post['title']['rendered'] = data.get('title', '')
+        with self._lock:
+            self.posts.append(post)
+        return 201, post
+
+    def _route(self, method, path, query, body):
+        route = path[len('/wp-json'):] if path.startswith('/wp-json') else path
+        parts = [part for part in route.split('/') if part]
+        if parts[:2] == ['wp', 'v2'] and len(parts) >= 3:
+            resource = parts[2]
+            if resource == 'posts' and method == 'GET':
+                slugs = {slug.lower() for slug in query.get('slug', '').split(',') if slug}
+                with self._lock:
+                    found = [post for post in self.posts if not slugs or post['slug'] in slugs]
+                return 200, found[:int(query.get('per_page', 10))]
+            if resource == 'posts' and method == 'POST' and len(parts) == 3:
+                return self._create_post(body if isinstance(body, dict) else json.loads(body or b'{}'))
+            if resource == 'media' and method == 'POST':
+                if len(parts) == 4:
+                    return 200, {'id': int(parts[3])}
+                media_id = self._new_id()
+                with self._lock:
+                    self.media.append({'id': media_id, 'bytes': len(body)})
+                return 201, {'id': media_id, 'source_url': f"{self.url}/uploads/{media_id}.jpg"}
+            if resource in self.terms and method == 'GET':
+                names = {query['search']} if 'search' in query else None
+                with self._lock:
+                    found = [term for term in self.terms[resource] if names is None or term['name'] in names]
+                return 200, found
+            if resource in self.terms and method == 'POST':
+                data = body if isinstance(body, dict) else json.loads(body or b'{}')
+                term = {'id': self._new_id(), 'name': data['name'], 'slug': data['name']}
+                with self._lock:
+                    self.terms[resource].append(term)
+                return 201, term
+        if parts == ['batch', 'v1'] and method == 'OPTIONS':
+            return 200, {'endpoints': [{'args': {'requests': {'maxItems': self.batch_size}}}]}
+        if parts == ['batch', 'v1'] and method == 'POST':
+            data = json.loads(body or b'{}')
+            responses = []
+            for item in data.get('requests', []):
+                sub_path = urllib.parse.urlsplit(item['path'])
+                status, sub_body = self._route(item.get('method', 'POST'), '/wp-json' + sub_path.path,
+                                               dict(urllib.parse.parse_qsl(sub_path.query)), item.get('body') or {})
+                responses.append({'status': status, 'body': sub_body, 'headers': {}})
+            return 207, {'responses': responses}
+        return 404, {'code': 'rest_no_route', 'message': 'No route was found matching the URL and request method.'}
+
+    def handle(self, method, path, query, body):
+        status, payload = self._route(method, path, query, body)
+        headers = {}
+        if isinstance(payload, list):
+            headers = {'X-WP-Total': str(len(payload)), 'X-WP-TotalPages': '1'}
+        return status, payload, headers
@@ -0,0 +1,46 @@
+"""
+로컬 캐시 파일 공통 도우미
+"""
+
+import json
+import os
+import tempfile
+
+# 캐시 파일 저장 위치 (GitHub Actions에서는 actions/cache로 보존 가능)
+CACHE_DIR = os.environ.get('BOT_CACHE_DIR', '.cache')
+
+def cache_path(filename):
+    """
+    캐시 디렉터리 안의 파일 경로를 돌려줍니다. (디렉터리가 없으면 생성)
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, filename)
+
+def load_json(path, default):
+    """
+    JSON 파일을 읽습니다. 파일이 없거나 깨졌으면 default를 돌려줍니다.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 캐시 파일 읽기 실패 ({path}): {e}")
+        return default
+
+def save_json(path, data):
+    """
+    JSON 파일을 원자적으로 저장합니다. (임시 파일에 쓴 뒤 교체)
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
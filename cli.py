@@ -0,0 +1,218 @@
+"""
+자동 포스팅 명령줄 도구
+
+무거운 모듈(wordpress_bot, Gemini SDK, feedparser 등)은 각 명령 안에서 필요할 때만 불러옵니다.
+도움말이나 카테고리 조회처럼 가벼운 명령은 Gemini SDK를 불러오지 않으므로 빠르게 시작합니다.
+
+사용법:
+    python cli.py run                          # 기본 주제 1개 포스팅 (python wordpress_bot.py와 같음)
+    python cli.py batch topics.json            # 여러 주제 포스팅 (batch_runner.py와 같음)
+    python cli.py categories [--refresh]       # 카테고리 ID 목록
+    python cli.py dry-run [--mock] [-o out.html]   # 뉴스 수집 + 글 생성까지만 (발행/기록 안 함)
+    python cli.py replay [폴더] [-o 폴더]        # 기록된 AI 응답으로 파싱/본문 구성만 (네트워크 없음)
+    python cli.py daemon [--cron "0 7 * * *"] [--config schedule.json] [--metrics-port 9108]   # 상주 스케줄러
+
+run/batch/daemon은 같은 잠금 파일을 사용하므로 포스팅이 두 프로세스에서 동시에 돌지 않습니다.
+"""
+
+import argparse
+import os
+import sys
+
+def _load_bot():
+    import wordpress_bot
+    return wordpress_bot
+
+def _with_posting_lock(func):
+    """
+    다른 프로세스(상주 스케줄러, 예약 작업)가 포스팅 중이면 실행하지 않습니다.
+    """
+    from scheduler import posting_lock
+    with posting_lock() as acquired:
+        if not acquired:
+            print("⏭️ 다른 프로세스가 포스팅 중이라 이번 실행은 건너뜁니다.")
+            return 0
+        return func()
+
+def _report(results):
+    for name, post_url in results:
+        if post_url:
+            print(f"\n🎉 작업 완료! 블로그를 확인하세요: {post_url}")
+        else:
+            print(f"\n⚠️ [{name}] 포스팅 실패. 설정을 확인하세요.")
+    return 0 if results and all(url for _, url in results) else 1
+
+# ==========================================
+# 명령
+# ==========================================
+def cmd_run(args):
+    bot = _load_bot()
+    return _with_posting_lock(lambda: _report(bot.run_posts()))
+
+def cmd_batch(args):
+    import batch_runner
+    topics = batch_runner.load_topics(args.topics)
+
+    def run():
+        results = batch_runner.run_batch(topics, max_concurrency=args.concurrency or batch_runner.BATCH_MAX_CONCURRENCY)
+        return 0 if results and all(url for _, url in results) else 1
+    return _with_posting_lock(run)
+
+def cmd_categories(args):
+    bot = _load_bot()
+    return 0 if bot.get_wordpress_categories(force_refresh=args.refresh) else 1
+
+def cmd_dry_run(args):
+    if args.mock:
+        # 설정은 wordpress_bot을 불러올 때 읽으므로 먼저 지정
+        os.environ['LLM_BACKEND'] = 'mock'
+    bot = _load_bot()
+    keywords = [k.strip() for k in args.keywords.split(',') if k.strip()] if args.keywords else None
+
+    # 중복 제거 기록을 읽기만 하고 남기지 않음
+    candidates = bot.collect_news_items(keywords, per_keyword=bot.NEWS_CLUSTER_CANDIDATES, news_index=bot.get_news_index())
+    items = bot.cluster_news_items(candidates, history=bot.get_headline_history(), per_keyword=bot.NEWS_PER_KEYWORD)
+    if not items:
+        print("⚠️ 새로운 기사가 없습니다.")
+        return 1
+    items, raw_news = bot.fit_news_to_budget(bot.enrich_news_items(items), keywords)
+
+    ai_response = bot.generate_blog_content(raw_news)
+    title, content, meta_description = bot.parse_ai_response(ai_response, raw_news)
+    content = bot.compose_post_content(content, None, bot.format_news_items(items, with_summary=False))
+    print(f"\n✅ 제목: {title}\n✅ 메타 설명: {meta_description}\n✅ 본문 길이: {len(content)}자 (발행하지 않음)")
+    if args.output:
+        _write_preview(args.output, title, content)
+    return 0
+
+def cmd_replay(args):
+    bot = _load_bot()
+    from llm_backends import load_recorded_responses
+    from response_parser import parse_response, validate_response
+
+    directory = args.directory or bot.RECORD_RESPONSES_DIR or bot.MOCK_RESPONSES_DIR
+    responses = load_recorded_responses(directory)
+    if not responses:
+        print(f"⚠️ 재생할 응답이 없습니다: {directory}")
+        return 1
+
+    failed = 0
+    for i, ai_response in enumerate(responses, 1):
+        errors = validate_response(parse_response(ai_response), require_sections=False)
+        title, content, _ = bot.parse_ai_response(ai_response, '')
+        content = bot.compose_post_content(content, None, '')
+        failed += 1 if errors else 0
+        status = '✅' if not errors else f"⚠️ {', '.join(errors[:2])}"
+        print(f"🔁 #{i} {title[:40]} | 본문 {len(content)}자 | {status}")
+        if args.output:
+            _write_preview(os.path.join(args.output, f"replay_{i:03d}.html"), title, content)
+    print(f"\n📊 재생 {len(responses)}건 중 검증 실패 {failed}건")
+    return 1 if failed else 0
+
+def _posting_job(bot, name, topics_path):
+    def run():
+        if topics_path:
+            import batch_runner
+            # 실행할 때마다 다시 읽어 상주 중에도 주제 수정이 반영되도록 함
+            batch_runner.run_batch(batch_runner.load_topics(topics_path), run_name=name)
+        else:
+            _report(bot.run_posts(run_name=name))
+    return run
+
+def cmd_daemon(args):
+    import json
+    from scheduler import SCHEDULE_CRON, SCHEDULE_JITTER, Job, Scheduler
+    from telemetry import METRICS_PORT, start_metrics_server
+
+    bot = _load_bot()
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            specs = json.load(f)
+    else:
+        specs = [{'name': 'default', 'cron': args.cron or SCHEDULE_CRON, 'topics': args.topics}]
+    jitter = SCHEDULE_JITTER if args.jitter is None else args.jitter
+    jobs = []
+    for spec in specs:
+        name = spec.get('name') or spec['cron']
+        jobs.append(Job(name, spec['cron'], _posting_job(bot, name, spec.get('topics')),
+                        jitter=spec.get('jitter', jitter)))
+
+    # 연결과 모델 클라이언트를 미리 만들어 두고 실행 사이에 재사용
+    print(f"🚀 상주 스케줄러 시작 (작업 {len(jobs)}개, PID {os.getpid()})")
+    try:
+        bot.get_wp_client()
+        bot.get_llm_backend().warm_up()
+    except Exception as e:
+        print(f"⚠️ 미리 준비하기 실패 (첫 실행 때 다시 시도): {e}")
+
+    metrics_port = METRICS_PORT if args.metrics_port is None else args.metrics_port
+    if metrics_port:
+        start_metrics_server(metrics_port)
+
+    scheduler = Scheduler(jobs)
+    scheduler.install_signal_handlers()
+    scheduler.run_forever()
+    return 0
+
+def _write_preview(path, title, content):
+    import html
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"<!doctype html><meta charset=\"utf-8\"><title>{html.escape(title)}</title><h1>{html.escape(title)}</h1>\n{content}\n")
+    print(f"💾 미리보기 저장: {path}")
+
+# ==========================================
+# 메인 실행
+# ==========================================
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description="워드프레스 금융 블로그 자동 포스팅")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="기본 주제 1개 포스팅")
+    run.set_defaults(func=cmd_run)
+
+    batch = commands.add_parser('batch', help="주제 목록(JSON) 포스팅")
+    batch.add_argument('topics', help="주제 목록 JSON 파일")
+    batch.add_argument('--concurrency', type=int, help="동시에 생성할 최대 포스트 수")
+    batch.set_defaults(func=cmd_batch)
+
+    categories = commands.add_parser('categories', help="카테고리 ID 목록 조회")
+    categories.add_argument('--refresh', action='store_true', help="캐시를 무시하고 다시 조회")
+    categories.set_defaults(func=cmd_categories)
+
+    dry_run = commands.add_parser('dry-run', help="글 생성까지만 실행 (발행하지 않음)")
+    dry_run.add_argument('--keywords', help="검색 키워드 (쉼표로 구분, 기본값: NEWS_KEYWORDS)")
+    dry_run.add_argument('--mock', action='store_true', help="Gemini 대신 기록된 응답 사용")
+    dry_run.add_argument('-o', '--output', help="본문 미리보기 HTML 저장 경로")
+    dry_run.set_defaults(func=cmd_dry_run)
+
+    replay = commands.add_parser('replay', help="기록된 AI 응답으로 파싱/본문 구성 확인 (네트워크 없음)")
+    replay.add_argument('directory', nargs='?', help="응답 폴더 (기본값: RECORD_RESPONSES_DIR 또는 MOCK_RESPONSES_DIR)")
+    replay.add_argument('-o', '--output', help="미리보기 HTML 저장 폴더")
+    replay.set_defaults(func=cmd_replay)
+
+    daemon = commands.add_parser('daemon', help="상주 스케줄러 (cron 형식 일정에 맞춰 포스팅)")
+    daemon.add_argument('--cron', help="일정 (기본값: SCHEDULE_CRON, 예: '*/30 9-18 * * 1-5')")
+    daemon.add_argument('--topics', help="주제 목록 JSON 파일 (없으면 기본 주제)")
+    daemon.add_argument('--jitter', type=float, help="최대 지연(초, 기본값: SCHEDULE_JITTER)")
+    daemon.add_argument('--config', help="작업 목록 JSON 파일 ([{name, cron, topics, jitter}, ...])")
+    daemon.add_argument('--metrics-port', type=int, help="Prometheus 지표(/metrics) 포트 (기본값: METRICS_PORT, 0이면 끔)")
+    daemon.set_defaults(func=cmd_daemon)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        print(f"❌ 에러 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
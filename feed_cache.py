@@ -0,0 +1,81 @@
+"""
+RSS 피드 조건부 요청 캐시 (ETag / Last-Modified)
+
+피드 URL마다 ETag, Last-Modified 값과 파싱된 기사 목록을 저장해 두고,
+서버가 304 Not Modified로 응답하면 저장된 기사를 그대로 재사용합니다.
+"""
+
+import threading
+import time
+
+from cache_store import cache_path, load_json, save_json
+
+class FeedCache:
+    """
+    피드 URL을 키로 하는 디스크 캐시
+    
+    저장 형식:
+        {url: {"etag": ..., "modified": ..., "entries": [...], "fetched_at": ...}}
+    """
+
+    def __init__(self, path=None):
+        self.path = path or cache_path('feed_cache.json')
+        self._lock = threading.Lock()
+        self._data = load_json(self.path, {})
+        self._dirty = False
+
+    def get(self, url):
+        with self._lock:
+            return self._data.get(url)
+
+    def conditional_headers(self, url):
+        """
+        조건부 GET 요청에 사용할 헤더를 만듭니다.
+        """
+        record = self.get(url)
+        headers = {}
+        if record:
+            if record.get('etag'):
+                headers['If-None-Match'] = record['etag']
+            if record.get('modified'):
+                headers['If-Modified-Since'] = record['modified']
+        return headers
+
+    def store(self, url, entries, etag=None, modified=None):
+        with self._lock:
+            self._data[url] = {
+                'etag': etag,
+                'modified': modified,
+                'entries': entries,
+                'fetched_at': time.time(),
+            }
+            self._dirty = True
+
+    def touch(self, url):
+        """
+        304 응답으로 저장된 기사가 아직 최신임이 확인되면 받은 시각을 갱신합니다.
+        """
+        with self._lock:
+            record = self._data.get(url)
+            if record:
+                record['fetched_at'] = time.time()
+                self._dirty = True
+
+    def cached_entries(self, url, max_age=None):
+        """
+        저장된 기사 목록을 돌려줍니다.
+        (없거나, max_age(초)가 주어졌는데 마지막으로 받은 지 그보다 오래되었으면 None)
+        """
+        record = self.get(url)
+        if not record:
+            return None
+        if max_age is not None and time.time() - record.get('fetched_at', 0) > max_age:
+            return None
+        return record['entries']
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            save_json(self.path, self._data)
+            self._dirty = False
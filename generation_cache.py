@@ -0,0 +1,113 @@
+"""
+AI 생성 결과 캐시
+
+프롬프트 템플릿 버전, 뉴스 데이터, 생성 설정을 합친 해시를 키로 생성 결과를 저장합니다.
+포스팅이 네트워크 오류나 비밀번호 오류로 실패해 다시 실행해도, 같은 뉴스라면
+Gemini를 다시 부르지 않고 저장된 결과로 바로 발행 단계로 넘어갑니다.
+
+- 항목 수/전체 크기 제한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 만료 시간이 지난 항목은 사용하지 않고 삭제
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from cache_store import cache_path, load_json, save_json
+
+def generation_key(prompt_version, news_text, config):
+    """
+    캐시 키(SHA-256)를 만듭니다.
+
+    Args:
+        prompt_version: 프롬프트 템플릿 버전 (템플릿이 바뀌면 키도 바뀜)
+        news_text: 프롬프트에 들어간 뉴스 데이터
+        config: 생성 설정 딕셔너리 (모델 순서, 스트리밍/구조화 출력 여부 등 결과에 영향을 주는 값 모두)
+    """
+    payload = json.dumps(
+        {'prompt_version': prompt_version, 'news': news_text, 'config': config},
+        ensure_ascii=False, sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class GenerationCache:
+    """
+    크기 제한(LRU)과 만료 시간이 있는 생성 결과 캐시
+
+    Args:
+        directory: 저장 폴더 (기본값: 캐시 폴더의 generations)
+        max_entries: 최대 항목 수
+        max_bytes: 최대 전체 크기(바이트)
+        ttl: 만료 시간(초)
+    """
+
+    def __init__(self, directory=None, max_entries=50, max_bytes=20 * 1024 * 1024, ttl=12 * 3600):
+        self.directory = directory or cache_path('generations')
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._index_path = os.path.join(self.directory, 'index.json')
+        self._lock = threading.Lock()
+        self._index = load_json(self._index_path, {})
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.txt")
+
+    def _remove(self, key):
+        self._index.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self, now):
+        for key, meta in list(self._index.items()):
+            if now - meta['created_at'] > self.ttl:
+                self._remove(key)
+
+        total = sum(meta['size'] for meta in self._index.values())
+        for key, meta in sorted(self._index.items(), key=lambda item: item[1]['last_used']):
+            if len(self._index) <= self.max_entries and total <= self.max_bytes:
+                break
+            total -= meta['size']
+            self._remove(key)
+
+    def get(self, key):
+        """
+        저장된 생성 결과를 돌려줍니다. (없거나 만료되었으면 None)
+        """
+        with self._lock:
+            meta = self._index.get(key)
+            if meta is None:
+                return None
+            now = time.time()
+            if now - meta['created_at'] > self.ttl:
+                self._remove(key)
+                save_json(self._index_path, self._index)
+                return None
+            try:
+                with open(self._path(key), 'r', encoding='utf-8') as f:
+                    text = f.read()
+            except OSError:
+                self._remove(key)
+                save_json(self._index_path, self._index)
+                return None
+            meta['last_used'] = now
+            save_json(self._index_path, self._index)
+            return text
+
+    def put(self, key, text):
+        """
+        생성 결과를 저장하고 제한을 넘는 항목을 정리합니다.
+        """
+        with self._lock:
+            now = time.time()
+            data = text.encode('utf-8')
+            with open(self._path(key), 'wb') as f:
+                f.write(data)
+            self._index[key] = {'size': len(data), 'created_at': now, 'last_used': now}
+            self._evict(now)
+            save_json(self._index_path, self._index)
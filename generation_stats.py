@@ -0,0 +1,81 @@
+"""
+글 생성 결과 통계
+
+생성 방식(자유 형식/구조화 출력/스트리밍)별로 시도 횟수와 검증 결과를 JSONL로 남기고,
+재생성 비율과 검증 실패 비율을 요약합니다.
+
+사용법:
+    python generation_stats.py
+"""
+
+import json
+import threading
+import time
+
+from cache_store import cache_path
+
+_lock = threading.Lock()
+
+def stats_path():
+    return cache_path('generation_stats.jsonl')
+
+def record_generation(mode, attempts, valid, errors=None, path=None):
+    """
+    생성 한 건의 결과를 기록합니다.
+
+    Args:
+        mode: 'freeform', 'structured', 'stream'
+        attempts: 모델 호출 횟수 (1이면 재생성 없음)
+        valid: 최종 응답이 검증을 통과했는지
+        errors: 마지막 검증 오류 목록
+    """
+    record = {
+        'ts': time.time(),
+        'mode': mode,
+        'attempts': attempts,
+        'valid': valid,
+        'errors': (errors or [])[:5],
+    }
+    try:
+        with _lock, open(path or stats_path(), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    except OSError as e:
+        print(f"⚠️ 생성 통계 기록 실패: {e}")
+
+def summarize(path=None, since=None):
+    """
+    생성 방식별 요약을 돌려줍니다.
+
+    Returns:
+        {mode: {'runs', 'calls', 'regeneration_rate', 'invalid_rate'}}
+    """
+    summary = {}
+    try:
+        with open(path or stats_path(), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if since and record['ts'] < since:
+                    continue
+                data = summary.setdefault(record['mode'], {'runs': 0, 'calls': 0, 'regenerated': 0, 'invalid': 0})
+                data['runs'] += 1
+                data['calls'] += record['attempts']
+                data['regenerated'] += 1 if record['attempts'] > 1 else 0
+                data['invalid'] += 0 if record['valid'] else 1
+    except FileNotFoundError:
+        return {}
+
+    for data in summary.values():
+        data['regeneration_rate'] = data.pop('regenerated') / data['runs']
+        data['invalid_rate'] = data.pop('invalid') / data['runs']
+    return summary
+
+if __name__ == "__main__":
+    summary = summarize()
+    if not summary:
+        print("📊 아직 기록된 생성 통계가 없습니다.")
+    for mode, data in summary.items():
+        print(f"📊 {mode:<10} 생성 {data['runs']}건 | 모델 호출 {data['calls']}회"
+              f" | 재생성 비율 {data['regeneration_rate']:.0%} | 검증 실패 비율 {data['invalid_rate']:.0%}")
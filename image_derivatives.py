@@ -0,0 +1,186 @@
+"""
+반응형 이미지 파생본 생성
+
+원본 이미지 하나로 여러 폭(480/768/1080px 등)과 형식(AVIF/WebP/JPEG)의 압축 파생본을 만들고,
+<picture> + srcset/sizes 마크업을 만들어 독자 화면 크기에 맞는 작은 파일을 받게 합니다.
+
+- 폭마다 별도 프로세스에서 디코딩/리사이즈/인코딩 (ProcessPoolExecutor)
+- 원본 내용 해시(SHA-256)로 디스크에 캐시해 같은 이미지는 다시 처리하지 않음
+- Pillow가 없으면 사용할 수 없으며(available() == False), 호출한 쪽은 원본을 그대로 사용
+- Pillow는 파생본을 실제로 만들 때 불러옴 (시작 시간 단축)
+"""
+
+import hashlib
+import html
+import importlib.util
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from cache_store import cache_path, load_json, save_json
+
+DEFAULT_WIDTHS = (480, 768, 1080)
+DEFAULT_FORMATS = ('avif', 'webp', 'jpeg')
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg'}
+
+def available():
+    return importlib.util.find_spec('PIL') is not None
+
+def _pillow():
+    from PIL import Image, ImageOps, features
+    return Image, ImageOps, features
+
+def supported_formats(formats=DEFAULT_FORMATS):
+    """
+    설치된 Pillow가 인코딩할 수 있는 형식만 돌려줍니다. (AVIF는 Pillow 11.2 이상 + libavif 필요)
+    """
+    if not available():
+        return []
+    features = _pillow()[2]
+    result = []
+    for fmt in formats:
+        if fmt == 'jpeg':
+            result.append(fmt)
+            continue
+        try:
+            if features.check(fmt):
+                result.append(fmt)
+        except Exception:
+            continue
+    return result
+
+def _render_width(data, width, formats, quality):
+    """
+    (작업 프로세스에서 실행) 원본을 width 폭으로 줄여 형식별로 인코딩합니다.
+
+    Returns:
+        (실제 폭, 높이, {형식: bytes})
+    """
+    Image, ImageOps, _ = _pillow()
+    with Image.open(io.BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGB')
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        encoded = {}
+        for fmt in formats:
+            buffer = io.BytesIO()
+            if fmt == 'jpeg':
+                image.convert('RGB').save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+            elif fmt == 'webp':
+                image.save(buffer, 'WEBP', quality=quality, method=4)
+            else:
+                image.save(buffer, fmt.upper(), quality=quality)
+            encoded[fmt] = buffer.getvalue()
+        return image.width, image.height, encoded
+
+class DerivativeCache:
+    """
+    원본 내용 해시별 파생본 저장소
+
+    <directory>/<해시>/<폭>.<확장자> 파일과 manifest.json(파생본 목록)을 저장합니다.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or cache_path('derivatives')
+
+    def _manifest_path(self, digest):
+        return os.path.join(self.directory, digest, 'manifest.json')
+
+    def get(self, digest, widths, formats):
+        """
+        요청한 폭/형식이 모두 저장되어 있으면 파생본 목록을 돌려줍니다. (없으면 None)
+        """
+        variants = load_json(self._manifest_path(digest), None)
+        if not variants:
+            return None
+        have = {(v['requested_width'], v['format']) for v in variants if os.path.exists(v['path'])}
+        if all((width, fmt) in have for width in widths for fmt in formats):
+            return [v for v in variants if v['requested_width'] in widths and v['format'] in formats]
+        return None
+
+    def put(self, digest, variants):
+        save_json(self._manifest_path(digest), variants)
+
+    def path_for(self, digest, width, fmt):
+        directory = os.path.join(self.directory, digest)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{width}.{EXTENSIONS[fmt]}")
+
+def generate_derivatives(data, widths=DEFAULT_WIDTHS, formats=DEFAULT_FORMATS, quality=80,
+                         max_workers=None, cache=None):
+    """
+    파생본을 만들거나 캐시에서 꺼냅니다.
+
+    Returns:
+        (원본 해시, [{'requested_width', 'width', 'height', 'format', 'mime', 'path', 'bytes'}, ...])
+    """
+    if not available():
+        raise RuntimeError("Pillow가 설치되어 있지 않습니다. (pip install Pillow)")
+    formats = supported_formats(formats)
+    widths = sorted(set(widths))
+    cache = cache or DerivativeCache()
+    digest = hashlib.sha256(data).hexdigest()
+
+    cached = cache.get(digest, widths, formats)
+    if cached:
+        return digest, cached
+
+    variants = []
+    workers = max_workers or min(len(widths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {width: executor.submit(_render_width, data, width, formats, quality) for width in widths}
+        for requested_width, future in futures.items():
+            width, height, encoded = future.result()
+            for fmt, payload in encoded.items():
+                path = cache.path_for(digest, requested_width, fmt)
+                with open(path, 'wb') as f:
+                    f.write(payload)
+                variants.append({
+                    'requested_width': requested_width,
+                    'width': width,
+                    'height': height,
+                    'format': fmt,
+                    'mime': MIME_TYPES[fmt],
+                    'path': path,
+                    'bytes': len(payload),
+                })
+    cache.put(digest, variants)
+    return digest, variants
+
+def build_picture_html(variants, alt, sizes="(max-width: 800px) 100vw, 800px", style=''):
+    """
+    업로드한 파생본으로 <picture> 마크업을 만듭니다.
+
+    Args:
+        variants: [{'width', 'height', 'format', 'url'}, ...] (같은 폭이 여러 번 있으면 하나만 사용)
+        alt: 대체 텍스트
+        sizes: sizes 속성
+        style: <img> style 속성
+    """
+    by_format = {}
+    for variant in sorted(variants, key=lambda v: v['width']):
+        entries = by_format.setdefault(variant['format'], {})
+        entries.setdefault(variant['width'], variant)
+
+    def srcset(fmt):
+        return ', '.join(f"{html.escape(v['url'])} {width}w" for width, v in by_format[fmt].items())
+
+    fallback_format = 'jpeg' if 'jpeg' in by_format else next(iter(by_format))
+    largest = list(by_format[fallback_format].values())[-1]
+
+    sources = ''.join(
+        f'<source type="{MIME_TYPES[fmt]}" srcset="{srcset(fmt)}" sizes="{sizes}" />'
+        for fmt in ('avif', 'webp') if fmt in by_format and fmt != fallback_format
+    )
+    img = (
+        f'<img src="{html.escape(largest["url"])}" srcset="{srcset(fallback_format)}" sizes="{sizes}"'
+        f' width="{largest["width"]}" height="{largest["height"]}" alt="{html.escape(alt)}"'
+        f' loading="eager" decoding="async" style="{style}" />'
+    )
+    return f"<picture>{sources}{img}</picture>"
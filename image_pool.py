@@ -0,0 +1,212 @@
+"""
+Unsplash 이미지 풀
+
+글마다 /photos/random을 한 번씩 부르는 대신, count 파라미터로 한 번에 여러 장을 받아
+로컬에 저장해 두고 꺼내 씁니다. (요청 1회 = 할당량 1회로 최대 30장)
+
+- 이미지마다 URL, 출처 표기 HTML, 다운로드 추적 링크를 저장하고 검색어별로 색인
+- 가장 오래전에 쓴 이미지부터 사용하며(LRU), 정해진 기간 안에는 같은 이미지를 다시 쓰지 않음
+- 쓸 수 있는 이미지가 기준(low_watermark) 아래로 줄면 백그라운드에서 다시 채움
+- 보관 한도를 넘어 지운 이미지도 마지막 사용 시각을 남겨 두어, 다시 받아져도 반복 금지 기간을 지킴
+- 저장할 때는 잠금 파일을 잡고 디스크의 내용과 합쳐서 씀 (여러 프로세스가 같은 풀을 공유)
+"""
+
+import threading
+import time
+
+from cache_store import cache_path, load_json, save_json
+from scheduler import FileLock
+
+class ImagePool:
+    """
+    이미지 풀
+
+    Args:
+        fetcher: (검색어, 장수) → 이미지 딕셔너리 목록 함수
+                 각 이미지는 'id', 'url', 'credit', 'download_location'을 가짐
+        queries: 채울 때 돌아가며 사용할 검색어 목록
+        path: 저장 파일 경로 (기본값: 캐시 폴더의 image_pool.json)
+        batch_size: 한 번에 받을 장수 (Unsplash 최대 30)
+        low_watermark: 쓸 수 있는 이미지가 이보다 적으면 다시 채움
+        repeat_window_days: 같은 이미지를 다시 쓰지 않는 기간(일)
+        max_images: 보관할 최대 장수 (넘으면 이미 쓴 오래된 이미지부터 삭제)
+    """
+
+    def __init__(self, fetcher, queries, path=None, batch_size=30, low_watermark=5,
+                 repeat_window_days=30, max_images=300):
+        self.fetcher = fetcher
+        self.queries = list(queries)
+        self.path = path or cache_path('image_pool.json')
+        self.batch_size = batch_size
+        self.low_watermark = low_watermark
+        self.repeat_window = repeat_window_days * 86400
+        self.max_images = max_images
+        self._lock = threading.RLock()
+        self._refill_thread = None
+        data = load_json(self.path, {})
+        self._images = data.get('images', {})
+        # 지운 이미지의 마지막 사용 시각 {id: last_used} - 반복 금지 기간이 지나면 정리
+        self._evicted = data.get('evicted', {})
+        self._by_query = {}
+        for image_id, image in self._images.items():
+            self._by_query.setdefault(image['query'], []).append(image_id)
+
+    # ------------------------------------------
+    # 조회
+    # ------------------------------------------
+    def _available(self, query=None, now=None):
+        """
+        지금 쓸 수 있는 이미지 목록 (반복 금지 기간이 지났거나 한 번도 안 쓴 이미지)
+        """
+        now = now or time.time()
+        ids = self._by_query.get(query, []) if query else self._images.keys()
+        return [
+            self._images[image_id] for image_id in ids
+            if not self._images[image_id]['last_used'] or now - self._images[image_id]['last_used'] > self.repeat_window
+        ]
+
+    def available_count(self, query=None):
+        with self._lock:
+            return len(self._available(query))
+
+    def take(self, query=None):
+        """
+        이미지를 하나 꺼내고 사용 기록을 남깁니다.
+        풀이 비어 있으면 그 자리에서 채우고, 기준 아래로 줄면 백그라운드에서 채웁니다.
+
+        Returns:
+            이미지 딕셔너리 또는 None
+        """
+        with self._lock:
+            # 다른 프로세스가 그사이 쓴 이미지를 고르지 않도록 디스크의 사용 기록을 먼저 반영
+            self._merge(load_json(self.path, {}))
+            candidates = self._available(query)
+        if not candidates:
+            self.refill(query)
+            with self._lock:
+                candidates = self._available(query)
+            if not candidates:
+                return None
+
+        with self._lock:
+            # 한 번도 안 쓴 이미지 먼저, 그다음 가장 오래전에 쓴 이미지 (받은 순서로 동률 정리)
+            image = min(candidates, key=lambda img: (img['last_used'] or 0, img['fetched_at']))
+            image['last_used'] = time.time()
+            image['use_count'] = image.get('use_count', 0) + 1
+            remaining = len(self._available(query))
+            self._save()
+
+        if remaining < self.low_watermark:
+            self.refill_in_background(query)
+        return dict(image)
+
+    # ------------------------------------------
+    # 채우기
+    # ------------------------------------------
+    def _next_query(self):
+        # 쓸 수 있는 이미지가 가장 적은 검색어부터 채워 검색어별로 고르게 유지
+        return min(self.queries, key=lambda q: (len(self._available(q)), len(self._by_query.get(q, []))))
+
+    def refill(self, query=None):
+        """
+        이미지를 한 묶음 받아 풀에 더합니다.
+
+        Returns:
+            새로 더한 장수
+        """
+        with self._lock:
+            query = query or self._next_query()
+        try:
+            images = self.fetcher(query, self.batch_size) or []
+        except Exception as e:
+            print(f"⚠️ 이미지 풀 채우기 실패 ({query}): {e}")
+            return 0
+
+        added = 0
+        now = time.time()
+        with self._lock:
+            for image in images:
+                if image['id'] in self._images or self._recently_evicted(image['id'], now):
+                    continue
+                self._images[image['id']] = dict(image, query=query, fetched_at=now, last_used=None, use_count=0)
+                self._by_query.setdefault(query, []).append(image['id'])
+                added += 1
+            self._evict()
+            self._save()
+        print(f"🖼️ 이미지 풀 채움: '{query}' {added}장 추가 (사용 가능 {self.available_count()}장)")
+        return added
+
+    def refill_in_background(self, query=None):
+        """
+        백그라운드 스레드로 채웁니다. (이미 채우는 중이면 무시)
+        """
+        with self._lock:
+            if self._refill_thread and self._refill_thread.is_alive():
+                return
+            self._refill_thread = threading.Thread(target=self.refill, args=(query,), daemon=True)
+            self._refill_thread.start()
+
+    def join(self, timeout=None):
+        """
+        진행 중인 백그라운드 채우기를 기다립니다. (프로세스 종료 전 호출)
+        """
+        thread = self._refill_thread
+        if thread and thread.is_alive():
+            thread.join(timeout)
+
+    def _recently_evicted(self, image_id, now):
+        last_used = self._evicted.get(image_id)
+        return last_used is not None and now - last_used <= self.repeat_window
+
+    def _evict(self):
+        if len(self._images) <= self.max_images:
+            return
+        # 이미 쓴 이미지 중 가장 오래전에 쓴 것부터, 그래도 많으면 오래전에 받은 것부터
+        ordered = sorted(self._images.values(), key=lambda img: (img['last_used'] is None, img['last_used'] or img['fetched_at']))
+        for image in ordered[:len(self._images) - self.max_images]:
+            del self._images[image['id']]
+            self._by_query[image['query']].remove(image['id'])
+            if image['last_used']:
+                self._evicted[image['id']] = image['last_used']
+
+    def _merge(self, data):
+        """
+        다른 프로세스가 저장한 내용을 합칩니다. (사용 기록은 더 최근 쪽을 따름)
+        """
+        for image_id, last_used in data.get('evicted', {}).items():
+            self._evicted[image_id] = max(last_used, self._evicted.get(image_id, 0))
+        for image_id, image in data.get('images', {}).items():
+            mine = self._images.get(image_id)
+            if mine is None:
+                if image_id in self._evicted:
+                    continue
+                self._images[image_id] = image
+                self._by_query.setdefault(image['query'], []).append(image_id)
+            elif (image['last_used'] or 0) > (mine['last_used'] or 0):
+                mine['last_used'] = image['last_used']
+                mine['use_count'] = max(mine.get('use_count', 0), image.get('use_count', 0))
+        for image_id in [image_id for image_id in self._evicted if image_id in self._images]:
+            # 지운 뒤 다시 받은 이미지는 풀에 있는 쪽이 기록을 이어 감
+            image = self._images[image_id]
+            image['last_used'] = max(image['last_used'] or 0, self._evicted.pop(image_id)) or None
+
+    def _save(self):
+        now = time.time()
+        lock = FileLock(self.path + '.lock')
+        try:
+            locked = lock.acquire(timeout=5)
+            try:
+                if locked:
+                    self._merge(load_json(self.path, {}))
+                    self._evict()
+                else:
+                    print("⚠️ 이미지 풀 잠금 대기 시간 초과 - 합치지 않고 저장합니다.")
+                self._evicted = {
+                    image_id: last_used for image_id, last_used in self._evicted.items()
+                    if now - last_used <= self.repeat_window
+                }
+                save_json(self.path, {'images': self._images, 'evicted': self._evicted})
+            finally:
+                lock.release()
+        except OSError as e:
+            print(f"⚠️ 이미지 풀 저장 실패: {e}")
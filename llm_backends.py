@@ -0,0 +1,378 @@
+"""
+글 생성(LLM) 백엔드
+
+wordpress_bot은 이 모듈의 백엔드 인터페이스로만 모델을 호출합니다.
+
+- GeminiBackend: Google Gemini (API 키 설정은 첫 호출 때 한 번만)
+- FallbackBackend: 앞의 백엔드가 실패하면 다음 백엔드(예: 다른 Gemini 모델)로 넘어가는 체인
+- RateLimitedBackend: 요청/토큰 할당량과 적응형 동시성(rate_limit.ProviderLimiter)을 지키며 호출
+- MockBackend: 기록해 둔 응답을 재생하는 로컬 백엔드 (지연 시간/오류 주입 설정 가능)
+  API 할당량을 쓰지 않고 파이프라인 처리량과 지연 시간을 오프라인으로 측정할 때 사용합니다.
+
+generation_config는 모델과 무관한 딕셔너리입니다.
+    {'temperature', 'max_output_tokens', 'top_p', ('response_mime_type', 'response_schema')}
+"""
+
+import glob
+import hashlib
+import os
+import random
+import threading
+import time
+
+import telemetry
+from prompt_builder import estimate_tokens
+from rate_limit import THROTTLE_STATUSES, error_status
+
+class BackendError(Exception):
+    """
+    백엔드 호출 실패
+
+    Attributes:
+        status: HTTP 상태 코드에 해당하는 값 (알 수 없으면 None)
+        retryable: 잠시 후 다시 시도하면 성공할 수 있는 오류인지
+        retry_after: 서버가 알려 준 재시도 대기 시간(초)
+    """
+
+    def __init__(self, message, status=None, retryable=True, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+class GenerationBackend:
+    """
+    백엔드 인터페이스
+
+    generate(prompt, config)는 응답 전체 텍스트를,
+    generate(prompt, config, stream=True)는 텍스트 조각 이터레이터를 돌려줍니다.
+    """
+
+    name = 'backend'
+
+    def generate(self, prompt, config, stream=False):
+        raise NotImplementedError
+
+    def warm_up(self):
+        """
+        첫 호출 전에 SDK 로딩/설정을 미리 해 둡니다. (상주 모드에서 첫 글 생성 지연을 줄임)
+        """
+
+# ==========================================
+# Gemini
+# ==========================================
+_genai_lock = threading.Lock()
+_genai_configured = set()
+
+def _load_genai(api_key):
+    # google.generativeai는 불러오는 데 시간이 걸리므로 실제로 호출할 때 한 번만 import/설정
+    import google.generativeai as genai
+    with _genai_lock:
+        if api_key not in _genai_configured:
+            genai.configure(api_key=api_key)
+            _genai_configured.add(api_key)
+    return genai
+
+class GeminiBackend(GenerationBackend):
+    """
+    Google Gemini 백엔드
+
+    Args:
+        model: 모델 이름 (예: gemini-2.5-flash)
+        api_key: Gemini API 키
+    """
+
+    def __init__(self, model, api_key):
+        self.model = model
+        self.api_key = api_key
+        self.name = f"gemini:{model}"
+
+    def warm_up(self):
+        _load_genai(self.api_key)
+
+    def generate(self, prompt, config, stream=False):
+        genai = _load_genai(self.api_key)
+        model = genai.GenerativeModel(self.model)
+        started = time.perf_counter()
+        try:
+            response = model.generate_content(
+                prompt, generation_config=genai.types.GenerationConfig(**config), stream=stream
+            )
+        except Exception:
+            telemetry.record_request('gemini', bytes_out=len(prompt.encode('utf-8')),
+                                     seconds=time.perf_counter() - started, error=True)
+            raise
+        if not stream:
+            text = response.text
+            self._record(prompt, text, response, started)
+            return text
+        return self._iter_text(prompt, response, started)
+
+    def _iter_text(self, prompt, response, started):
+        parts = []
+        try:
+            for chunk in response:
+                try:
+                    parts.append(chunk.text)
+                except ValueError:
+                    # 안전 필터 등으로 텍스트가 없는 조각
+                    continue
+                yield parts[-1]
+        finally:
+            # 스트림을 중간에 닫아도 받은 만큼 기록 (usage_metadata는 마지막 조각에 들어 있음)
+            self._record(prompt, ''.join(parts), response, started)
+
+    def _record(self, prompt, text, response, started):
+        """
+        usage_metadata의 토큰 수를 기록합니다. (thinking 토큰도 출력 요금이 매겨지므로 출력에 포함)
+        """
+        telemetry.record_request('gemini', bytes_in=len(text.encode('utf-8')), bytes_out=len(prompt.encode('utf-8')),
+                                 seconds=time.perf_counter() - started)
+        usage = getattr(response, 'usage_metadata', None)
+        prompt_tokens = getattr(usage, 'prompt_token_count', 0) or 0
+        completion_tokens = (getattr(usage, 'candidates_token_count', 0) or 0) + (getattr(usage, 'thoughts_token_count', 0) or 0)
+        if prompt_tokens or completion_tokens:
+            telemetry.record_tokens(self.model, prompt_tokens, completion_tokens)
+        else:
+            telemetry.record_tokens(self.model, estimate_tokens(prompt), estimate_tokens(text), estimated=True)
+
+# ==========================================
+# 대체 모델 체인
+# ==========================================
+class FallbackBackend(GenerationBackend):
+    """
+    백엔드를 순서대로 시도합니다. 앞의 백엔드가 오류를 내면 다음 백엔드로 넘어갑니다.
+    스트리밍은 첫 조각을 받기 전에 실패한 경우에만 다음 백엔드로 넘어갑니다.
+    """
+
+    def __init__(self, backends):
+        if not backends:
+            raise ValueError("백엔드가 하나 이상 필요합니다.")
+        self.backends = list(backends)
+        self.name = ' -> '.join(backend.name for backend in self.backends)
+
+    def warm_up(self):
+        for backend in self.backends:
+            backend.warm_up()
+
+    def generate(self, prompt, config, stream=False):
+        last_error = None
+        for i, backend in enumerate(self.backends):
+            try:
+                if not stream:
+                    return backend.generate(prompt, config)
+                chunks = iter(backend.generate(prompt, config, stream=True))
+                first = next(chunks, None)
+            except Exception as e:
+                last_error = e
+                if i + 1 < len(self.backends):
+                    telemetry.count('llm_fallbacks')
+                    print(f"⚠️ {backend.name} 실패 ({e}) - {self.backends[i + 1].name}(으)로 전환")
+                continue
+            return self._chain(first, chunks)
+        raise last_error
+
+    @staticmethod
+    def _chain(first, chunks):
+        if first is not None:
+            yield first
+        yield from chunks
+
+# ==========================================
+# 속도 제한
+# ==========================================
+class RateLimitedBackend(GenerationBackend):
+    """
+    할당량을 지키며 백엔드를 호출합니다.
+
+    호출 전에 프롬프트 토큰 수(추정)만큼 토큰 버킷에서 꺼내고, 응답을 받은 뒤 응답 토큰 수를
+    추가로 차감합니다. 429/503이면 Retry-After만큼 기다린 뒤 max_retries번까지 다시 시도합니다.
+    스트리밍은 스트림이 끝나거나 닫힐 때 동시 호출 한도를 돌려줍니다.
+
+    Args:
+        backend: 감쌀 백엔드
+        limiter: rate_limit.ProviderLimiter
+        max_retries: 429/503 재시도 횟수
+    """
+
+    def __init__(self, backend, limiter, max_retries=1):
+        self.backend = backend
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.name = backend.name
+
+    def warm_up(self):
+        self.backend.warm_up()
+
+    def generate(self, prompt, config, stream=False):
+        prompt_tokens = estimate_tokens(prompt)
+        for attempt in range(self.max_retries + 1):
+            try:
+                if not stream:
+                    with self.limiter.slot(tokens=prompt_tokens) as slot:
+                        text = self.backend.generate(prompt, config)
+                        slot.charge_tokens(estimate_tokens(text))
+                        return text
+                return self._stream(prompt, config, prompt_tokens)
+            except Exception as e:
+                if error_status(e) not in THROTTLE_STATUSES or attempt == self.max_retries:
+                    raise
+                print(f"🔁 {self.name} 속도 제한으로 재시도 ({attempt + 1}/{self.max_retries})")
+                telemetry.record_retry('gemini')
+
+    def _stream(self, prompt, config, prompt_tokens):
+        # 첫 조각까지 받아 봐야 429 같은 오류가 드러나므로 먼저 받은 뒤 나머지를 이어서 돌려줌
+        context = self.limiter.slot(tokens=prompt_tokens)
+        slot = context.__enter__()
+        try:
+            chunks = iter(self.backend.generate(prompt, config, stream=True))
+            first = next(chunks, None)
+        except BaseException as e:
+            if not context.__exit__(type(e), e, e.__traceback__):
+                raise
+        return self._stream_rest(context, slot, first, chunks)
+
+    @staticmethod
+    def _stream_rest(context, slot, first, chunks):
+        received = 0
+        try:
+            if first is not None:
+                received += len(first)
+                yield first
+            for piece in chunks:
+                received += len(piece)
+                yield piece
+        except BaseException as e:
+            context.__exit__(type(e), e, e.__traceback__)
+            raise
+        else:
+            context.__exit__(None, None, None)
+        finally:
+            # 받은 글자 수로 응답 토큰을 대략 차감 (한글 기준 글자당 약 1토큰)
+            slot.charge_tokens(received)
+
+# ==========================================
+# 기록된 응답 재생 (오프라인 벤치마크용)
+# ==========================================
+class MockBackend(GenerationBackend):
+    """
+    기록된 응답을 재생하는 결정적(deterministic) 로컬 백엔드
+
+    같은 프롬프트에는 항상 같은 응답을 고르고, 지연 시간 흔들림과 오류 주입은
+    seed와 호출 순서로 정해지므로 같은 설정이면 같은 결과가 나옵니다.
+
+    Args:
+        responses: 응답 텍스트 목록 또는 응답 파일(*.txt) 폴더 경로
+        latency: 첫 응답까지 걸리는 시간(초)
+        jitter: 지연 시간 흔들림 비율 (0.2면 ±20%)
+        chars_per_second: 출력 속도 (0이면 즉시)
+        chunk_size: 스트리밍 조각 크기(글자 수)
+        error_rate: 호출이 오류(BackendError)로 끝날 확률
+        truncate_rate: 응답이 중간에 잘려서 돌아올 확률 (출력 토큰 한도 초과 흉내)
+        seed: 난수 시드
+    """
+
+    name = 'mock'
+
+    def __init__(self, responses, latency=1.0, jitter=0.2, chars_per_second=0, chunk_size=200,
+                 error_rate=0.0, truncate_rate=0.0, seed=0):
+        if isinstance(responses, str):
+            responses = load_recorded_responses(responses)
+        if not responses:
+            raise ValueError("재생할 응답이 없습니다.")
+        self.responses = list(responses)
+        self.latency = latency
+        self.jitter = jitter
+        self.chars_per_second = chars_per_second
+        self.chunk_size = chunk_size
+        self.error_rate = error_rate
+        self.truncate_rate = truncate_rate
+        self.seed = seed
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _plan(self, prompt):
+        """
+        이번 호출의 응답, 첫 응답 지연, 오류 여부를 정합니다.
+        """
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        rng = random.Random(f"{self.seed}:{call}")
+        digest = hashlib.sha256(prompt.encode('utf-8')).digest()
+        text = self.responses[int.from_bytes(digest[:4], 'big') % len(self.responses)]
+        delay = self.latency * (1 + rng.uniform(-self.jitter, self.jitter))
+        failed = rng.random() < self.error_rate
+        if rng.random() < self.truncate_rate:
+            text = text[:len(text) // 2]
+        return text, max(0.0, delay), failed
+
+    def _output_delay(self, chars):
+        return chars / self.chars_per_second if self.chars_per_second else 0.0
+
+    def generate(self, prompt, config, stream=False):
+        text, delay, failed = self._plan(prompt)
+        if not stream:
+            seconds = delay + self._output_delay(len(text))
+            time.sleep(seconds)
+            self._record(prompt, text, seconds, failed)
+            if failed:
+                raise BackendError("mock: 주입된 오류 (503)", status=503)
+            return text
+        return self._stream(prompt, text, delay, failed)
+
+    def _stream(self, prompt, text, delay, failed):
+        time.sleep(delay)
+        if failed:
+            self._record(prompt, text, delay, failed)
+            raise BackendError("mock: 주입된 오류 (503)", status=503)
+        sent = 0
+        try:
+            for start in range(0, len(text), self.chunk_size):
+                piece = text[start:start + self.chunk_size]
+                time.sleep(self._output_delay(len(piece)))
+                sent += len(piece)
+                yield piece
+        finally:
+            self._record(prompt, text[:sent], delay, failed)
+
+    def _record(self, prompt, text, seconds, failed):
+        # 실제 API처럼 계측되도록 기록 (토큰은 글자 수로 추정)
+        telemetry.record_request('gemini', bytes_in=0 if failed else len(text.encode('utf-8')),
+                                 bytes_out=len(prompt.encode('utf-8')), seconds=seconds, error=failed)
+        if not failed:
+            telemetry.record_tokens(self.name, estimate_tokens(prompt), estimate_tokens(text), estimated=True)
+
+def load_recorded_responses(directory):
+    """
+    폴더의 응답 파일(*.txt)을 이름 순으로 읽습니다. (RECORD_RESPONSES_DIR로 기록한 응답 등)
+    """
+    responses = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.txt'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            responses.append(f.read())
+    return responses
+
+def create_backend(kind, models, api_key=None, mock_options=None, limiter_for=None):
+    """
+    설정으로 백엔드를 만듭니다.
+
+    Args:
+        kind: 'gemini' 또는 'mock'
+        models: Gemini 모델 이름 목록 (두 번째부터는 대체 모델)
+        api_key: Gemini API 키
+        mock_options: MockBackend 인자 딕셔너리 (responses 포함)
+        limiter_for: 모델 이름 → ProviderLimiter 함수 (모델마다 할당량이 따로라서 모델별로 감쌈)
+    """
+    if kind == 'mock':
+        return MockBackend(**(mock_options or {}))
+    if kind != 'gemini':
+        raise ValueError(f"알 수 없는 LLM 백엔드: {kind}")
+    backends = []
+    for model in models:
+        backend = GeminiBackend(model, api_key)
+        limiter = limiter_for(model) if limiter_for else None
+        if limiter:
+            backend = RateLimitedBackend(backend, limiter)
+        backends.append(backend)
+    return backends[0] if len(backends) == 1 else FallbackBackend(backends)
@@ -0,0 +1,249 @@
+"""
+워드프레스 미디어 라이브러리 업로드
+
+외부 이미지(Unsplash)를 받아 워드프레스 미디어 라이브러리에 올리고, 대표 이미지(featured_media)로
+쓸 미디어 ID를 돌려줍니다. 이미지를 메모리에 통째로 담지 않고 받는 대로 흘려보내며(스트리밍),
+사진 ID → 미디어 ID 색인을 로컬에 저장해 같은 이미지를 두 번 올리지 않습니다.
+
+반응형 파생본(image_derivatives)을 쓰면 가장 큰 JPEG를 대표 이미지로 한 번만 올리고,
+<picture> 마크업에 실제로 쓰이는 파생본만 추가로 올립니다. (작은 JPEG는 워드프레스 축소본 사용)
+"""
+
+import threading
+import time
+
+import requests
+
+import telemetry
+from cache_store import cache_path, load_json, save_json
+from image_derivatives import EXTENSIONS, generate_derivatives
+
+CHUNK_SIZE = 64 * 1024
+
+class StreamingBody:
+    """
+    다운로드 응답을 조각 단위로 읽어 주는 파일 객체
+
+    길이(Content-Length)를 알려 주므로 requests가 chunked 전송 대신 일반 업로드로 보냅니다.
+    (일부 PHP/FastCGI 서버는 chunked 요청 본문을 받지 못함)
+    """
+
+    def __init__(self, response, length, chunk_size=CHUNK_SIZE):
+        self._chunks = response.iter_content(chunk_size)
+        self._buffer = b''
+        self.length = length
+        self.sent = 0
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        self.sent += len(data)
+        return data
+
+class MediaIndex:
+    """
+    원본 키(사진 ID 또는 URL) → 워드프레스 미디어 정보 색인
+
+    Args:
+        site: 워드프레스 주소 (다른 사이트의 색인을 잘못 쓰지 않도록 확인)
+        path: 저장 파일 경로 (기본값: 캐시 폴더의 media_index.json)
+    """
+
+    def __init__(self, site, path=None):
+        self.path = path or cache_path('media_index.json')
+        self._lock = threading.Lock()
+        self._data = load_json(self.path, {})
+        if self._data.get('site') != site:
+            self._data = {'site': site, 'media': {}}
+
+    def get(self, key):
+        with self._lock:
+            return self._data['media'].get(key)
+
+    def put(self, key, media_id, source_url, variants=None):
+        """
+        variants: 파생본별 업로드 결과 [{'width', 'height', 'format', 'id', 'url'}, ...] (선택)
+        """
+        with self._lock:
+            entry = {'id': media_id, 'source_url': source_url, 'uploaded_at': time.time()}
+            if variants:
+                entry['variants'] = variants
+            self._data['media'][key] = entry
+            try:
+                save_json(self.path, self._data)
+            except OSError as e:
+                print(f"⚠️ 미디어 색인 저장 실패: {e}")
+
+    def forget(self, key):
+        with self._lock:
+            if self._data['media'].pop(key, None) is not None:
+                save_json(self.path, self._data)
+
+def stream_upload(client, image_url, filename, timeout=30):
+    """
+    이미지를 받는 대로 미디어 라이브러리에 올립니다.
+
+    Returns:
+        워드프레스가 돌려준 미디어 JSON (실패하면 None)
+    """
+    with requests.get(image_url, stream=True, timeout=timeout) as source:
+        if source.status_code != 200:
+            telemetry.record_request('image', error=True)
+            print(f"⚠️ 이미지 다운로드 실패: {source.status_code}")
+            return None
+        content_type = source.headers.get('Content-Type', 'image/jpeg').split(';')[0]
+        length = source.headers.get('Content-Length')
+        if length and not source.headers.get('Content-Encoding'):
+            body = StreamingBody(source, int(length))
+        else:
+            # 길이를 모르면 chunked 전송
+            body = source.iter_content(CHUNK_SIZE)
+        # 스트림은 한 번만 읽을 수 있으므로 재시도하지 않음
+        response = client.upload_media(body, filename, content_type, max_retries=0)
+        # 받은 만큼 그대로 흘려보냈으므로 보낸 양 = 받은 양 (길이를 모르는 chunked 전송은 세지 않음)
+        telemetry.record_request('image', bytes_in=body.sent if isinstance(body, StreamingBody) else 0)
+
+    if response.status_code != 201:
+        print(f"⚠️ 미디어 업로드 실패: {response.status_code} {response.text[:200]}")
+        return None
+    return response.json()
+
+def ensure_media(client, index, key, image_url, filename, alt_text='', caption=''):
+    """
+    색인에 있으면 저장된 미디어를, 없으면 업로드한 뒤 색인에 기록하고 돌려줍니다.
+
+    Returns:
+        {'id': 미디어 ID, 'source_url': 워드프레스 이미지 URL} 또는 None
+    """
+    cached = index.get(key)
+    if cached:
+        print(f"♻️ 이미 올린 이미지 재사용 (미디어 ID: {cached['id']})")
+        return cached
+
+    media = stream_upload(client, image_url, filename)
+    if not media:
+        return None
+    if alt_text or caption:
+        # 업로드 요청 본문은 파일 자체라서 대체 텍스트/캡션은 따로 저장
+        client.post(f"wp/v2/media/{media['id']}", json={'alt_text': alt_text, 'caption': caption})
+    index.put(key, media['id'], media.get('source_url', ''))
+    print(f"🖼️ 미디어 업로드 완료 (미디어 ID: {media['id']})")
+    return index.get(key)
+
+def _upload_variant(client, name, variant):
+    """
+    파생본 파일 하나를 올립니다.
+
+    Returns:
+        (색인에 넣을 항목, 워드프레스가 돌려준 미디어 JSON) 또는 None
+    """
+    with open(variant['path'], 'rb') as f:
+        payload = f.read()
+    filename = f"{name}-{variant['width']}.{EXTENSIONS[variant['format']]}"
+    response = client.upload_media(payload, filename, variant['mime'])
+    if response.status_code != 201:
+        print(f"⚠️ 파생본 업로드 실패 ({filename}): {response.status_code}")
+        return None
+    media = response.json()
+    return {
+        'width': variant['width'],
+        'height': variant['height'],
+        'format': variant['format'],
+        'id': media['id'],
+        'url': media.get('source_url', ''),
+    }, media
+
+def _sub_sizes(media, width, height):
+    """
+    워드프레스가 대표 이미지로 만들어 둔 JPEG 축소본(media_details.sizes) 중
+    비율이 같은(잘라 내지 않은) 것을 파생본 항목으로 돌려줍니다.
+    """
+    sizes = ((media or {}).get('media_details') or {}).get('sizes') or {}
+    result = []
+    for size in sizes.values():
+        w, h = size.get('width') or 0, size.get('height') or 0
+        if not (0 < w < width) or size.get('mime_type', 'image/jpeg') != 'image/jpeg':
+            continue
+        if abs(w * height - h * width) > width:  # 반올림 오차(1px)를 넘으면 잘라 낸 축소본
+            continue
+        result.append({'width': w, 'height': h, 'format': 'jpeg', 'id': media['id'],
+                       'url': size.get('source_url', '')})
+    return result
+
+def ensure_media_variants(client, index, key, image_url, name, widths, formats, quality=80,
+                          alt_text='', caption='', timeout=30):
+    """
+    이미지를 받아 폭/형식별 파생본을 만들고, <picture> 마크업에 실제로 쓰이는 것만 올립니다.
+
+    - 가장 큰 JPEG(기준본)는 대표 이미지로 한 번만 올리며, 색인에 이미 있으면(원본 한 장만 올린
+      경우 포함) 그 미디어를 그대로 씁니다.
+    - 작은 JPEG는 워드프레스가 기준본으로 만든 축소본을 쓰고, 축소본이 없을 때만 올립니다.
+    - AVIF/WebP는 실제 폭이 겹치지 않는 것만 올립니다. (원본보다 큰 폭을 요청하면 같은 폭이 나옴)
+
+    Returns:
+        {'id': 대표 이미지 미디어 ID, 'source_url', 'variants': [...]} 또는 None
+    """
+    cached = index.get(key)
+    if cached and cached.get('variants'):
+        print(f"♻️ 이미 올린 이미지 재사용 (미디어 ID: {cached['id']})")
+        return cached
+
+    # 리사이즈하려면 원본 전체가 필요 (1080px 원본은 수백 KB 수준)
+    started = time.perf_counter()
+    source = requests.get(image_url, timeout=timeout)
+    telemetry.record_request('image', bytes_in=len(source.content), seconds=time.perf_counter() - started,
+                             error=source.status_code != 200)
+    if source.status_code != 200:
+        print(f"⚠️ 이미지 다운로드 실패: {source.status_code}")
+        return None
+    digest, variants = generate_derivatives(source.content, widths, formats, quality)
+
+    # build_picture_html과 같은 기준으로 (형식, 실제 폭)마다 하나만 남김
+    referenced = {}
+    for variant in sorted(variants, key=lambda v: v['width']):
+        referenced.setdefault((variant['format'], variant['width']), variant)
+    jpegs = [v for (fmt, _), v in referenced.items() if fmt == 'jpeg'] or list(referenced.values())
+    base = max(jpegs, key=lambda v: v['width'])
+
+    if cached:
+        print(f"♻️ 이미 올린 이미지를 기준본으로 재사용 (미디어 ID: {cached['id']})")
+        featured = {'width': base['width'], 'height': base['height'], 'format': base['format'],
+                    'id': cached['id'], 'url': cached['source_url']}
+        details = client.get(f"wp/v2/media/{cached['id']}", params={'_fields': 'id,media_details'})
+        base_media = details.json() if details.status_code == 200 else None
+        if base_media:
+            base_media['id'] = cached['id']
+    else:
+        result = _upload_variant(client, name, base)
+        if not result:
+            return None
+        featured, base_media = result
+        if alt_text or caption:
+            client.post(f"wp/v2/media/{featured['id']}", json={'alt_text': alt_text, 'caption': caption})
+
+    uploaded = [featured]
+    sub_sizes = _sub_sizes(base_media, base['width'], base['height']) if base['format'] == 'jpeg' else []
+    uploaded.extend(sub_sizes)
+    for (fmt, _), variant in referenced.items():
+        if variant is base or (fmt == base['format'] and sub_sizes):
+            continue
+        result = _upload_variant(client, name, variant)
+        if result:
+            uploaded.append(result[0])
+
+    original = len(source.content)
+    smallest = min(v['bytes'] for v in variants)
+    print(f"🖼️ 파생본 {len(uploaded)}개 준비 완료 (축소본 재사용 {len(sub_sizes)}개, "
+          f"원본 {original // 1024}KB → 최소 {smallest // 1024}KB, 해시 {digest[:8]})")
+    index.put(key, featured['id'], featured['url'], variants=uploaded)
+    return index.get(key)
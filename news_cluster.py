@@ -0,0 +1,249 @@
+"""
+유사 헤드라인 클러스터링 (MinHash + LSH)
+
+같은 통신사 기사를 언론사마다 제목만 바꿔 내보내는 경우처럼 링크가 달라
+정확 일치로는 걸러지지 않는 기사를 묶습니다.
+
+- 정규화된 제목의 문자 n-gram(shingle)으로 MinHash 서명을 만들고
+- 서명을 band로 나눈 LSH 버킷으로 후보만 조회하므로
+  과거 헤드라인 기록이 수십만 건으로 늘어나도 조회 비용이 거의 일정합니다.
+"""
+
+import hashlib
+import random
+import sqlite3
+import threading
+import time
+from array import array
+
+from cache_store import cache_path
+from news_dedup import normalize_title
+
+NUM_PERM = 64            # MinHash 해시 함수 개수
+# band 수 (band당 행 수 = NUM_PERM // LSH_BANDS)
+# 32×2행이면 유사도 0.5인 쌍이 후보가 될 확률이 1-(1-0.5²)³² ≈ 0.999 (16×4행은 ≈ 0.64)
+# 후보는 서명으로 유사도를 다시 확인하므로 후보가 늘어나도 결과는 SIMILARITY_THRESHOLD 기준
+LSH_BANDS = 32
+SHINGLE_SIZE = 3         # 문자 n-gram 크기
+SIMILARITY_THRESHOLD = 0.5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 64) - 1
+
+# 실행마다 같은 서명이 나오도록 고정 시드로 해시 계수 생성
+_rng = random.Random(20240101)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+def _hash64(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+def shingles(title, size=SHINGLE_SIZE):
+    """
+    정규화된 제목의 문자 n-gram 집합을 만듭니다.
+    """
+    text = normalize_title(title)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+def minhash_signature(title):
+    """
+    제목의 MinHash 서명(NUM_PERM개의 정수)을 계산합니다. (shingle이 없으면 None)
+    """
+    hashes = [_hash64(s.encode('utf-8')) for s in shingles(title)]
+    if not hashes:
+        return None
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+def estimate_similarity(sig_a, sig_b):
+    """
+    두 서명에서 자카드 유사도를 추정합니다.
+    """
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+def band_keys(signature, bands=LSH_BANDS):
+    """
+    서명을 band로 나눠 LSH 버킷 키 목록을 만듭니다. (band 번호 포함, 부호 있는 64비트)
+    """
+    rows = len(signature) // bands
+    keys = []
+    for band in range(bands):
+        chunk = array('Q', signature[band * rows:(band + 1) * rows]).tobytes()
+        key = _hash64(band.to_bytes(2, 'big') + chunk)
+        keys.append(key - (1 << 64) if key >= (1 << 63) else key)
+    return keys
+
+class LSHIndex:
+    """
+    메모리 LSH 인덱스 (한 번의 실행 안에서 클러스터링할 때 사용)
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._buckets = {}
+        self._signatures = {}
+
+    def query(self, signature):
+        candidates = set()
+        for key in band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+        return [
+            item_id for item_id in sorted(candidates)
+            if estimate_similarity(signature, self._signatures[item_id]) >= self.threshold
+        ]
+
+    def add(self, item_id, signature):
+        self._signatures[item_id] = signature
+        for key in band_keys(signature):
+            self._buckets.setdefault(key, []).append(item_id)
+
+class HeadlineHistory:
+    """
+    과거 포스팅에 사용한 헤드라인의 MinHash 기록 (SQLite, TTL 적용)
+    
+    버킷 키에 인덱스를 걸어 두어 조회는 band 수만큼의 인덱스 탐색으로 끝납니다.
+    """
+
+    def __init__(self, path=None, ttl_days=90, threshold=SIMILARITY_THRESHOLD):
+        self.path = path or cache_path('news_history.db')
+        self.ttl = ttl_days * 86400
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS headline_history ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " title TEXT NOT NULL,"
+                " signature BLOB NOT NULL,"
+                " seen_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS headline_buckets ("
+                " bucket INTEGER NOT NULL,"
+                " headline_id INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_headline_bucket ON headline_buckets(bucket)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_headline_bucket_id ON headline_buckets(headline_id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_headline_seen_at ON headline_history(seen_at)")
+            # band 구성이 바뀌었으면 저장된 서명으로 버킷을 다시 만듦 (user_version = 버킷을 만든 band 수)
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != LSH_BANDS:
+                self._rebuild_buckets()
+        self.evict_expired()
+
+    def _rebuild_buckets(self):
+        self._conn.execute("DELETE FROM headline_buckets")
+        for headline_id, blob in self._conn.execute("SELECT id, signature FROM headline_history").fetchall():
+            self._conn.executemany(
+                "INSERT INTO headline_buckets (bucket, headline_id) VALUES (?, ?)",
+                [(key, headline_id) for key in band_keys(list(array('Q', blob)))],
+            )
+        self._conn.execute(f"PRAGMA user_version = {LSH_BANDS}")
+
+    def evict_expired(self, now=None):
+        cutoff = (now or time.time()) - self.ttl
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM headline_buckets WHERE headline_id IN"
+                " (SELECT id FROM headline_history WHERE seen_at < ?)", (cutoff,)
+            )
+            self._conn.execute("DELETE FROM headline_history WHERE seen_at < ?", (cutoff,))
+
+    def find_similar(self, signature):
+        """
+        서명과 비슷한 과거 헤드라인 제목 목록을 돌려줍니다.
+        """
+        keys = band_keys(signature)
+        placeholders = ','.join('?' * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT h.title, h.signature FROM headline_buckets b"
+                " JOIN headline_history h ON h.id = b.headline_id"
+                f" WHERE b.bucket IN ({placeholders})", keys
+            ).fetchall()
+        similar = []
+        for title, blob in rows:
+            if estimate_similarity(signature, array('Q', blob)) >= self.threshold:
+                similar.append(title)
+        return similar
+
+    def add(self, items, now=None):
+        """
+        포스팅에 사용한 기사들의 헤드라인을 기록합니다.
+        """
+        now = now or time.time()
+        with self._lock, self._conn:
+            for item in items:
+                signature = item.get('signature') or minhash_signature(item.get('title', ''))
+                if not signature:
+                    continue
+                cursor = self._conn.execute(
+                    "INSERT INTO headline_history (title, signature, seen_at) VALUES (?, ?, ?)",
+                    (item.get('title', ''), array('Q', signature).tobytes(), now),
+                )
+                self._conn.executemany(
+                    "INSERT INTO headline_buckets (bucket, headline_id) VALUES (?, ?)",
+                    [(key, cursor.lastrowid) for key in band_keys(signature)],
+                )
+
+    def close(self):
+        self._conn.close()
+
+def cluster_news_items(items, history=None, per_keyword=None):
+    """
+    유사 헤드라인을 클러스터로 묶고 클러스터마다 대표 기사 하나만 남깁니다.
+    
+    Args:
+        items: collect_news_items()가 돌려준 기사 목록 (키워드 순서)
+        history: HeadlineHistory (있으면 과거에 다룬 기사와 비슷한 클러스터 제외)
+        per_keyword: 키워드당 남길 최대 대표 기사 수 (클러스터 크기가 큰 순)
+    
+    Returns:
+        대표 기사 목록 (원래 순서 유지). 각 기사에 'cluster_size'(묶인 기사 수)가 추가됩니다.
+    """
+    index = LSHIndex()
+    representatives = []
+    member_of = {}
+
+    for position, item in enumerate(items):
+        signature = minhash_signature(item.get('title', ''))
+        if signature is None:
+            continue
+        matches = index.query(signature)
+        if matches:
+            # 먼저 나온 기사(키워드 우선순위가 높은 기사)가 대표
+            rep = representatives[member_of[matches[0]]]
+            rep['cluster_size'] += 1
+            member_of[position] = member_of[matches[0]]
+        else:
+            member_of[position] = len(representatives)
+            representatives.append(dict(item, cluster_size=1, signature=signature, position=position))
+        index.add(position, signature)
+
+    if history:
+        fresh = [rep for rep in representatives if not history.find_similar(rep['signature'])]
+        if len(fresh) < len(representatives):
+            print(f"🧹 과거 포스팅과 유사한 기사 묶음 {len(representatives) - len(fresh)}개 제외")
+        representatives = fresh
+
+    if per_keyword is not None:
+        by_keyword = {}
+        for rep in representatives:
+            by_keyword.setdefault(rep['keyword'], []).append(rep)
+        selected = set()
+        for reps in by_keyword.values():
+            ranked = sorted(reps, key=lambda r: (-r['cluster_size'], r['position']))
+            selected.update(r['position'] for r in ranked[:per_keyword])
+        representatives = [rep for rep in representatives if rep['position'] in selected]
+
+    # 서명(정수 64개)은 발행 기록(news_items JSON)에 남지 않도록 제거 (기록할 때 제목으로 다시 계산)
+    for rep in representatives:
+        rep.pop('position', None)
+        rep.pop('signature', None)
+    return representatives
@@ -0,0 +1,140 @@
+"""
+실행 간 기사 중복 제거 인덱스
+
+정규화된 링크와 제목 지문(fingerprint)을 SQLite에 저장해 두고,
+TTL 기간 안에 이미 다룬 기사는 프롬프트에 넣기 전에 걸러냅니다.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import urllib.parse
+
+from cache_store import cache_path
+
+# 링크에서 제거할 추적용 쿼리 파라미터
+TRACKING_PARAMS = {'oc', 'fbclid', 'gclid', 'ref', 'cmpid', 'from', 'output'}
+
+def canonicalize_link(link):
+    """
+    비교용으로 링크를 정규화합니다.
+    (스킴/호스트 소문자, www 제거, utm_* 등 추적 파라미터·프래그먼트 제거)
+    """
+    parts = urllib.parse.urlsplit(link.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = [
+        (k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip('/') or '/'
+    return urllib.parse.urlunsplit(('https', host, path, urllib.parse.urlencode(sorted(query)), ''))
+
+def normalize_title(title):
+    """
+    비교용으로 제목을 정규화합니다.
+    구글 뉴스 제목 끝의 ' - 언론사명'을 떼고, 기호와 공백을 모두 제거합니다.
+    """
+    title = unicodedata.normalize('NFKC', title or '')
+    title = re.sub(r'\s+[-|–]\s+[^-|–]{1,30}$', '', title.strip())
+    title = re.sub(r'\[[^\]]*\]|\([^)]*\)', ' ', title)
+    return re.sub(r'[\W_]+', '', title.lower())
+
+def _fingerprint(kind, value):
+    return f"{kind}:" + hashlib.sha1(value.encode('utf-8')).hexdigest()
+
+def news_fingerprints(entry):
+    """
+    기사 하나의 지문 목록(링크, 제목)을 돌려줍니다.
+    """
+    fingerprints = []
+    if entry.get('link'):
+        fingerprints.append(_fingerprint('link', canonicalize_link(entry['link'])))
+    title = normalize_title(entry.get('title', ''))
+    if title:
+        fingerprints.append(_fingerprint('title', title))
+    return fingerprints
+
+class SeenNewsIndex:
+    """
+    이미 다룬 기사의 지문을 TTL과 함께 보관하는 인덱스
+    """
+
+    def __init__(self, path=None, ttl_days=14):
+        self.path = path or cache_path('news_history.db')
+        self.ttl = ttl_days * 86400
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_news ("
+            " fingerprint TEXT PRIMARY KEY,"
+            " seen_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_news_at ON seen_news(seen_at)")
+        self.evict_expired()
+
+    def evict_expired(self, now=None):
+        """
+        TTL이 지난 지문을 삭제합니다.
+        """
+        cutoff = (now or time.time()) - self.ttl
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM seen_news WHERE seen_at < ?", (cutoff,))
+
+    def is_seen(self, entry):
+        fingerprints = news_fingerprints(entry)
+        if not fingerprints:
+            return False
+        placeholders = ','.join('?' * len(fingerprints))
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT 1 FROM seen_news WHERE fingerprint IN ({placeholders}) LIMIT 1",
+                fingerprints,
+            ).fetchone()
+        return row is not None
+
+    def mark_seen(self, entries, now=None):
+        """
+        포스팅에 사용한 기사들을 인덱스에 기록합니다.
+        """
+        now = now or time.time()
+        rows = [(fp, now) for entry in entries for fp in news_fingerprints(entry)]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen_news (fingerprint, seen_at) VALUES (?, ?)", rows
+            )
+
+    def close(self):
+        self._conn.close()
+
+def filter_duplicates(entries, index=None, run_fingerprints=None, limit=None):
+    """
+    같은 실행 안의 중복과 (index가 있으면) 이전 실행에서 다룬 기사를 걸러냅니다.
+    
+    Args:
+        entries: 기사 목록
+        index: SeenNewsIndex (없으면 실행 내 중복만 제거)
+        run_fingerprints: 여러 키워드에 걸쳐 공유할 지문 집합 (호출 중 갱신됨)
+        limit: 남길 최대 기사 수
+    
+    Returns:
+        (남은 기사 목록, 제거된 개수)
+    """
+    if run_fingerprints is None:
+        run_fingerprints = set()
+    unique = []
+    dropped = 0
+    for entry in entries:
+        if limit is not None and len(unique) >= limit:
+            break
+        fingerprints = news_fingerprints(entry)
+        if run_fingerprints.intersection(fingerprints) or (index and index.is_seen(entry)):
+            dropped += 1
+            continue
+        run_fingerprints.update(fingerprints)
+        unique.append(entry)
+    return unique, dropped
@@ -0,0 +1,217 @@
+"""
+발행 기록(outbox) - 같은 글이 두 번 발행되지 않도록 보장
+
+생성한 글마다 제목/본문 해시로 멱등 키를 만들고, 글의 진행 상태와 워드프레스 포스트 ID를
+SQLite 파일에 기록합니다.
+
+    generated → media_uploaded → publishing → published
+                                     ↘ failed (다시 시도 가능)
+
+발행 요청 직전에 publishing으로 기록하므로, 요청이 시간 초과로 끊겨 결과를 모르는 글은
+publishing 상태로 남습니다. 다음 실행에서 이런 글은 슬러그로 워드프레스를 조회해
+이미 만들어졌으면 published로 맞추고(reconcile), 없을 때만 다시 보냅니다.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+
+from cache_store import cache_path
+
+GENERATED = 'generated'
+MEDIA_UPLOADED = 'media_uploaded'
+PUBLISHING = 'publishing'
+PUBLISHED = 'published'
+FAILED = 'failed'
+
+# 워드프레스 슬러그(post_name)는 URL 인코딩 후 200자에서 잘림 - 해시 꼬리가 잘리지 않도록 여유를 둠
+MAX_SLUG_LENGTH = 180
+
+def idempotency_key(title, content):
+    """
+    생성된 제목/본문으로 멱등 키(SHA-256)를 만듭니다.
+    이미지/출처를 붙이기 전 본문을 사용하므로, 다시 실행해 다른 이미지가 골라져도 키는 같습니다.
+    """
+    payload = json.dumps({'title': title, 'content': content}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def make_slug(title, key):
+    """
+    제목 앞부분 + 멱등 키 앞 8자리로 슬러그를 만듭니다. (재조회할 때 같은 글을 찾는 기준)
+    """
+    suffix = key[:8]
+    words = re.sub(r'[^\w\s-]', ' ', title.lower()).split()
+    base = '-'.join(words)
+    # 한글은 인코딩하면 글자당 9자가 되므로 인코딩한 길이로 자름
+    while base and len(urllib.parse.quote(f"{base}-{suffix}")) > MAX_SLUG_LENGTH:
+        base = base[:-1].rstrip('-')
+    return f"{base}-{suffix}" if base else f"post-{suffix}"
+
+class Outbox:
+    """
+    발행 기록 저장소 (SQLite)
+
+    Args:
+        path: 저장 파일 경로 (기본값: 캐시 폴더의 outbox.db)
+    """
+
+    def __init__(self, path=None):
+        self.path = path or cache_path('outbox.db')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS posts ("
+            " key TEXT PRIMARY KEY,"
+            " topic TEXT,"
+            " title TEXT,"
+            " slug TEXT,"
+            " state TEXT NOT NULL,"
+            " media_id INTEGER,"
+            " remote_id INTEGER,"
+            " link TEXT,"
+            " payload TEXT,"
+            " news_items TEXT,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " last_error TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS posts_state ON posts (state, created_at)")
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _to_dict(row):
+        if row is None:
+            return None
+        record = dict(row)
+        record['payload'] = json.loads(record['payload']) if record['payload'] else None
+        record['news_items'] = json.loads(record['news_items']) if record['news_items'] else []
+        return record
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM posts WHERE key = ?", (key,)).fetchone()
+        return self._to_dict(row)
+
+    def _update(self, key, **fields):
+        fields['updated_at'] = time.time()
+        columns = ', '.join(f"{name} = ?" for name in fields)
+        with self._transaction() as conn:
+            conn.execute(f"UPDATE posts SET {columns} WHERE key = ?", (*fields.values(), key))
+
+    # ------------------------------------------
+    # 상태 기록
+    # ------------------------------------------
+    def record_generated(self, key, topic, title, slug, news_items=None):
+        """
+        생성한 글을 기록합니다. 이미 있는 키면 기존 기록을 그대로 둡니다.
+
+        Returns:
+            기록 딕셔너리 (이미 발행된 글이면 state가 'published')
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO posts (key, topic, title, slug, state, news_items, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, topic, title, slug, GENERATED,
+                 json.dumps(news_items or [], ensure_ascii=False), now, now),
+            )
+        return self.get(key)
+
+    def mark_media(self, key, media_id):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE posts SET media_id = ?, state = ?, updated_at = ? WHERE key = ? AND state = ?",
+                (media_id, MEDIA_UPLOADED, time.time(), key, GENERATED),
+            )
+
+    def mark_publishing(self, key, payload, slug=None):
+        """
+        발행 요청 직전에 보낼 내용을 저장합니다. (없는 키면 새로 만듦)
+        """
+        now = time.time()
+        body = json.dumps(payload, ensure_ascii=False)
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO posts (key, title, slug, state, payload, attempts, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, 1, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET state = excluded.state, payload = excluded.payload,"
+                " slug = COALESCE(excluded.slug, slug), attempts = attempts + 1, updated_at = excluded.updated_at",
+                (key, payload.get('title'), slug, PUBLISHING, body, now, now),
+            )
+
+    def mark_published(self, key, remote_id, link):
+        self._update(key, state=PUBLISHED, remote_id=remote_id, link=link, last_error=None)
+
+    def mark_failed(self, key, error):
+        """
+        워드프레스가 요청을 거절한 경우 (글이 만들어지지 않았음이 확실함)
+        """
+        self._update(key, state=FAILED, last_error=str(error)[:500])
+
+    # ------------------------------------------
+    # 재시도/정리
+    # ------------------------------------------
+    def pending(self, max_age=None, max_attempts=None):
+        """
+        발행 내용이 저장되어 있지만 아직 발행이 확인되지 않은 글 (오래된 것부터)
+        """
+        query = "SELECT * FROM posts WHERE state IN (?, ?) AND payload IS NOT NULL"
+        params = [PUBLISHING, FAILED]
+        if max_age is not None:
+            query += " AND created_at >= ?"
+            params.append(time.time() - max_age)
+        if max_attempts is not None:
+            query += " AND attempts < ?"
+            params.append(max_attempts)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at", params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def prune(self, max_age):
+        """
+        max_age(초)보다 오래된 기록을 지웁니다.
+
+        Returns:
+            지운 건수
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute("DELETE FROM posts WHERE created_at < ?", (time.time() - max_age,))
+            return cursor.rowcount
+
+    def counts(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM posts GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+    def close(self):
+        self._conn.close()
+
+if __name__ == "__main__":
+    outbox = Outbox(sys.argv[1] if len(sys.argv) > 1 else None)
+    counts = outbox.counts()
+    if not counts:
+        print("📮 발행 기록이 없습니다.")
+    for state, count in sorted(counts.items()):
+        print(f"📮 {state:<15} {count}건")
+    for record in outbox.pending():
+        print(f"   ⏳ [{record['state']}] {record['title']} (시도 {record['attempts']}회, {record['last_error'] or '결과 미확인'})")
@@ -0,0 +1,177 @@
+"""
+비동기 파이프라인 엔진
+
+단계(Stage) 사이를 크기가 제한된 asyncio 큐로 연결합니다.
+다음 단계가 밀리면 앞 단계의 put이 대기하므로 자연스럽게 배압(backpressure)이
+걸리고, 단계마다 처리 건수와 소요 시간을 기록합니다.
+"""
+
+import asyncio
+import threading
+import time
+
+_DONE = object()
+
+class StageStats:
+    """
+    단계별 처리 통계 (건수, 오류, 소요 시간)
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.errors = 0
+        self.dropped = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, elapsed):
+        self.count += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+
+    def as_dict(self):
+        return {
+            'stage': self.name,
+            'count': self.count,
+            'errors': self.errors,
+            'dropped': self.dropped,
+            'total_seconds': round(self.total_seconds, 3),
+            'avg_seconds': round(self.total_seconds / self.count, 3) if self.count else 0.0,
+            'max_seconds': round(self.max_seconds, 3),
+        }
+
+class Stage:
+    """
+    파이프라인의 한 단계
+    
+    Args:
+        name: 단계 이름 (통계 출력용)
+        func: 항목을 받아 다음 단계로 넘길 항목을 돌려주는 함수.
+              None을 돌려주면 해당 항목은 여기서 종료됩니다.
+              일반 함수는 스레드에서 실행되어 이벤트 루프를 막지 않습니다.
+        workers: 이 단계를 동시에 처리할 작업자 수
+    """
+
+    def __init__(self, name, func, workers=1):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+
+    async def call(self, item):
+        if asyncio.iscoroutinefunction(self.func):
+            return await self.func(item)
+        return await asyncio.to_thread(self.func, item)
+
+class Pipeline:
+    """
+    단계 목록을 큐로 연결해 항목들을 흘려보내는 실행기
+    
+    사용 예:
+        pipeline = Pipeline([Stage('fetch', fetch), Stage('publish', publish, workers=2)])
+        results = asyncio.run(pipeline.run(jobs))
+        pipeline.print_report()
+    """
+
+    def __init__(self, stages, queue_size=2, on_error=None):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.stats = [StageStats(stage.name) for stage in stages]
+        self.wall_seconds = 0.0
+
+    async def _worker(self, stage, stats, inbox, outbox, remaining):
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                # 같은 단계의 다른 작업자도 종료하도록 다시 넣어 둠
+                await inbox.put(_DONE)
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    await outbox.put(_DONE)
+                return
+            
+            started = time.perf_counter()
+            try:
+                result = await stage.call(item)
+            except Exception as e:
+                stats.errors += 1
+                if self.on_error:
+                    self.on_error(stage.name, item, e)
+                continue
+            finally:
+                stats.record(time.perf_counter() - started)
+            
+            if result is None:
+                stats.dropped += 1
+                continue
+            await outbox.put(result)
+
+    async def run(self, items):
+        """
+        모든 항목을 파이프라인에 통과시키고 마지막 단계의 결과 목록을 돌려줍니다.
+        """
+        started = time.perf_counter()
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        tasks = []
+        
+        for i, (stage, stats) in enumerate(zip(self.stages, self.stats)):
+            remaining = [stage.workers]
+            for _ in range(stage.workers):
+                tasks.append(asyncio.create_task(
+                    self._worker(stage, stats, queues[i], queues[i + 1], remaining)
+                ))
+        
+        results = []
+        
+        async def collect():
+            while True:
+                item = await queues[-1].get()
+                if item is _DONE:
+                    return
+                results.append(item)
+        
+        collector = asyncio.create_task(collect())
+        for item in items:
+            await queues[0].put(item)
+        await queues[0].put(_DONE)
+        
+        await asyncio.gather(*tasks)
+        await collector
+        self.wall_seconds = time.perf_counter() - started
+        return results
+
+    def report(self):
+        """
+        단계별 통계를 딕셔너리로 돌려줍니다.
+        """
+        return {
+            'wall_seconds': round(self.wall_seconds, 3),
+            'stages': [stats.as_dict() for stats in self.stats],
+        }
+
+    def print_report(self):
+        print("\n⏱️ 단계별 소요 시간")
+        for stats in self.stats:
+            data = stats.as_dict()
+            print(f"   {data['stage']:<10} {data['count']}건 | 평균 {data['avg_seconds']:.2f}초"
+                  f" | 최대 {data['max_seconds']:.2f}초 | 오류 {data['errors']}건")
+        print(f"   전체 소요: {self.wall_seconds:.2f}초")
+
+class RequestSpacer:
+    """
+    여러 스레드에서 요청 시작 시점 사이에 최소 간격을 둡니다.
+    """
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.min_interval
+        if start_at > now:
+            time.sleep(start_at - now)
@@ -0,0 +1,134 @@
+"""
+프롬프트 템플릿 컴파일 및 토큰 예산 맞추기
+
+긴 글 작성 프롬프트를 한 번만 해석(컴파일)해 고정 부분과 자리표시자로 나눠 두고,
+고정 부분의 토큰 수를 미리 세어 둡니다. 요청마다 뉴스 부분만 채워 넣으며,
+뉴스가 입력 토큰 예산을 넘으면 최신성/관련 보도 수/키워드 우선순위로 순위를 매겨
+중요한 기사부터 예산 안에 담습니다.
+
+토큰 수는 네트워크 요청 없이 계산하는 추정치입니다.
+(한글은 글자당 약 1토큰, 영문/숫자는 4글자당 약 1토큰으로 약간 넉넉하게 계산)
+"""
+
+import math
+import re
+import string
+import time
+
+_TOKEN_PATTERN = re.compile(r'[A-Za-z0-9]+|[가-힣ㄱ-ㆎ一-鿿]|[^\sA-Za-z0-9]')
+
+# 기사 순위 가중치 (최신성, 관련 보도 수, 키워드 우선순위)
+RECENCY_WEIGHT = 0.5
+CLUSTER_WEIGHT = 0.3
+KEYWORD_WEIGHT = 0.2
+# 최신성 점수가 절반이 되는 시간(시간 단위)
+RECENCY_HALF_LIFE_HOURS = 12
+
+def estimate_tokens(text):
+    """
+    입력 토큰 수를 추정합니다.
+    """
+    tokens = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        word = match.group()
+        tokens += math.ceil(len(word) / 4) if word.isascii() and word.isalnum() else 1
+    return tokens
+
+class PromptTemplate:
+    """
+    str.format 문법의 템플릿을 한 번만 해석해 두는 프롬프트 템플릿
+
+    사용 예:
+        template = PromptTemplate("지시문 ... {news_text} ... 출력 형식")
+        prompt = template.render(news_text=news)
+        template.breakdown(news_text=news)  # {'static': 5200, 'news_text': 640, 'total': 5840}
+    """
+
+    def __init__(self, template, counter=estimate_tokens):
+        self.counter = counter
+        self._chunks = []
+        self.fields = []
+        for literal, field, _, _ in string.Formatter().parse(template):
+            if literal:
+                self._chunks.append((literal, None))
+            if field is not None:
+                self._chunks.append((None, field))
+                if field not in self.fields:
+                    self.fields.append(field)
+        self.static_text = ''.join(literal for literal, _ in self._chunks if literal)
+        self.static_tokens = counter(self.static_text)
+
+    def render(self, **values):
+        return ''.join(literal if field is None else str(values[field]) for literal, field in self._chunks)
+
+    def breakdown(self, **values):
+        """
+        부분별 토큰 수를 돌려줍니다. {'static': 고정 부분, 필드 이름: 값, ..., 'total': 합계}
+        """
+        report = {'static': self.static_tokens}
+        for field in self.fields:
+            report[field] = self.counter(str(values.get(field, '')))
+        report['total'] = sum(report.values())
+        return report
+
+def score_news_item(item, keywords, now=None):
+    """
+    기사 중요도 점수 (0~1)
+    - 최신성: 발행 후 RECENCY_HALF_LIFE_HOURS마다 절반으로 감소 (발행 시각이 없으면 0.5)
+    - 관련 보도 수: 여러 언론사가 함께 보도할수록 높음
+    - 키워드 우선순위: 키워드 목록에서 앞에 있을수록 높음
+    """
+    now = now or time.time()
+    published = item.get('published_ts')
+    if published:
+        age_hours = max(0.0, (now - published) / 3600)
+        recency = 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+    else:
+        recency = 0.5
+
+    cluster = min(1.0, math.log2(item.get('cluster_size', 1)) / 3)
+
+    keyword = item.get('keyword')
+    if keywords and keyword in keywords:
+        priority = 1 - keywords.index(keyword) / len(keywords)
+    else:
+        priority = 0.0
+
+    return RECENCY_WEIGHT * recency + CLUSTER_WEIGHT * cluster + KEYWORD_WEIGHT * priority
+
+def fit_news_items(items, budget, formatter, keywords=None, counter=estimate_tokens, now=None):
+    """
+    기사 목록을 토큰 예산 안에 들어가도록 고릅니다.
+
+    Args:
+        items: 기사 딕셔너리 목록
+        budget: 뉴스 부분에 쓸 수 있는 토큰 수 (None 또는 0 이하면 제한 없음)
+        formatter: 기사 목록 → 프롬프트용 텍스트 함수
+        keywords: 키워드 우선순위 (앞에 있을수록 중요)
+
+    Returns:
+        (고른 기사 목록 - 원래 순서 유지, 뉴스 텍스트, 뺀 기사 수)
+    """
+    text = formatter(items)
+    if not budget or budget <= 0 or counter(text) <= budget:
+        return list(items), text, 0
+
+    ranked = sorted(range(len(items)), key=lambda i: score_news_item(items[i], keywords, now), reverse=True)
+    # 기사 사이 구분 줄바꿈까지 포함한 기사별 비용
+    costs = [counter(formatter([item])) + 1 for item in items]
+
+    chosen = set()
+    used = 0
+    for i in ranked:
+        if used + costs[i] <= budget:
+            chosen.add(i)
+            used += costs[i]
+
+    # 기사 번호가 바뀌어 추정이 어긋난 경우 점수가 낮은 기사부터 더 뺌
+    while chosen:
+        selected = [items[i] for i in sorted(chosen)]
+        text = formatter(selected)
+        if counter(text) <= budget:
+            return selected, text, len(items) - len(selected)
+        chosen.discard(min(chosen, key=lambda i: score_news_item(items[i], keywords, now)))
+    return [], '', len(items)
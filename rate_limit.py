@@ -0,0 +1,321 @@
+"""
+API 호출 속도 제한 (토큰 버킷 + 적응형 동시성)
+
+제공자(Gemini, Unsplash 등)마다 요청 수/토큰 수 버킷을 두고, 버킷이 비면 채워질 때까지
+기다렸다가 호출합니다. 버킷 상태와 429/503 응답으로 정해진 대기 시간(Retry-After)은
+SQLite 파일에 저장되므로, 동시에 실행된 여러 예약 작업이 같은 할당량을 나눠 씁니다.
+
+동시 호출 수는 AIMD 방식으로 조절합니다. (프로세스별)
+- 성공하면 조금씩 늘림 (한도가 N이면 N번 성공마다 +1)
+- 429/503을 받으면 절반으로 줄임
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from cache_store import cache_path
+
+# 속도 제한 초과로 보는 응답 코드
+THROTTLE_STATUSES = {429, 503}
+
+class RateLimitTimeout(Exception):
+    """
+    max_wait 안에 할당량을 얻지 못함
+    """
+
+    def __init__(self, provider, wait):
+        super().__init__(f"{provider} 할당량 부족 ({wait:.0f}초 후 가능)")
+        self.provider = provider
+        self.wait = wait
+
+def error_status(error):
+    """
+    예외에서 HTTP 상태 코드를 찾습니다. (BackendError.status, google.api_core 예외의 code 등)
+    """
+    for attr in ('status', 'code', 'status_code'):
+        value = getattr(error, attr, None)
+        if callable(value):
+            continue
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+_RETRY_IN = re.compile(r'retry in ([\d.]+)\s*s|retry_delay\s*\{\s*seconds:\s*(\d+)', re.IGNORECASE)
+
+def error_retry_after(error):
+    """
+    예외에 담긴 재시도 대기 시간(초)을 찾습니다. (없으면 None)
+    Gemini는 오류 메시지에 "Please retry in 13.2s" 또는 retry_delay를 담아 보냅니다.
+    """
+    value = getattr(error, 'retry_after', None)
+    if value is not None:
+        return float(value)
+    match = _RETRY_IN.search(str(error))
+    if match:
+        return float(match.group(1) or match.group(2))
+    return None
+
+class RateLimitStore:
+    """
+    프로세스 사이에 공유하는 버킷/대기 상태 저장소 (SQLite)
+    """
+
+    def __init__(self, path=None):
+        self.path = path or cache_path('rate_limits.db')
+        self._lock = threading.Lock()
+        # 자동 커밋 모드에서 BEGIN IMMEDIATE로 직접 트랜잭션을 잡아 프로세스 간 경쟁을 막음
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " name TEXT PRIMARY KEY,"
+            " tokens REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cooldowns ("
+            " provider TEXT PRIMARY KEY,"
+            " until REAL NOT NULL)"
+        )
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _refill(conn, name, capacity, rate, now):
+        row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return capacity
+        tokens, updated_at = row
+        return min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+    def take(self, requests, now=None):
+        """
+        여러 버킷에서 한꺼번에 꺼냅니다. 모두 충분할 때만 꺼내며, 하나라도 부족하면 아무것도 꺼내지 않습니다.
+
+        Args:
+            requests: [(버킷 이름, 꺼낼 양, 용량, 초당 충전량), ...]
+
+        Returns:
+            기다려야 할 시간(초). 0이면 꺼내기 성공
+        """
+        now = now or time.time()
+        with self._transaction() as conn:
+            levels = []
+            wait = 0.0
+            for name, amount, capacity, rate in requests:
+                tokens = self._refill(conn, name, capacity, rate, now)
+                # 용량보다 큰 요청은 버킷이 가득 찼을 때 허용 (영원히 기다리지 않도록)
+                amount = min(amount, capacity)
+                if tokens < amount:
+                    wait = max(wait, (amount - tokens) / rate)
+                levels.append((name, tokens, amount))
+            for name, tokens, amount in levels:
+                remaining = tokens - amount if wait == 0 else tokens
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    (name, remaining, now),
+                )
+            return wait
+
+    def charge(self, name, amount, capacity, rate, now=None):
+        """
+        호출이 끝난 뒤 알게 된 사용량(응답 토큰 등)을 버킷에서 뺍니다. (음수까지 허용 - 다음 호출이 기다림)
+        """
+        now = now or time.time()
+        with self._transaction() as conn:
+            tokens = self._refill(conn, name, capacity, rate, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                (name, tokens - amount, now),
+            )
+
+    def cooldown_remaining(self, provider, now=None):
+        now = now or time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT until FROM cooldowns WHERE provider = ?", (provider,)).fetchone()
+        return max(0.0, row[0] - now) if row else 0.0
+
+    def set_cooldown(self, provider, seconds, now=None):
+        """
+        provider 호출을 seconds 동안 멈춥니다. (이미 더 긴 대기가 있으면 유지)
+        """
+        until = (now or time.time()) + seconds
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO cooldowns (provider, until) VALUES (?, ?)"
+                " ON CONFLICT(provider) DO UPDATE SET until = MAX(until, excluded.until)",
+                (provider, until),
+            )
+
+    def close(self):
+        self._conn.close()
+
+class AdaptiveConcurrency:
+    """
+    AIMD 방식 동시 호출 한도 (프로세스 안에서 공유)
+
+    Args:
+        initial: 시작 한도
+        minimum, maximum: 한도 범위
+    """
+
+    def __init__(self, initial, minimum=1, maximum=None):
+        self.minimum = minimum
+        self.maximum = maximum or initial
+        self.limit = float(max(minimum, min(initial, self.maximum)))
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, throttled=False, adjust=True):
+        """
+        throttled: 속도 제한 응답이면 한도를 절반으로 줄임
+        adjust: False면 한도를 그대로 둠 (호출하지 못했거나 속도 제한과 무관하게 실패한 경우)
+        """
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit / 2)
+            elif adjust:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+class Slot:
+    """
+    ProviderLimiter.slot()이 돌려주는 호출 기록
+
+    호출한 쪽에서 응답 코드(status)와 Retry-After(retry_after)를 채우면 한도 조절에 반영됩니다.
+    """
+
+    def __init__(self, limiter):
+        self._limiter = limiter
+        self.status = None
+        self.retry_after = None
+
+    def charge_tokens(self, tokens):
+        self._limiter.charge_tokens(tokens)
+
+    @property
+    def throttled(self):
+        return self.status in THROTTLE_STATUSES
+
+    @property
+    def failed(self):
+        return self.status is not None and self.status >= 400
+
+class ProviderLimiter:
+    """
+    제공자 하나의 속도 제한기
+
+    Args:
+        provider: 이름 (버킷/대기 상태 저장 키, 예: 'gemini:gemini-2.5-flash')
+        store: RateLimitStore
+        requests_per_minute / requests_per_hour: 요청 수 한도
+        tokens_per_minute: 토큰 수 한도 (Gemini TPM)
+        max_concurrency: 최대 동시 호출 수
+        default_backoff: 429/503에 Retry-After가 없을 때 기다릴 시간(초)
+
+    사용 예:
+        with limiter.slot(tokens=1200) as slot:
+            response = requests.get(...)
+            slot.status = response.status_code
+    """
+
+    def __init__(self, provider, store, requests_per_minute=None, requests_per_hour=None,
+                 tokens_per_minute=None, max_concurrency=4, default_backoff=30):
+        self.provider = provider
+        self.store = store
+        self.default_backoff = default_backoff
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self._request_buckets = []
+        if requests_per_minute:
+            self._request_buckets.append((f"{provider}:rpm", requests_per_minute, requests_per_minute / 60))
+        if requests_per_hour:
+            self._request_buckets.append((f"{provider}:rph", requests_per_hour, requests_per_hour / 3600))
+        self._token_bucket = None
+        if tokens_per_minute:
+            self._token_bucket = (f"{provider}:tpm", tokens_per_minute, tokens_per_minute / 60)
+
+    def wait_for_quota(self, tokens=0, max_wait=None):
+        """
+        대기 상태와 버킷을 확인하고, 할당량을 얻을 때까지 기다립니다.
+        max_wait보다 오래 기다려야 하면 RateLimitTimeout을 냅니다.
+        """
+        waited = 0.0
+        while True:
+            wait = self.store.cooldown_remaining(self.provider)
+            if wait == 0:
+                requests = [(name, 1, capacity, rate) for name, capacity, rate in self._request_buckets]
+                if self._token_bucket and tokens:
+                    name, capacity, rate = self._token_bucket
+                    requests.append((name, tokens, capacity, rate))
+                wait = self.store.take(requests) if requests else 0.0
+            if wait == 0:
+                return waited
+            if max_wait is not None and waited + wait > max_wait:
+                raise RateLimitTimeout(self.provider, wait)
+            if waited == 0:
+                print(f"⏳ {self.provider} 속도 제한 - {wait:.1f}초 대기")
+            time.sleep(wait)
+            waited += wait
+
+    def charge_tokens(self, tokens):
+        if self._token_bucket and tokens:
+            name, capacity, rate = self._token_bucket
+            self.store.charge(name, tokens, capacity, rate)
+
+    def record_throttle(self, retry_after=None):
+        """
+        429/503 응답을 기록해 모든 프로세스가 Retry-After(없으면 default_backoff) 동안 멈추게 합니다.
+        """
+        delay = retry_after if retry_after is not None else self.default_backoff
+        self.store.set_cooldown(self.provider, delay)
+        print(f"🐢 {self.provider} 속도 제한 응답 - {delay:.1f}초 동안 호출 중지, 동시 호출 한도 {self.concurrency.limit:.1f}")
+
+    @contextmanager
+    def slot(self, tokens=0, max_wait=None):
+        """
+        동시 호출 한도와 할당량을 얻은 뒤 블록을 실행합니다.
+        블록에서 예외가 나면 예외의 상태 코드/재시도 시간으로 한도를 조절합니다.
+        동시 호출 한도는 호출이 성공했을 때만 늘리고, 속도 제한 응답이면 줄이며,
+        할당량을 기다리다 포기했거나 다른 이유(네트워크 오류, 5xx 등)로 실패하면 그대로 둡니다.
+        """
+        self.concurrency.acquire()
+        slot = Slot(self)
+        try:
+            self.wait_for_quota(tokens, max_wait)
+        except BaseException:
+            self.concurrency.release(adjust=False)
+            raise
+        succeeded = False
+        try:
+            yield slot
+            succeeded = not slot.failed
+        except Exception as e:
+            slot.status = slot.status or error_status(e)
+            if slot.retry_after is None:
+                slot.retry_after = error_retry_after(e)
+            raise
+        finally:
+            self.concurrency.release(throttled=slot.throttled, adjust=succeeded)
+            if slot.throttled:
+                self.record_throttle(slot.retry_after)
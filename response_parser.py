@@ -0,0 +1,364 @@
+"""
+Gemini 응답(JSON) 파서
+
+스트리밍으로 도착하는 조각을 한 글자씩 이어서 읽는 점진적(incremental) 파서입니다.
+최상위 객체의 필드가 완성되는 즉시 알려 주므로, 전체 응답을 기다리지 않고
+제목/메타 디스크립션을 먼저 쓰거나 본문 형식 오류를 일찍 발견할 수 있습니다.
+
+- 코드 블록(```json)이나 앞뒤 설명 문장은 건너뜁니다.
+- 문자열 안의 이스케이프(\\n, \\", \\uXXXX 등)를 조각 경계와 관계없이 처리합니다.
+- 문자열 안의 실제 줄바꿈처럼 엄밀한 JSON에서 허용되지 않는 출력도 받아들입니다.
+"""
+
+import json
+import re
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', '"': '"', '\\': '\\', '/': '/'}
+_PLAIN_STRING = re.compile(r'[^"\\]+')
+_SCALAR_END = re.compile(r'[,}\]\s]')
+
+def _fix_surrogates(text):
+    # 😀 처럼 나뉘어 들어온 서로게이트 쌍을 하나의 문자로 합침
+    try:
+        return text.encode('utf-16', 'surrogatepass').decode('utf-16')
+    except UnicodeError:
+        return text
+
+class IncrementalJSONExtractor:
+    """
+    최상위 JSON 객체의 필드를 조각 단위로 추출합니다.
+
+    사용 예:
+        extractor = IncrementalJSONExtractor(on_field=lambda k, v: print(k))
+        for chunk in stream:
+            extractor.feed(chunk.text)
+        extractor.fields  # {'title': ..., 'content': ...}
+
+    Attributes:
+        fields: 완성된 필드 {키: 값}
+        current_key: 현재 읽고 있는 필드 키 (없으면 None)
+        done: 최상위 객체가 닫혔는지 여부
+        consumed: 지금까지 받은 글자 수
+        skipped: 객체 시작 전에 건너뛴 글자 수
+    """
+
+    def __init__(self, on_field=None):
+        self.on_field = on_field
+        self.fields = {}
+        self.current_key = None
+        self.done = False
+        self.consumed = 0
+        self.skipped = 0
+        self._state = 'seek'
+        self._buf = []
+        self._escape = None       # None, '' (역슬래시 직후) 또는 '\u' 뒤의 16진수 누적
+        self._nested_depth = 0
+        self._nested_in_string = False
+        self._nested_escape = False
+
+    # ------------------------------------------
+    # 상태 조회
+    # ------------------------------------------
+    def partial_value(self):
+        """
+        현재 읽고 있는 문자열 필드의 지금까지 값을 돌려줍니다.
+        """
+        if self._state == 'string_value':
+            return ''.join(self._buf)
+        return ''
+
+    @property
+    def started(self):
+        return self._state != 'seek'
+
+    # ------------------------------------------
+    # 입력 처리
+    # ------------------------------------------
+    def feed(self, text):
+        """
+        응답 조각을 읽고, 이번 조각에서 완성된 필드 목록 [(키, 값), ...]을 돌려줍니다.
+        """
+        completed = []
+        self.consumed += len(text)
+        i = 0
+        n = len(text)
+        while i < n and not self.done:
+            state = self._state
+
+            if state == 'seek':
+                start = text.find('{', i)
+                if start == -1:
+                    self.skipped += n - i
+                    return completed
+                self.skipped += start - i
+                self._state = 'key_or_end'
+                i = start + 1
+
+            elif state in ('key', 'string_value'):
+                i = self._read_string(text, i)
+                if self._state == 'string_closed':
+                    if state == 'key':
+                        self.current_key = _fix_surrogates(''.join(self._buf))
+                        self._state = 'colon'
+                    else:
+                        self._complete(_fix_surrogates(''.join(self._buf)), completed)
+                    self._buf = []
+
+            elif state == 'key_or_end':
+                ch = text[i]
+                if ch == '"':
+                    self._state = 'key'
+                    self._buf = []
+                elif ch == '}':
+                    self.done = True
+                i += 1
+
+            elif state == 'colon':
+                if text[i] == ':':
+                    self._state = 'value'
+                i += 1
+
+            elif state == 'value':
+                ch = text[i]
+                if ch == '"':
+                    self._state = 'string_value'
+                    self._buf = []
+                    i += 1
+                elif ch in '{[':
+                    self._state = 'nested'
+                    self._buf = [ch]
+                    self._nested_depth = 1
+                    self._nested_in_string = False
+                    self._nested_escape = False
+                    i += 1
+                elif ch.isspace():
+                    i += 1
+                else:
+                    self._state = 'scalar'
+                    self._buf = []
+
+            elif state == 'nested':
+                i = self._read_nested(text, i)
+                if self._nested_depth == 0:
+                    raw = ''.join(self._buf)
+                    try:
+                        value = json.loads(raw)
+                    except ValueError:
+                        value = raw
+                    self._complete(value, completed)
+                    self._buf = []
+
+            elif state == 'scalar':
+                match = _SCALAR_END.search(text, i)
+                end = match.start() if match else n
+                self._buf.append(text[i:end])
+                i = end
+                if match:
+                    raw = ''.join(self._buf).strip()
+                    try:
+                        value = json.loads(raw)
+                    except ValueError:
+                        value = raw
+                    self._complete(value, completed)
+                    self._buf = []
+        return completed
+
+    def _complete(self, value, completed):
+        self.fields[self.current_key] = value
+        completed.append((self.current_key, value))
+        if self.on_field:
+            self.on_field(self.current_key, value)
+        self.current_key = None
+        self._state = 'key_or_end'
+
+    def _read_string(self, text, i):
+        """
+        문자열 내용을 읽습니다. 닫는 따옴표를 만나면 상태를 'string_closed'로 바꿉니다.
+        """
+        n = len(text)
+        buf = self._buf
+        while i < n:
+            if self._escape is not None:
+                if self._escape == '':
+                    ch = text[i]
+                    i += 1
+                    if ch == 'u':
+                        hex_digits = text[i:i + 4]
+                        if len(hex_digits) == 4:
+                            try:
+                                buf.append(chr(int(hex_digits, 16)))
+                                i += 4
+                                self._escape = None
+                                continue
+                            except ValueError:
+                                pass
+                        self._escape = 'u'
+                        continue
+                    buf.append(_ESCAPES.get(ch, ch))
+                    self._escape = None
+                else:
+                    # \uXXXX의 16진수 4자리 누적 (조각 경계에 걸칠 수 있음)
+                    need = 5 - len(self._escape)
+                    self._escape += text[i:i + need]
+                    i += min(need, n - i)
+                    if len(self._escape) == 5:
+                        try:
+                            buf.append(chr(int(self._escape[1:], 16)))
+                        except ValueError:
+                            buf.append('\\' + self._escape)
+                        self._escape = None
+                continue
+
+            match = _PLAIN_STRING.match(text, i)
+            if match:
+                buf.append(match.group())
+                i = match.end()
+                continue
+
+            ch = text[i]
+            i += 1
+            if ch == '\\':
+                self._escape = ''
+            else:  # 닫는 따옴표
+                self._state = 'string_closed'
+                return i
+        return i
+
+    def _read_nested(self, text, i):
+        """
+        중첩 객체/배열을 원문 그대로 모읍니다. (괄호 짝이 맞으면 종료)
+        """
+        n = len(text)
+        start = i
+        while i < n and self._nested_depth > 0:
+            ch = text[i]
+            i += 1
+            if self._nested_in_string:
+                if self._nested_escape:
+                    self._nested_escape = False
+                elif ch == '\\':
+                    self._nested_escape = True
+                elif ch == '"':
+                    self._nested_in_string = False
+            elif ch == '"':
+                self._nested_in_string = True
+            elif ch in '{[':
+                self._nested_depth += 1
+            elif ch in '}]':
+                self._nested_depth -= 1
+        self._buf.append(text[start:i])
+        return i
+
+def is_complete_response(text):
+    """
+    응답이 제목과 본문을 모두 갖춘 닫힌 JSON 객체인지 확인합니다.
+    """
+    extractor = IncrementalJSONExtractor()
+    extractor.feed(text)
+    return extractor.done and bool(extractor.fields.get('title')) and bool(extractor.fields.get('content'))
+
+def parse_response(text):
+    """
+    AI 응답 전체를 한 번의 선형 탐색으로 해석합니다.
+
+    코드 블록과 앞뒤 설명을 건너뛰고, 이스케이프를 풀고, 응답이 중간에 끊겼으면
+    그때까지 받은 문자열 필드 값을 살려 냅니다(잘린 JSON 복구).
+
+    Returns:
+        {'title', 'meta_description', 'content', 'sections', 'complete', 'repaired'}
+        - sections: 응답에 sections 필드가 없었으면 None
+        - complete: 최상위 객체가 정상적으로 닫혔는지
+        - repaired: 끊긴 필드 값을 복구해서 채웠는지
+    """
+    extractor = IncrementalJSONExtractor()
+    extractor.feed(text)
+    fields = dict(extractor.fields)
+
+    repaired = False
+    if not extractor.done and extractor.current_key and extractor.current_key not in fields:
+        partial = extractor.partial_value()
+        if partial:
+            fields[extractor.current_key] = _fix_surrogates(partial)
+            repaired = True
+
+    def text_field(key):
+        value = fields.get(key)
+        return value if isinstance(value, str) else ''
+
+    sections = fields.get('sections')
+    return {
+        'title': text_field('title').strip(),
+        'meta_description': text_field('meta_description').strip(),
+        'content': text_field('content').strip(),
+        'sections': sections if isinstance(sections, list) else None,
+        'complete': extractor.done,
+        'repaired': repaired,
+    }
+
+# Gemini 구조화 출력(response_schema)에 사용할 응답 스키마
+RESPONSE_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'title': {'type': 'STRING'},
+        'meta_description': {'type': 'STRING'},
+        'content': {'type': 'STRING'},
+        'sections': {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {
+                    'heading': {'type': 'STRING'},
+                    'summary': {'type': 'STRING'},
+                },
+                'required': ['heading', 'summary'],
+            },
+        },
+    },
+    'required': ['title', 'meta_description', 'content', 'sections'],
+}
+
+_SCHEMA_TYPES = {'OBJECT': dict, 'ARRAY': list, 'STRING': str}
+
+def _validate(value, schema, path, errors):
+    expected = _SCHEMA_TYPES[schema['type'].upper()]
+    if not isinstance(value, expected):
+        errors.append(f"{path}: {schema['type'].lower()} 형식이 아님")
+        return
+    if expected is dict:
+        for key in schema.get('required', []):
+            if key not in value:
+                errors.append(f"{path}.{key}: 필수 필드 없음")
+        for key, sub_schema in schema.get('properties', {}).items():
+            if key in value:
+                _validate(value[key], sub_schema, f"{path}.{key}", errors)
+    elif expected is list:
+        for i, item in enumerate(value):
+            _validate(item, schema['items'], f"{path}[{i}]", errors)
+    elif not value.strip():
+        errors.append(f"{path}: 빈 문자열")
+
+def validate_response(data, schema=RESPONSE_SCHEMA, require_sections=True):
+    """
+    응답 데이터를 스키마로 검증합니다.
+
+    parse_response() 결과는 응답이 끝까지 오지 않았으면(complete=False) 필드가 채워져 있어도
+    실패로 봅니다. (출력 토큰 한도로 잘린 응답을 다시 생성하도록)
+
+    Args:
+        data: json.loads 결과 또는 parse_response() 결과
+        require_sections: sections 필드를 필수로 볼지 (자유 형식 응답이면 False)
+
+    Returns:
+        오류 메시지 목록 (비어 있으면 통과)
+    """
+    errors = []
+    if isinstance(data, dict):
+        if data.get('complete') is False:
+            errors.append("$: 응답이 중간에 끊김")
+        # parse_response()는 받지 못한 sections를 None으로 표시
+        if data.get('sections') is None or (not require_sections and not data['sections']):
+            data = {key: value for key, value in data.items() if key != 'sections'}
+    if not require_sections:
+        schema = dict(schema, required=[key for key in schema['required'] if key != 'sections'])
+    _validate(data, schema, '$', errors)
+    return errors
@@ -0,0 +1,364 @@
+"""
+상주(daemon) 스케줄러
+
+작업 스케줄러/cron/GitHub Actions가 실행할 때마다 패키지 설치, 모듈 로딩, 인증을 새로 하는 대신
+프로세스 하나를 띄워 두고 cron 형식 일정에 맞춰 포스팅을 실행합니다.
+워드프레스 연결(세션), 모델 클라이언트, 캐시는 실행 사이에도 그대로 재사용됩니다.
+
+- cron 형식 일정 (분 시 일 월 요일, *, */n, a-b, a-b/n, 쉼표 목록)
+- 지터: 정해진 시각에서 0~N초 늦춰 실행 (여러 봇이 같은 시각에 몰리지 않도록)
+- 잠금 파일: 같은 작업이 두 프로세스에서 동시에 돌지 않음 (프로세스가 죽으면 OS가 자동 해제)
+- 놓친 실행 보충: 꺼져 있던 동안 지나간 일정이 있으면 시작하자마자 한 번 실행
+"""
+
+import os
+import random
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+
+from cache_store import cache_path, load_json, save_json
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8 이하 - 로컬 시간대만 사용
+    ZoneInfo = None
+
+# 기본 일정, 지터(초), 놓친 실행을 보충할 최대 기간(시간), 일정 시간대 (비우면 시스템 시간대)
+SCHEDULE_CRON = os.environ.get('SCHEDULE_CRON', '0 7 * * *')
+SCHEDULE_JITTER = float(os.environ.get('SCHEDULE_JITTER', 120))
+SCHEDULE_CATCH_UP_HOURS = float(os.environ.get('SCHEDULE_CATCH_UP_HOURS', 6))
+SCHEDULE_TZ = os.environ.get('SCHEDULE_TZ', '')
+
+# ==========================================
+# cron 일정
+# ==========================================
+_FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day', 1, 31),
+    ('month', 1, 12),
+    ('weekday', 0, 6),  # 0 = 일요일 (7도 일요일로 인정)
+)
+
+def _parse_field(text, low, high):
+    values = set()
+    for part in text.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError(f"잘못된 간격: {text}")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(v) for v in part.split('-', 1))
+        else:
+            start = end = int(part)
+            if step > 1:
+                end = high
+        if high == 6 and end == 7:
+            # 요일 7 = 일요일
+            values.add(0)
+            if start == 7:
+                continue
+            end = 6
+        if start < low or end > high or start > end:
+            raise ValueError(f"범위를 벗어난 값: {text} ({low}-{high})")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+class CronSpec:
+    """
+    cron 형식 일정 ("분 시 일 월 요일")
+
+    일과 요일이 모두 지정되면 cron과 같이 둘 중 하나만 맞아도 실행합니다.
+
+    사용 예:
+        CronSpec("*/30 9-18 * * 1-5").next_after(datetime.now())
+    """
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 형식은 필드 5개가 필요합니다: '{expression}'")
+        self.expression = expression
+        parsed = [_parse_field(text, low, high) for text, (_, low, high) in zip(fields, _FIELDS)]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = parsed
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def _day_matches(self, dt):
+        weekday = (dt.weekday() + 1) % 7
+        if self._any_day or self._any_weekday:
+            return dt.day in self.days and weekday in self.weekdays
+        return dt.day in self.days or weekday in self.weekdays
+
+    def matches(self, dt):
+        return (dt.minute in self.minutes and dt.hour in self.hours
+                and dt.month in self.months and self._day_matches(dt))
+
+    def next_after(self, dt):
+        """
+        dt 이후(dt 제외) 처음 맞는 시각 (분 단위)
+        """
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (candidate.month == 12)
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"맞는 시각이 없는 일정입니다: '{self.expression}'")
+
+    def __repr__(self):
+        return f"CronSpec('{self.expression}')"
+
+# ==========================================
+# 잠금 파일
+# ==========================================
+class FileLock:
+    """
+    프로세스 간 배타 잠금 (잠금 파일 + OS 파일 잠금)
+
+    프로세스가 비정상 종료해도 OS가 잠금을 풀어 주므로 오래된 잠금 파일이 남아도 문제없습니다.
+
+    사용 예:
+        with FileLock(cache_path('posting.lock')) as acquired:
+            if not acquired:
+                return  # 다른 프로세스가 실행 중
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def acquire(self, timeout=0):
+        """
+        잠금을 시도합니다. (기본값은 기다리지 않음)
+
+        Args:
+            timeout: 다른 프로세스가 잡고 있을 때 기다릴 최대 시간(초)
+
+        Returns:
+            잠금을 얻었으면 True
+        """
+        handle = open(self.path, 'a+')
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if os.name == 'nt':
+                    import msvcrt
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    import fcntl
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    handle.close()
+                    return False
+                time.sleep(0.05)
+        # 누가 잡고 있는지 확인할 수 있도록 PID 기록
+        handle.seek(0)
+        handle.truncate()
+        handle.write(f"{os.getpid()}\n")
+        handle.flush()
+        self._file = handle
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+def posting_lock():
+    """
+    포스팅 실행 잠금 (상주 스케줄러, cli.py run/batch가 함께 사용)
+    """
+    return FileLock(cache_path('posting.lock'))
+
+# ==========================================
+# 스케줄러
+# ==========================================
+class Job:
+    """
+    일정에 맞춰 실행할 작업
+
+    Args:
+        name: 작업 이름 (상태 저장 키, 로그용)
+        spec: cron 문자열 또는 CronSpec
+        func: 인자 없이 호출할 함수
+        jitter: 정해진 시각에서 최대 몇 초 늦춰 실행할지
+        lock: 실행 중 잡을 FileLock (기본값: posting_lock())
+    """
+
+    def __init__(self, name, spec, func, jitter=SCHEDULE_JITTER, lock=None):
+        self.name = name
+        self.spec = spec if isinstance(spec, CronSpec) else CronSpec(spec)
+        self.func = func
+        self.jitter = jitter
+        self.lock = lock or posting_lock()
+
+class Scheduler:
+    """
+    작업 목록을 일정에 맞춰 차례로 실행하는 상주 루프
+
+    작업은 한 번에 하나씩 실행합니다. 작업이 길어져 다음 일정을 지나치면 그 일정은 건너뜁니다.
+
+    Args:
+        jobs: Job 목록
+        timezone: 일정 시간대 이름 (예: 'Asia/Seoul', 비우면 시스템 시간대)
+        catch_up_hours: 시작할 때 이 기간 안에 놓친 일정이 있으면 바로 한 번 실행 (0이면 안 함)
+        state_path: 작업별 마지막 실행 기록 파일 (기본값: 캐시 폴더의 scheduler_state.json)
+    """
+
+    def __init__(self, jobs, timezone=SCHEDULE_TZ, catch_up_hours=SCHEDULE_CATCH_UP_HOURS, state_path=None):
+        self.jobs = list(jobs)
+        self.tz = ZoneInfo(timezone) if timezone and ZoneInfo else None
+        self.catch_up = catch_up_hours * 3600
+        self.state_path = state_path or cache_path('scheduler_state.json')
+        self.state = load_json(self.state_path, {})
+        self._stop = threading.Event()
+        self._random = random.Random()
+
+    def now(self):
+        return datetime.now(self.tz).replace(tzinfo=None) if self.tz else datetime.now()
+
+    def _to_timestamp(self, dt):
+        if self.tz:
+            return dt.replace(tzinfo=self.tz).timestamp()
+        return dt.timestamp()
+
+    def _from_timestamp(self, ts):
+        return datetime.fromtimestamp(ts, self.tz).replace(tzinfo=None) if self.tz else datetime.fromtimestamp(ts)
+
+    def stop(self, *args):
+        """
+        실행 중인 작업이 끝나면 루프를 멈춥니다. (SIGTERM/SIGINT 처리기로도 사용)
+        """
+        if not self._stop.is_set():
+            print("🛑 종료 요청 - 진행 중인 작업이 끝나면 멈춥니다.")
+        self._stop.set()
+
+    def _save_state(self):
+        try:
+            save_json(self.state_path, self.state)
+        except OSError as e:
+            print(f"⚠️ 스케줄러 상태 저장 실패: {e}")
+
+    def _missed_slot(self, job, now):
+        """
+        마지막 실행 이후 catch_up 기간 안에 지나간 일정 중 가장 최근 것 (없으면 None)
+        """
+        last = self.state.get(job.name, {}).get('last_slot')
+        if not self.catch_up or last is None:
+            return None
+        start = max(self._from_timestamp(last), now - timedelta(seconds=self.catch_up))
+        missed = None
+        slot = job.spec.next_after(start)
+        while slot <= now:
+            missed = slot
+            slot = job.spec.next_after(slot)
+        return missed
+
+    def run_job(self, job, slot):
+        """
+        잠금을 잡고 작업을 한 번 실행합니다.
+
+        Returns:
+            성공 여부 (다른 프로세스가 실행 중이면 None)
+        """
+        with job.lock as acquired:
+            if not acquired:
+                print(f"⏭️ [{job.name}] 다른 프로세스가 포스팅 중이라 이번 일정({slot:%H:%M})은 건너뜁니다.")
+                return None
+            print(f"\n⏰ [{job.name}] {slot:%Y-%m-%d %H:%M} 일정 실행")
+            started = time.time()
+            ok = True
+            try:
+                job.func()
+            except Exception as e:
+                ok = False
+                print(f"❌ [{job.name}] 작업 실패: {e}")
+                import traceback
+                traceback.print_exc()
+            self.state[job.name] = {
+                'last_slot': self._to_timestamp(slot),
+                'finished_at': time.time(),
+                'seconds': round(time.time() - started, 1),
+                'ok': ok,
+            }
+            self._save_state()
+            return ok
+
+    def run_forever(self):
+        """
+        stop()이 호출될 때까지 일정에 맞춰 작업을 실행합니다.
+        """
+        now = self.now()
+        schedule = {}
+        for job in self.jobs:
+            missed = self._missed_slot(job, now)
+            if missed is not None and not self._stop.is_set():
+                print(f"↩️ [{job.name}] 놓친 일정({missed:%m-%d %H:%M}) 보충 실행")
+                self.run_job(job, missed)
+            schedule[job.name] = self._plan(job, job.spec.next_after(self.now()))
+
+        while not self._stop.is_set():
+            job = min(self.jobs, key=lambda j: schedule[j.name][1])
+            slot, run_at = schedule[job.name]
+            wait = (run_at - self.now()).total_seconds()
+            if wait > 0 and self._stop.wait(wait):
+                break
+            self.run_job(job, slot)
+            now = self.now()
+            skipped = 0
+            slot = job.spec.next_after(slot)
+            while slot <= now:
+                skipped += 1
+                slot = job.spec.next_after(slot)
+            if skipped:
+                print(f"⏭️ [{job.name}] 실행이 길어져 지나간 일정 {skipped}개를 건너뜁니다.")
+            schedule[job.name] = self._plan(job, slot)
+        print("👋 스케줄러 종료")
+
+    def _plan(self, job, slot):
+        """
+        (일정, 지터를 더한 실제 실행 시각)
+        """
+        run_at = slot + timedelta(seconds=self._random.uniform(0, job.jitter)) if job.jitter > 0 else slot
+        print(f"🗓️ [{job.name}] 다음 실행: {run_at:%Y-%m-%d %H:%M:%S} ({job.spec.expression})")
+        return slot, run_at
+
+    def install_signal_handlers(self):
+        for name in ('SIGINT', 'SIGTERM'):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), self.stop)
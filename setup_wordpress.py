@@ -91,7 +91,7 @@ def test_connection(wp_url, wp_user, wp_pass):
     워드프레스 연결을 테스트합니다.
     """
     import requests
-    import base64
+    from wp_client import WordPressClient
     
     print()
     print("=" * 60)
@@ -99,20 +99,11 @@ def test_connection(wp_url, wp_user, wp_pass):
     print("=" * 60)
     print()
     
-    # API 엔드포인트
-    api_url = f"{wp_url.rstrip('/')}/wp-json/wp/v2/posts"
-    
-    # 인증
-    credentials = f"{wp_user}:{wp_pass}"
-    token = base64.b64encode(credentials.encode()).decode('utf-8')
-    
-    headers = {
-        'Authorization': f'Basic {token}',
-    }
+    client = WordPressClient(wp_url, wp_user, wp_pass, timeout=10)
     
     try:
-        print(f"📡 연결 중: {api_url}")
-        response = requests.get(api_url, headers=headers, timeout=10)
+        print(f"📡 연결 중: {client.api_url('wp/v2/posts')}")
+        response = client.list_posts()
         
         if response.status_code == 200:
             print("✅ 연결 성공!")
@@ -145,8 +136,7 @@ def get_categories(wp_url, wp_user, wp_pass):
     """
     카테고리 목록을 조회합니다.
     """
-    import requests
-    import base64
+    from wp_client import WordPressClient
     
     print()
     print("=" * 60)
@@ -154,17 +144,10 @@ def get_categories(wp_url, wp_user, wp_pass):
     print("=" * 60)
     print()
     
-    api_url = f"{wp_url.rstrip('/')}/wp-json/wp/v2/categories"
-    
-    credentials = f"{wp_user}:{wp_pass}"
-    token = base64.b64encode(credentials.encode()).decode('utf-8')
-    
-    headers = {
-        'Authorization': f'Basic {token}',
-    }
+    client = WordPressClient(wp_url, wp_user, wp_pass, timeout=10)
     
     try:
-        response = requests.get(api_url, headers=headers, timeout=10)
+        response = client.list_terms('categories', per_page=100)
         
         if response.status_code == 200:
             categories = response.json()
@@ -0,0 +1,247 @@
+"""
+워드프레스 카테고리/태그 로컬 캐시
+
+카테고리와 태그 목록을 디스크에 저장해 두고 슬러그/이름 → ID 색인으로 조회합니다.
+TTL 안에서는 네트워크 요청 없이 ID를 찾고, TTL이 지나면 새로 추가된 항목만
+가져오는 증분 갱신을 시도합니다. 없는 항목은 필요할 때 만듭니다.
+"""
+
+import html
+import threading
+import time
+
+import requests
+
+from cache_store import cache_path, load_json, save_json
+from wp_client import BatchUnsupported
+
+TAXONOMIES = ('categories', 'tags')
+PER_PAGE = 100
+
+def normalize_term_name(name):
+    """
+    비교용 이름 정규화 (워드프레스는 &amp; 처럼 HTML 이스케이프된 이름을 돌려줌)
+    """
+    return ' '.join(html.unescape(str(name)).split()).lower()
+
+class TaxonomyCache:
+    """
+    카테고리/태그 캐시
+
+    Args:
+        client: WordPressClient
+        path: 캐시 파일 경로 (기본값: 캐시 폴더의 taxonomy_cache.json)
+        ttl: 캐시 유효 시간(초)
+    """
+
+    def __init__(self, client, path=None, ttl=6 * 3600):
+        self.client = client
+        self.path = path or cache_path('taxonomy_cache.json')
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._data = load_json(self.path, {})
+        # 다른 사이트의 캐시를 잘못 쓰지 않도록 사이트 주소 확인
+        if self._data.get('site') != client.base_url:
+            self._data = {'site': client.base_url}
+        self._indexes = {}
+
+    # ------------------------------------------
+    # 로드/갱신
+    # ------------------------------------------
+    def _fetch_pages(self, taxonomy, stop_at_id=None):
+        """
+        ID 내림차순으로 페이지를 돌며 항목을 가져옵니다.
+        stop_at_id가 있으면 그 ID 이하가 나오는 순간 멈춥니다. (증분 갱신)
+
+        Returns:
+            (항목 목록, 서버가 알려 준 전체 개수)
+        """
+        terms = []
+        total = None
+        page = 1
+        while True:
+            response = self.client.list_terms(
+                taxonomy, per_page=PER_PAGE, page=page, orderby='id', order='desc', hide_empty='false'
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f"{taxonomy} 조회 실패: {response.status_code}")
+            if total is None:
+                total = int(response.headers.get('X-WP-Total', 0) or 0)
+            batch = response.json()
+            for term in batch:
+                if stop_at_id is not None and term['id'] <= stop_at_id:
+                    return terms, total
+                terms.append(term)
+            total_pages = int(response.headers.get('X-WP-TotalPages', 1) or 1)
+            if not batch or page >= total_pages:
+                return terms, total
+            page += 1
+
+    def _store_terms(self, taxonomy, terms, total, replace):
+        entry = self._data.get(taxonomy) if not replace else None
+        stored = dict(entry['terms']) if entry else {}
+        for term in terms:
+            stored[str(term['id'])] = {
+                'id': term['id'],
+                'name': term.get('name', ''),
+                'slug': term.get('slug', ''),
+                'parent': term.get('parent', 0),
+                'count': term.get('count', 0),
+            }
+        self._data[taxonomy] = {'terms': stored, 'loaded_at': time.time(), 'total': total}
+        self._indexes.pop(taxonomy, None)
+
+    def refresh(self, taxonomy, force=False):
+        """
+        캐시를 갱신합니다.
+        TTL이 지나지 않았으면 아무 요청도 보내지 않고, 지났으면 새 항목만 가져옵니다.
+        삭제 등으로 개수가 맞지 않으면 전체를 다시 읽습니다.
+        """
+        with self._lock:
+            entry = self._data.get(taxonomy)
+            if entry and not force and time.time() - entry['loaded_at'] < self.ttl:
+                return
+
+            if entry and entry['terms'] and not force:
+                known_max = max(int(term_id) for term_id in entry['terms'])
+                new_terms, total = self._fetch_pages(taxonomy, stop_at_id=known_max)
+                self._store_terms(taxonomy, new_terms, total, replace=False)
+                if len(self._data[taxonomy]['terms']) == total:
+                    self._save()
+                    return
+
+            terms, total = self._fetch_pages(taxonomy)
+            self._store_terms(taxonomy, terms, total, replace=True)
+            self._save()
+
+    def _save(self):
+        try:
+            save_json(self.path, self._data)
+        except OSError as e:
+            print(f"⚠️ 분류 캐시 저장 실패: {e}")
+
+    # ------------------------------------------
+    # 조회
+    # ------------------------------------------
+    def _index(self, taxonomy):
+        index = self._indexes.get(taxonomy)
+        if index is None:
+            index = {}
+            for term in self._data.get(taxonomy, {}).get('terms', {}).values():
+                if term['slug']:
+                    index.setdefault(('slug', term['slug'].lower()), term['id'])
+                index.setdefault(('name', normalize_term_name(term['name'])), term['id'])
+            self._indexes[taxonomy] = index
+        return index
+
+    def terms(self, taxonomy):
+        """
+        캐시된 항목 목록을 돌려줍니다. (필요하면 갱신)
+        """
+        self.refresh(taxonomy)
+        return sorted(self._data[taxonomy]['terms'].values(), key=lambda term: term['id'])
+
+    def find(self, taxonomy, name_or_slug):
+        """
+        이름 또는 슬러그로 ID를 찾습니다. (없으면 None)
+        """
+        self.refresh(taxonomy)
+        with self._lock:
+            index = self._index(taxonomy)
+            key = str(name_or_slug).strip()
+            return index.get(('slug', key.lower())) or index.get(('name', normalize_term_name(key)))
+
+    def ensure(self, taxonomy, name):
+        """
+        이름에 해당하는 ID를 돌려주고, 없으면 새로 만듭니다.
+        """
+        term_id = self.find(taxonomy, name)
+        if term_id is not None:
+            return term_id
+
+        with self._lock:
+            response = self.client.create_term(taxonomy, name)
+            data = response.json() if response.content else {}
+            return self._remember_created(taxonomy, name, response.status_code, data)
+
+    def _fetch_term(self, taxonomy, term_id):
+        """
+        ID로 항목 하나를 조회합니다. (실패하면 None)
+        """
+        try:
+            response = self.client.get(f'wp/v2/{taxonomy}/{term_id}',
+                                       params={'_fields': 'id,name,slug,parent,count'})
+        except requests.RequestException:
+            return None
+        return response.json() if response.status_code == 200 else None
+
+    def _remember_created(self, taxonomy, name, status, data):
+        """
+        항목 생성 응답을 캐시에 반영하고 ID를 돌려줍니다.
+        """
+        if status == 201:
+            term = data
+        elif data.get('code') == 'term_exists':
+            # 캐시에 없던(다른 곳에서 방금 만든) 항목 - 오류 응답에는 슬러그가 없으므로 ID로 다시 조회
+            term_id = data['data']['term_id']
+            term = self._fetch_term(taxonomy, term_id) or {'id': term_id, 'name': name, 'slug': ''}
+        else:
+            raise RuntimeError(f"'{name}' 생성 실패: {status} {data.get('message', '')}")
+
+        self._store_terms(taxonomy, [term], self._data[taxonomy].get('total', 0) + 1, replace=False)
+        self._data[taxonomy]['loaded_at'] = time.time()
+        self._save()
+        print(f"🏷️ {taxonomy} 새 항목 생성: {name} (ID: {term['id']})")
+        return term['id']
+
+    def _create_many(self, taxonomy, names):
+        """
+        없는 항목 여러 개를 batch/v1 한 번으로 만듭니다. (지원하지 않으면 빈 딕셔너리)
+
+        Returns:
+            {이름: ID}
+        """
+        size = self.client.batch_size()
+        if not size:
+            return {}
+        created = {}
+        with self._lock:
+            # 기다리는 동안 다른 스레드가 만든 항목은 제외
+            for name in names:
+                term_id = self.find(taxonomy, name)
+                if term_id is not None:
+                    created[name] = term_id
+            names = [name for name in names if name not in created]
+            for start in range(0, len(names), size):
+                chunk = names[start:start + size]
+                try:
+                    responses = self.client.batch([
+                        {'method': 'POST', 'path': f'/wp/v2/{taxonomy}', 'body': {'name': name}} for name in chunk
+                    ])
+                except BatchUnsupported:
+                    return created
+                for name, result in zip(chunk, responses):
+                    try:
+                        created[name] = self._remember_created(taxonomy, name, result['status'], result['body'] or {})
+                    except RuntimeError as e:
+                        print(f"⚠️ {e}")
+        return created
+
+    def resolve(self, taxonomy, names, create=True):
+        """
+        이름 목록을 ID 목록으로 바꿉니다. create=False면 없는 항목은 건너뜁니다.
+        없는 항목이 여럿이면 batch/v1으로 한 번에 만듭니다.
+        """
+        found = {name: self.find(taxonomy, name) for name in names}
+        missing = [name for name, term_id in found.items() if term_id is None]
+        if create and len(missing) > 1:
+            found.update(self._create_many(taxonomy, missing))
+
+        ids = []
+        for name in names:
+            term_id = found.get(name)
+            if term_id is None and create:
+                term_id = self.ensure(taxonomy, name)
+            if term_id is not None and term_id not in ids:
+                ids.append(term_id)
+        return ids
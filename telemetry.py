@@ -0,0 +1,521 @@
+"""
+실행 계측 (단계별 소요 시간, 전송량, 재시도, 토큰/비용)
+
+run_posts가 실행마다 RunMetrics를 하나 열고, 계측 대상 함수(@instrumented)와 HTTP/모델 호출 지점이
+현재 실행에 기록합니다. 실행이 끝나면 리포트를 JSON(실행별 파일)과 JSONL(실행 요약 한 줄)로 남깁니다.
+실행 중이 아닐 때(dry-run, replay 등)는 기록 함수가 아무 일도 하지 않습니다.
+
+    단계(stage): news, generate, image, media, publish - 함수 단위 소요 시간
+    서비스(service): rss, gemini, unsplash, image, wordpress - 요청 수, 오류, 재시도, 바이트
+    모델(llm): 모델별 입력/출력 토큰과 예상 비용 (Gemini usage_metadata, mock은 추정치)
+
+상주 모드에서는 누적 값을 Prometheus 텍스트 형식(/metrics)으로 내보낼 수 있습니다.
+
+사용법:
+    python telemetry.py [run_reports/runs.jsonl]   # 최근 실행 요약
+"""
+
+import functools
+import json
+import math
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+
+# 실행 리포트 저장 폴더 (비우면 저장 안 함), 상주 모드 /metrics 포트(0이면 끔)와 주소
+RUN_REPORT_DIR = os.environ.get('RUN_REPORT_DIR', 'run_reports')
+METRICS_PORT = int(os.environ.get('METRICS_PORT', 0))
+METRICS_HOST = os.environ.get('METRICS_HOST', '127.0.0.1')
+# 모델 가격 덮어쓰기 (100만 토큰당 USD, 예: "gemini-2.5-flash=0.3/2.5,gemini-2.5-pro=1.25/10")
+LLM_PRICES = os.environ.get('LLM_PRICES', '')
+
+# 100만 토큰당 (입력, 출력) USD - 유료 등급 표준 가격 기준 (출력에는 thinking 토큰 포함)
+DEFAULT_PRICES = {
+    'gemini-2.5-pro': (1.25, 10.0),
+    'gemini-2.5-flash': (0.30, 2.50),
+    'gemini-2.5-flash-lite': (0.10, 0.40),
+    'gemini-2.0-flash': (0.10, 0.40),
+    'gemini-2.0-flash-lite': (0.075, 0.30),
+    'gemini-1.5-flash': (0.075, 0.30),
+    'gemini-1.5-pro': (1.25, 5.0),
+    'mock': (0.0, 0.0),
+}
+
+def _parse_prices(text):
+    prices = dict(DEFAULT_PRICES)
+    for item in text.split(','):
+        if '=' not in item:
+            continue
+        model, values = item.split('=', 1)
+        prompt_price, _, completion_price = values.partition('/')
+        prices[model.strip()] = (float(prompt_price), float(completion_price or prompt_price))
+    return prices
+
+PRICES = _parse_prices(LLM_PRICES)
+
+def model_price(model):
+    """
+    모델의 (입력, 출력) 100만 토큰당 가격을 돌려줍니다. (모르는 모델이면 None)
+    'gemini-2.5-flash-preview-05-20'처럼 접미사가 붙은 이름은 가장 길게 일치하는 이름의 가격을 씁니다.
+    """
+    name = model.split('/')[-1]
+    if name in PRICES:
+        return PRICES[name]
+    matches = [known for known in PRICES if name.startswith(known)]
+    return PRICES[max(matches, key=len)] if matches else None
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    price = model_price(model)
+    if price is None:
+        return None
+    return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+def percentile(values, fraction):
+    """
+    최근접 순위(nearest-rank) 백분위수 (값이 없으면 0)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+# ==========================================
+# 실행 하나의 계측 값
+# ==========================================
+class RunMetrics:
+    """
+    실행 하나(run_posts 한 번)의 계측 값 (여러 스레드에서 기록해도 안전)
+
+    Args:
+        name: 실행 이름 (리포트 구분용, 예: 상주 스케줄러 작업 이름)
+    """
+
+    def __init__(self, name=''):
+        self.name = name
+        self.run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.started_at = time.time()
+        self.error = None
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans = []
+        self.services = {}
+        self.models = {}
+        self.counters = {}
+        self.posts = []
+        self.extra = {}
+
+    def record_span(self, stage, seconds, ok=True):
+        with self._lock:
+            self.spans.append({
+                'stage': stage,
+                'offset': round(time.perf_counter() - self._started - seconds, 3),
+                'seconds': round(seconds, 3),
+                'ok': ok,
+            })
+
+    def _service(self, service):
+        return self.services.setdefault(service, {
+            'requests': 0, 'errors': 0, 'retries': 0, 'bytes_in': 0, 'bytes_out': 0, 'seconds': 0.0,
+        })
+
+    def record_request(self, service, bytes_in=0, bytes_out=0, seconds=0.0, error=False):
+        with self._lock:
+            data = self._service(service)
+            data['requests'] += 1
+            data['errors'] += 1 if error else 0
+            data['bytes_in'] += bytes_in
+            data['bytes_out'] += bytes_out
+            data['seconds'] += seconds
+
+    def record_retry(self, service, count=1):
+        with self._lock:
+            data = self._service(service)
+            data['retries'] += count
+
+    def record_tokens(self, model, prompt_tokens, completion_tokens, estimated=False):
+        """
+        estimated: usage_metadata가 없어 글자 수로 추정한 값인지
+        """
+        with self._lock:
+            data = self.models.setdefault(model, {
+                'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'estimated_calls': 0,
+            })
+            data['calls'] += 1
+            data['prompt_tokens'] += prompt_tokens
+            data['completion_tokens'] += completion_tokens
+            data['estimated_calls'] += 1 if estimated else 0
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_post(self, topic, url, error=None, resumed=False):
+        with self._lock:
+            self.posts.append({'topic': topic, 'url': url, 'error': error, 'resumed': resumed})
+
+    def attach(self, key, value):
+        """
+        리포트에 추가 정보를 붙입니다. (예: 파이프라인 단계별 통계)
+        """
+        with self._lock:
+            self.extra[key] = value
+
+    # ------------------------------------------
+    # 리포트
+    # ------------------------------------------
+    def _stage_summary(self):
+        stages = {}
+        for span in self.spans:
+            stages.setdefault(span['stage'], []).append(span)
+        summary = {}
+        for stage, spans in stages.items():
+            seconds = [span['seconds'] for span in spans]
+            summary[stage] = {
+                'count': len(spans),
+                'failures': sum(1 for span in spans if not span['ok']),
+                'total_seconds': round(sum(seconds), 3),
+                'p50_seconds': percentile(seconds, 0.5),
+                'p95_seconds': percentile(seconds, 0.95),
+                'max_seconds': max(seconds),
+            }
+        return summary
+
+    def _llm_summary(self):
+        models = {}
+        total_cost = 0.0
+        priced = True
+        for model, data in self.models.items():
+            cost = estimate_cost(model, data['prompt_tokens'], data['completion_tokens'])
+            models[model] = dict(data, cost_usd=round(cost, 6) if cost is not None else None)
+            if cost is None:
+                priced = False
+            else:
+                total_cost += cost
+        return {
+            'models': models,
+            'prompt_tokens': sum(data['prompt_tokens'] for data in self.models.values()),
+            'completion_tokens': sum(data['completion_tokens'] for data in self.models.values()),
+            # 가격을 모르는 모델이 있으면 합계는 그 모델을 뺀 값
+            'cost_usd': round(total_cost, 6),
+            'cost_complete': priced,
+        }
+
+    def report(self, include_spans=True):
+        """
+        실행 리포트를 딕셔너리로 돌려줍니다.
+        """
+        with self._lock:
+            duration = time.perf_counter() - self._started
+            report = {
+                'run_id': self.run_id,
+                'name': self.name,
+                'host': socket.gethostname(),
+                'pid': os.getpid(),
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'duration_seconds': round(duration, 3),
+                'ok': self.error is None and all(post['url'] for post in self.posts),
+                'error': self.error,
+                'published': sum(1 for post in self.posts if post['url']),
+                'failed': sum(1 for post in self.posts if not post['url']),
+                'posts': list(self.posts),
+                'stages': self._stage_summary(),
+                'services': {
+                    name: dict(data, seconds=round(data['seconds'], 3)) for name, data in self.services.items()
+                },
+                'llm': self._llm_summary(),
+                'counters': dict(self.counters),
+            }
+            report.update(self.extra)
+            if include_spans:
+                report['spans'] = list(self.spans)
+        return report
+
+# ==========================================
+# 현재 실행 (계측 지점에서 기록할 대상)
+# ==========================================
+_current = None
+_current_lock = threading.Lock()
+_active = threading.local()
+
+def start_run(name=''):
+    """
+    새 실행을 시작하고 현재 실행으로 지정합니다.
+    상주 모드에서도 포스팅은 잠금 파일로 한 번에 하나만 돌므로 전역 하나로 충분합니다.
+    """
+    global _current
+    run = RunMetrics(name)
+    with _current_lock:
+        _current = run
+    _registry.run_started()
+    return run
+
+def current_run():
+    return _current
+
+def finish_run(run, directory=None):
+    """
+    실행을 끝내고 리포트를 저장합니다. (누적 지표에도 반영)
+
+    Returns:
+        리포트 딕셔너리
+    """
+    global _current
+    with _current_lock:
+        if _current is run:
+            _current = None
+    report = run.report()
+    _registry.add(report)
+    directory = RUN_REPORT_DIR if directory is None else directory
+    if directory:
+        try:
+            path = write_report(report, directory)
+        except OSError as e:
+            print(f"⚠️ 실행 리포트 저장 실패: {e}")
+        else:
+            print_summary(report, path)
+    return report
+
+def record_request(service, bytes_in=0, bytes_out=0, seconds=0.0, error=False):
+    run = _current
+    if run is not None:
+        run.record_request(service, bytes_in, bytes_out, seconds, error)
+
+def record_retry(service, count=1):
+    run = _current
+    if run is not None:
+        run.record_retry(service, count)
+
+def record_tokens(model, prompt_tokens, completion_tokens, estimated=False):
+    run = _current
+    if run is not None:
+        run.record_tokens(model, prompt_tokens, completion_tokens, estimated)
+
+def count(name, value=1):
+    run = _current
+    if run is not None:
+        run.count(name, value)
+
+def instrumented(stage, success=None):
+    """
+    함수 호출 소요 시간을 단계(stage) 이름으로 기록하는 데코레이터
+
+    같은 스레드에서 같은 단계가 겹쳐 호출되면(get_finance_news → collect_news_items 등)
+    바깥 호출만 기록해 시간이 두 번 더해지지 않습니다.
+
+    Args:
+        stage: 단계 이름
+        success: 반환값으로 성공 여부를 판단할 함수 (기본값: 예외가 없으면 성공)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            run = _current
+            active = getattr(_active, 'stages', None)
+            if active is None:
+                active = _active.stages = set()
+            if run is None or stage in active:
+                return func(*args, **kwargs)
+
+            active.add(stage)
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = func(*args, **kwargs)
+                ok = success(result) if success else True
+                return result
+            finally:
+                active.discard(stage)
+                run.record_span(stage, time.perf_counter() - started, ok)
+        return wrapper
+    return decorator
+
+# ==========================================
+# 리포트 저장
+# ==========================================
+def write_report(report, directory):
+    """
+    실행별 JSON 파일을 쓰고, 단계별 기록(spans)을 뺀 요약을 runs.jsonl에 한 줄 추가합니다.
+
+    Returns:
+        실행별 JSON 파일 경로
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"run_{report['run_id']}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    summary = {key: value for key, value in report.items() if key != 'spans'}
+    with open(os.path.join(directory, 'runs.jsonl'), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(summary, ensure_ascii=False) + '\n')
+    return path
+
+def print_summary(report, path=None):
+    llm = report['llm']
+    print(f"\n📊 실행 리포트: 발행 {report['published']}건, 실패 {report['failed']}건 | {report['duration_seconds']:.1f}초")
+    for stage, data in report['stages'].items():
+        print(f"   {stage:<9} {data['count']}회 | p50 {data['p50_seconds']:.2f}초 | p95 {data['p95_seconds']:.2f}초"
+              f" | 실패 {data['failures']}회")
+    for service, data in report['services'].items():
+        print(f"   {service:<9} 요청 {data['requests']}회 | 받음 {data['bytes_in'] // 1024}KB"
+              f" | 보냄 {data['bytes_out'] // 1024}KB | 재시도 {data['retries']}회 | 오류 {data['errors']}회")
+    if llm['models']:
+        print(f"   토큰: 입력 {llm['prompt_tokens']} / 출력 {llm['completion_tokens']} | 예상 비용 ${llm['cost_usd']:.4f}")
+    if path:
+        print(f"   💾 {path}")
+
+# ==========================================
+# Prometheus 지표 (상주 모드)
+# ==========================================
+class MetricsRegistry:
+    """
+    프로세스가 떠 있는 동안 끝난 실행들의 누적 값
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = {'ok': 0, 'failed': 0}
+        self.posts = {'published': 0, 'failed': 0}
+        self.stages = {}
+        self.services = {}
+        self.tokens = {}
+        self.cost = {}
+        self.in_progress = 0
+        self.last_run = None
+
+    def run_started(self):
+        with self._lock:
+            self.in_progress += 1
+
+    def add(self, report):
+        with self._lock:
+            self.in_progress = max(0, self.in_progress - 1)
+            self.runs['ok' if report['ok'] else 'failed'] += 1
+            self.posts['published'] += report['published']
+            self.posts['failed'] += report['failed']
+            for stage, data in report['stages'].items():
+                total = self.stages.setdefault(stage, {'count': 0, 'seconds': 0.0, 'failures': 0})
+                total['count'] += data['count']
+                total['seconds'] += data['total_seconds']
+                total['failures'] += data['failures']
+            for service, data in report['services'].items():
+                total = self.services.setdefault(service, dict.fromkeys(data, 0))
+                for key, value in data.items():
+                    total[key] += value
+            for model, data in report['llm']['models'].items():
+                total = self.tokens.setdefault(model, {'prompt': 0, 'completion': 0})
+                total['prompt'] += data['prompt_tokens']
+                total['completion'] += data['completion_tokens']
+                if data['cost_usd'] is not None:
+                    self.cost[model] = self.cost.get(model, 0.0) + data['cost_usd']
+            self.last_run = {
+                'timestamp': time.time(),
+                'duration': report['duration_seconds'],
+                'ok': report['ok'],
+            }
+
+    def render(self):
+        """
+        Prometheus 텍스트 형식(0.0.4)으로 돌려줍니다.
+        """
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        with self._lock:
+            metric('autopost_runs_total', 'counter', "끝난 실행 수",
+                   [({'result': result}, count) for result, count in self.runs.items()])
+            metric('autopost_run_in_progress', 'gauge', "진행 중인 실행 수", [({}, self.in_progress)])
+            metric('autopost_posts_total', 'counter', "발행 결과별 글 수",
+                   [({'result': result}, count) for result, count in self.posts.items()])
+            lines.append("# HELP autopost_stage_seconds 단계별 소요 시간(초)")
+            lines.append("# TYPE autopost_stage_seconds summary")
+            for stage, data in self.stages.items():
+                lines.append(f'autopost_stage_seconds_sum{{stage="{_escape(stage)}"}} {round(data["seconds"], 3)}')
+                lines.append(f'autopost_stage_seconds_count{{stage="{_escape(stage)}"}} {data["count"]}')
+            metric('autopost_stage_failures_total', 'counter', "단계별 실패 수",
+                   [({'stage': stage}, data['failures']) for stage, data in self.stages.items()])
+            metric('autopost_requests_total', 'counter', "서비스별 요청 수",
+                   [({'service': service}, data['requests']) for service, data in self.services.items()])
+            metric('autopost_request_errors_total', 'counter', "서비스별 실패한 요청 수",
+                   [({'service': service}, data['errors']) for service, data in self.services.items()])
+            metric('autopost_request_retries_total', 'counter', "서비스별 재시도 수",
+                   [({'service': service}, data['retries']) for service, data in self.services.items()])
+            metric('autopost_transfer_bytes_total', 'counter', "서비스별 전송량(바이트)",
+                   [({'service': service, 'direction': direction}, data[f'bytes_{direction}'])
+                    for service, data in self.services.items() for direction in ('in', 'out')])
+            metric('autopost_llm_tokens_total', 'counter', "모델별 토큰 수",
+                   [({'model': model, 'kind': kind}, count)
+                    for model, data in self.tokens.items() for kind, count in data.items()])
+            metric('autopost_llm_cost_usd_total', 'counter', "모델별 예상 비용(USD)",
+                   [({'model': model}, round(cost, 6)) for model, cost in self.cost.items()])
+            if self.last_run:
+                metric('autopost_last_run_timestamp_seconds', 'gauge', "마지막 실행이 끝난 시각",
+                       [({}, round(self.last_run['timestamp'], 3))])
+                metric('autopost_last_run_duration_seconds', 'gauge', "마지막 실행 소요 시간(초)",
+                       [({}, self.last_run['duration'])])
+                metric('autopost_last_run_success', 'gauge', "마지막 실행 성공 여부 (1/0)",
+                       [({}, 1 if self.last_run['ok'] else 0)])
+        return '\n'.join(lines) + '\n'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+_registry = MetricsRegistry()
+
+def metrics_text():
+    return _registry.render()
+
+def start_metrics_server(port=METRICS_PORT, host=METRICS_HOST):
+    """
+    /metrics를 제공하는 HTTP 서버를 백그라운드 스레드로 띄웁니다.
+
+    Returns:
+        서버 객체 (shutdown()으로 종료)
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    print(f"📈 지표 제공: http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(RUN_REPORT_DIR or 'run_reports', 'runs.jsonl')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            reports = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        reports = []
+    if not reports:
+        print(f"📊 아직 기록된 실행 리포트가 없습니다: {path}")
+    for report in reports[-10:]:
+        llm = report['llm']
+        stages = ', '.join(f"{stage} {data['total_seconds']:.1f}초" for stage, data in report['stages'].items())
+        print(f"📊 {report['started_at']} {'✅' if report['ok'] else '❌'} 발행 {report['published']}건"
+              f" | {report['duration_seconds']:.1f}초 ({stages}) | 토큰 {llm['prompt_tokens']}/{llm['completion_tokens']}"
+              f" | ${llm['cost_usd']:.4f}")
@@ -0,0 +1,15 @@
+"""
+테스트 공통 설정
+
+저장소 최상위 모듈을 불러올 수 있게 하고, 캐시 폴더를 임시 폴더로 돌려 실제 .cache를 건드리지 않습니다.
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault('BOT_CACHE_DIR', tempfile.mkdtemp(prefix='bot-cache-'))
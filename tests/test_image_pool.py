@@ -0,0 +1,38 @@
+"""
+image_pool.ImagePool: 보관 한도로 지운 이미지의 반복 금지, 여러 인스턴스의 저장 합치기
+"""
+
+from image_pool import ImagePool
+
+def make_fetcher(batches):
+    def fetcher(query, count):
+        return [
+            {'id': image_id, 'url': f"https://img/{image_id}", 'credit': '', 'download_location': ''}
+            for image_id in batches.pop(0)
+        ]
+    return fetcher
+
+def test_evicted_image_is_not_reused_within_window(tmp_path):
+    pool = ImagePool(make_fetcher([['a', 'b'], ['c'], ['a'], ['a']]), ['finance'], path=str(tmp_path / 'pool.json'),
+                     low_watermark=0, max_images=2)
+    pool.refill()
+    assert pool.take()['id'] == 'a'
+    # 'c'를 받으면 한도를 넘어 이미 쓴 'a'가 지워짐
+    pool.refill()
+    assert 'a' not in pool._images
+    # 같은 배치에 'a'가 다시 와도 반복 금지 기간 안이므로 받지 않음
+    assert pool.refill() == 0
+    assert {pool.take()['id'], pool.take()['id']} == {'b', 'c'}
+    assert pool.take() is None
+
+def test_save_merges_usage_from_other_instances(tmp_path):
+    path = str(tmp_path / 'pool.json')
+    first = ImagePool(make_fetcher([['a', 'b']]), ['finance'], path=path, low_watermark=0)
+    first.refill()
+    second = ImagePool(make_fetcher([]), ['finance'], path=path, low_watermark=0)
+    assert first.take()['id'] == 'a'
+    # second가 읽은 뒤 first가 'a'를 썼지만, 꺼내기 전에 디스크의 사용 기록을 합침
+    assert second.take()['id'] == 'b'
+    third = ImagePool(make_fetcher([]), ['finance'], path=path, low_watermark=0)
+    assert third.available_count() == 0
+    assert {image['use_count'] for image in third._images.values()} == {1}
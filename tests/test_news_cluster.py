@@ -0,0 +1,68 @@
+"""
+news_cluster: LSH 후보 재현율, 유사 헤드라인 묶기, 과거 기록 조회
+"""
+
+import random
+
+from news_cluster import (
+    SIMILARITY_THRESHOLD, HeadlineHistory, band_keys, cluster_news_items, minhash_signature, shingles,
+)
+
+ALPHABET = '가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허'
+
+def jaccard(a, b):
+    a, b = shingles(a), shingles(b)
+    return len(a & b) / len(a | b)
+
+def near_threshold_pairs(count, low=SIMILARITY_THRESHOLD, high=SIMILARITY_THRESHOLD + 0.1, seed=7):
+    """
+    shingle 자카드 유사도가 [low, high)인 제목 쌍을 만듭니다.
+    """
+    rng = random.Random(seed)
+    pairs = []
+    while len(pairs) < count:
+        base = ''.join(rng.choice(ALPHABET) for _ in range(30))
+        edited = list(base)
+        for i in rng.sample(range(len(base)), rng.randint(2, 6)):
+            edited[i] = rng.choice(ALPHABET)
+        edited = ''.join(edited)
+        if low <= jaccard(base, edited) < high:
+            pairs.append((base, edited))
+    return pairs
+
+def test_lsh_candidate_recall_at_threshold():
+    # 임계값 근처 쌍은 거의 모두 적어도 한 band를 공유해야 함 (16×4행이면 약 64%)
+    pairs = near_threshold_pairs(300)
+    hits = sum(
+        1 for a, b in pairs
+        if set(band_keys(minhash_signature(a))) & set(band_keys(minhash_signature(b)))
+    )
+    assert hits / len(pairs) >= 0.97
+
+def test_cluster_groups_near_duplicates_and_drops_signature():
+    items = [
+        {'title': '美 연준, 기준금리 동결…"인하 서두르지 않겠다"', 'keyword': 'FOMC', 'link': 'a'},
+        {'title': '미 연준 기준금리 동결…"인하 서두르지 않겠다" - 연합뉴스', 'keyword': 'FOMC', 'link': 'b'},
+        {'title': '원/달러 환율 1,450원대 마감', 'keyword': '환율', 'link': 'c'},
+    ]
+    reps = cluster_news_items(items)
+    assert [rep['link'] for rep in reps] == ['a', 'c']
+    assert reps[0]['cluster_size'] == 2
+    assert all('signature' not in rep and 'position' not in rep for rep in reps)
+
+def test_history_finds_similar_and_rebuilds_buckets(tmp_path):
+    path = str(tmp_path / 'history.db')
+    history = HeadlineHistory(path)
+    history.add([{'title': '미 연준 기준금리 동결…인하 서두르지 않겠다'}])
+    signature = minhash_signature('美 연준 기준금리 동결…"인하 서두르지 않겠다"')
+    assert history.find_similar(signature)
+
+    # 다른 band 구성으로 만든 기록 파일처럼 버킷을 비우면, 다시 열 때 저장된 서명으로 새로 만듦
+    with history._conn:
+        history._conn.execute("DELETE FROM headline_buckets")
+        history._conn.execute("PRAGMA user_version = 16")
+    assert not history.find_similar(signature)
+    history.close()
+    history = HeadlineHistory(path)
+    assert history.find_similar(signature)
+    history.close()
@@ -0,0 +1,82 @@
+"""
+outbox.Outbox: 발행 상태 전이와 재시도 대상 조회
+"""
+
+import pytest
+
+from outbox import FAILED, GENERATED, MEDIA_UPLOADED, PUBLISHED, PUBLISHING, Outbox, idempotency_key, make_slug
+
+@pytest.fixture
+def outbox(tmp_path):
+    box = Outbox(str(tmp_path / 'outbox.db'))
+    yield box
+    box.close()
+
+KEY = idempotency_key('제목', '<p>본문</p>')
+PAYLOAD = {'title': '제목', 'content': '<p>본문</p>', 'status': 'publish'}
+
+def test_key_and_slug_are_stable():
+    assert KEY == idempotency_key('제목', '<p>본문</p>')
+    assert KEY != idempotency_key('제목', '<p>다른 본문</p>')
+    assert make_slug('Fed Holds Rates!', KEY) == f"fed-holds-rates-{KEY[:8]}"
+    assert make_slug('!!!', KEY) == f"post-{KEY[:8]}"
+
+def test_happy_path_transitions(outbox):
+    record = outbox.record_generated(KEY, '금리', '제목', 'slug', news_items=[{'title': '뉴스'}])
+    assert record['state'] == GENERATED
+    assert record['news_items'] == [{'title': '뉴스'}]
+
+    outbox.mark_media(KEY, 42)
+    assert outbox.get(KEY)['state'] == MEDIA_UPLOADED
+
+    outbox.mark_publishing(KEY, PAYLOAD)
+    record = outbox.get(KEY)
+    assert record['state'] == PUBLISHING
+    assert record['payload'] == PAYLOAD
+    assert record['attempts'] == 1
+    assert record['slug'] == 'slug'  # 슬러그를 넘기지 않으면 기존 값 유지
+
+    outbox.mark_published(KEY, 1001, 'https://example.com/?p=1001')
+    record = outbox.get(KEY)
+    assert (record['state'], record['remote_id']) == (PUBLISHED, 1001)
+    assert outbox.pending() == []
+
+def test_record_generated_keeps_existing_state(outbox):
+    outbox.record_generated(KEY, '금리', '제목', 'slug')
+    outbox.mark_publishing(KEY, PAYLOAD)
+    outbox.mark_published(KEY, 1001, 'link')
+    # 같은 글이 다시 생성되어도 발행 기록은 그대로
+    assert outbox.record_generated(KEY, '금리', '제목', 'slug')['state'] == PUBLISHED
+
+def test_media_only_recorded_from_generated(outbox):
+    outbox.record_generated(KEY, '금리', '제목', 'slug')
+    outbox.mark_publishing(KEY, PAYLOAD)
+    outbox.mark_media(KEY, 42)
+    record = outbox.get(KEY)
+    assert record['state'] == PUBLISHING
+    assert record['media_id'] is None
+
+def test_failed_and_unconfirmed_posts_are_pending(outbox):
+    outbox.mark_publishing('a', PAYLOAD, slug='a')
+    outbox.mark_publishing('b', PAYLOAD, slug='b')
+    outbox.mark_failed('b', RuntimeError('400 잘못된 요청'))
+    outbox.mark_publishing('b', PAYLOAD)
+    outbox.mark_failed('b', 'x' * 1000)
+    outbox.record_generated('c', '금리', '제목', 'c')  # 보낼 내용이 없으면 재시도 대상 아님
+
+    pending = {record['key']: record for record in outbox.pending()}
+    assert set(pending) == {'a', 'b'}
+    assert pending['b']['state'] == FAILED
+    assert pending['b']['attempts'] == 2
+    assert len(pending['b']['last_error']) == 500
+    assert [record['key'] for record in outbox.pending(max_attempts=2)] == ['a']
+    assert outbox.counts() == {PUBLISHING: 1, FAILED: 1, GENERATED: 1}
+
+def test_prune_and_max_age(outbox):
+    outbox.mark_publishing('old', PAYLOAD)
+    outbox._conn.execute("UPDATE posts SET created_at = created_at - 7200 WHERE key = 'old'")
+    outbox.mark_publishing('new', PAYLOAD)
+    assert [record['key'] for record in outbox.pending(max_age=3600)] == ['new']
+    assert outbox.prune(3600) == 1
+    assert outbox.get('old') is None
+    assert outbox.get('new') is not None
@@ -0,0 +1,77 @@
+"""
+rate_limit: 공유 토큰 버킷(RateLimitStore.take)과 동시 호출 한도 조절
+"""
+
+import pytest
+
+from rate_limit import AdaptiveConcurrency, ProviderLimiter, RateLimitStore, RateLimitTimeout
+
+@pytest.fixture
+def store(tmp_path):
+    store = RateLimitStore(str(tmp_path / 'rate_limits.db'))
+    yield store
+    store.close()
+
+def test_take_until_empty_then_wait(store):
+    bucket = [('rpm', 1, 2, 1.0)]
+    assert store.take(bucket, now=100.0) == 0
+    assert store.take(bucket, now=100.0) == 0
+    assert store.take(bucket, now=100.0) == pytest.approx(1.0)
+    # 0.5초 충전 후에도 부족하면 남은 시간만큼 기다려야 함
+    assert store.take(bucket, now=100.5) == pytest.approx(0.5)
+    assert store.take(bucket, now=101.0) == 0
+
+def test_take_is_all_or_nothing(store):
+    assert store.take([('tpm', 90, 100, 1.0)], now=100.0) == 0
+    # rpm은 충분하지만 tpm이 부족하면 어느 버킷에서도 꺼내지 않음
+    wait = store.take([('rpm', 1, 1, 1.0), ('tpm', 20, 100, 1.0)], now=100.0)
+    assert wait == pytest.approx(10.0)
+    assert store.take([('rpm', 1, 1, 1.0)], now=100.0) == 0
+
+def test_take_caps_oversized_requests(store):
+    # 용량보다 큰 요청은 버킷이 가득 찼을 때 통과 (영원히 기다리지 않음)
+    assert store.take([('tpm', 500, 100, 1.0)], now=100.0) == 0
+    assert store.take([('tpm', 500, 100, 1.0)], now=100.0) == pytest.approx(100.0)
+
+def test_refill_never_exceeds_capacity(store):
+    bucket = [('rpm', 1, 2, 1.0)]
+    store.take(bucket, now=100.0)
+    assert store.take(bucket, now=1000.0) == 0
+    assert store.take(bucket, now=1000.0) == 0
+    assert store.take(bucket, now=1000.0) > 0
+
+def test_buckets_shared_between_store_instances(store, tmp_path):
+    other = RateLimitStore(store.path)
+    try:
+        assert store.take([('rpm', 1, 1, 0.01)], now=100.0) == 0
+        assert other.take([('rpm', 1, 1, 0.01)], now=100.0) > 0
+    finally:
+        other.close()
+
+def test_concurrency_grows_only_on_success(store):
+    limiter = ProviderLimiter('p', store, requests_per_minute=1)
+    limiter.concurrency = AdaptiveConcurrency(2, maximum=8)
+    with limiter.slot():
+        pass
+    assert limiter.concurrency.limit == pytest.approx(2.5)
+    # 할당량을 기다리다 포기하면 한도는 그대로
+    with pytest.raises(RateLimitTimeout):
+        with limiter.slot(max_wait=0):
+            pass
+    assert limiter.concurrency.limit == pytest.approx(2.5)
+    assert limiter.concurrency.in_flight == 0
+
+def test_concurrency_unchanged_on_other_errors_and_halved_on_throttle(store):
+    limiter = ProviderLimiter('q', store, default_backoff=0)
+    limiter.concurrency = AdaptiveConcurrency(4, maximum=8)
+    with pytest.raises(ConnectionError):
+        with limiter.slot():
+            raise ConnectionError()
+    with limiter.slot() as slot:
+        slot.status = 500
+    assert limiter.concurrency.limit == pytest.approx(4)
+
+    with limiter.slot() as slot:
+        slot.status = 429
+    assert limiter.concurrency.limit == pytest.approx(2)
+    assert limiter.concurrency.in_flight == 0
@@ -0,0 +1,94 @@
+"""
+response_parser: 응답 해석, 잘린 응답 복구, 스키마 검증
+"""
+
+import json
+import os
+
+import pytest
+
+from response_parser import IncrementalJSONExtractor, is_complete_response, parse_response, validate_response
+
+COMPLETE = json.dumps({
+    'title': '미국 금리 동결',
+    'meta_description': '금리 동결이 증시에 미치는 영향',
+    'content': '<p>본문 "인용"\n둘째 줄</p>',
+    'sections': [{'heading': '요약', 'summary': '금리 동결'}],
+}, ensure_ascii=False)
+
+# 벤치마크용 합성 응답 예제 (잘린 응답 포함)
+RESPONSES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'responses')
+
+SYNTHETIC_FIXTURES = ['synthetic_double_braces.txt', 'synthetic_fenced_json.txt',
+                      'synthetic_preamble_raw_newlines.txt', 'synthetic_unicode_escapes.txt']
+
+def read_fixture(name):
+    with open(os.path.join(RESPONSES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+def test_parse_complete_response():
+    data = parse_response(COMPLETE)
+    assert data['title'] == '미국 금리 동결'
+    assert data['content'] == '<p>본문 "인용"\n둘째 줄</p>'
+    assert data['sections'] == [{'heading': '요약', 'summary': '금리 동결'}]
+    assert data['complete'] and not data['repaired']
+    assert is_complete_response(COMPLETE)
+
+def test_parse_skips_code_fence_and_preamble():
+    data = parse_response(f"다음은 결과입니다.\n```json\n{COMPLETE}\n```\n끝.")
+    assert data['title'] == '미국 금리 동결'
+    assert data['complete']
+
+def test_incremental_feed_matches_single_pass():
+    # 이스케이프와 한글이 조각 경계에 걸려도 결과가 같아야 함
+    extractor = IncrementalJSONExtractor()
+    for i in range(0, len(COMPLETE), 3):
+        extractor.feed(COMPLETE[i:i + 3])
+    assert extractor.done
+    assert extractor.fields['content'] == json.loads(COMPLETE)['content']
+
+def test_truncated_response_is_repaired():
+    text = COMPLETE[:COMPLETE.index('둘째')]
+    data = parse_response(text)
+    assert not data['complete']
+    assert data['repaired']
+    assert data['content'].startswith('<p>본문')
+    assert data['sections'] is None
+    assert not is_complete_response(text)
+
+def test_truncated_fixture_keeps_fields_before_cut():
+    data = parse_response(read_fixture('synthetic_truncated_max_tokens.txt'))
+    assert not data['complete']
+    assert data['title'] and data['content']
+
+@pytest.mark.parametrize('name', SYNTHETIC_FIXTURES)
+def test_synthetic_fixtures_parse_completely(name):
+    data = parse_response(read_fixture(name))
+    assert data['complete']
+    assert data['title'] and data['content']
+
+def test_complete_response_passes_validation():
+    assert validate_response(parse_response(COMPLETE)) == []
+
+def test_truncated_response_fails_validation():
+    data = parse_response(COMPLETE[:COMPLETE.index('둘째')])
+    assert "$: 응답이 중간에 끊김" in validate_response(data, require_sections=False)
+
+def test_truncated_fixture_fails_validation():
+    data = parse_response(read_fixture('synthetic_truncated_max_tokens.txt'))
+    assert validate_response(data, require_sections=False)
+
+@pytest.mark.parametrize('name', SYNTHETIC_FIXTURES)
+def test_synthetic_fixtures_pass_validation(name):
+    assert validate_response(parse_response(read_fixture(name)), require_sections=False) == []
+
+def test_missing_sections_required_only_when_requested():
+    data = parse_response(json.dumps({'title': '제목', 'meta_description': '설명', 'content': '본문'}))
+    assert validate_response(data, require_sections=False) == []
+    assert "$.sections: 필수 필드 없음" in validate_response(data)
+
+def test_validate_reports_empty_and_wrong_types():
+    errors = validate_response({'title': ' ', 'meta_description': '설명', 'content': 1, 'sections': [{}]})
+    assert "$.title: 빈 문자열" in errors
+    assert "$.content: string 형식이 아님" in errors
+    assert "$.sections[0].heading: 필수 필드 없음" in errors
@@ -0,0 +1,50 @@
+"""
+scheduler.CronSpec: cron 형식 해석과 다음 실행 시각 계산
+"""
+
+from datetime import datetime
+
+import pytest
+
+from scheduler import CronSpec
+
+def test_parse_lists_ranges_and_steps():
+    spec = CronSpec("*/15 9-17/4 1,15 * *")
+    assert spec.minutes == {0, 15, 30, 45}
+    assert spec.hours == {9, 13, 17}
+    assert spec.days == {1, 15}
+    assert spec.months == set(range(1, 13))
+
+def test_weekday_seven_is_sunday():
+    assert CronSpec("0 0 * * 7").weekdays == {0}
+    assert CronSpec("0 0 * * 5-7").weekdays == {0, 5, 6}
+
+@pytest.mark.parametrize('expression', ["0 7 * *", "60 * * * *", "0 24 * * *", "*/0 * * * *", "0 0 5-1 * *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSpec(expression)
+
+def test_next_after_same_day_and_next_day():
+    spec = CronSpec("0 7 * * *")
+    assert spec.next_after(datetime(2025, 1, 17, 6, 59, 30)) == datetime(2025, 1, 17, 7, 0)
+    # 정각 자체는 제외
+    assert spec.next_after(datetime(2025, 1, 17, 7, 0)) == datetime(2025, 1, 18, 7, 0)
+
+def test_next_after_weekdays_only():
+    spec = CronSpec("*/30 9-18 * * 1-5")
+    # 2025-01-17은 금요일 - 18:30 다음은 월요일 09:00
+    assert spec.next_after(datetime(2025, 1, 17, 18, 30)) == datetime(2025, 1, 20, 9, 0)
+
+def test_next_after_rolls_over_year():
+    assert CronSpec("0 0 1 1 *").next_after(datetime(2025, 3, 1)) == datetime(2026, 1, 1, 0, 0)
+
+def test_day_or_weekday_when_both_given():
+    # cron과 같이 일(13일)과 요일(금요일) 중 하나만 맞아도 실행
+    spec = CronSpec("0 12 13 * 5")
+    assert spec.matches(datetime(2025, 1, 13, 12, 0))   # 월요일 13일
+    assert spec.matches(datetime(2025, 1, 17, 12, 0))   # 금요일
+    assert not spec.matches(datetime(2025, 1, 14, 12, 0))
+
+def test_impossible_schedule():
+    with pytest.raises(ValueError):
+        CronSpec("0 0 31 2 *").next_after(datetime(2025, 1, 1))
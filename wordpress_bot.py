@@ -1,11 +1,35 @@
-import google.generativeai as genai
-import feedparser
 import urllib.parse
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 import json
-import base64
 import os
+import time
+import calendar
+import asyncio
+import threading
+
+from feed_cache import FeedCache
+from news_dedup import SeenNewsIndex, filter_duplicates
+from news_cluster import HeadlineHistory, cluster_news_items
+from article_extractor import ArticleCache, fetch_article, new_session, summarize_text
+from pipeline import Pipeline, RequestSpacer, Stage
+from response_parser import (
+    RESPONSE_SCHEMA, IncrementalJSONExtractor, is_complete_response, parse_response, validate_response,
+)
+from generation_stats import record_generation
+from prompt_builder import PromptTemplate, estimate_tokens, fit_news_items
+from generation_cache import GenerationCache, generation_key
+from llm_backends import create_backend
+from rate_limit import ProviderLimiter, RateLimitStore, RateLimitTimeout
+from image_pool import ImagePool
+from wp_client import BatchUnsupported, WordPressClient
+from taxonomy_cache import TaxonomyCache
+from media_library import MediaIndex, ensure_media, ensure_media_variants
+import image_derivatives
+from outbox import Outbox, PUBLISHED, PUBLISHING, idempotency_key, make_slug
+import telemetry
+from telemetry import instrumented
 
 # config.py 또는 환경 변수에서 설정 불러오기
 # 우선순위: 환경 변수 > config.py > 기본값
@@ -38,86 +62,591 @@ WORDPRESS_APP_PASSWORD = os.environ.get('WORDPRESS_APP_PASSWORD', CONFIG_WP_PASS
 WORDPRESS_CATEGORY_ID = int(os.environ.get('WORDPRESS_CATEGORY_ID', CONFIG_CATEGORY_ID))
 POST_STATUS = os.environ.get('POST_STATUS', CONFIG_POST_STATUS)
 UNSPLASH_ACCESS_KEY = os.environ.get('UNSPLASH_ACCESS_KEY', CONFIG_UNSPLASH_KEY)
+UNSPLASH_API_URL = os.environ.get('UNSPLASH_API_URL', 'https://api.unsplash.com').rstrip('/')
+
+# 뉴스 RSS 주소 ({query}에 URL 인코딩한 키워드가 들어감) - 벤치마크에서는 로컬 서버로 바꿔 씀
+NEWS_FEED_URL = os.environ.get('NEWS_FEED_URL', 'https://news.google.com/rss/search?q={query}&hl=ko&gl=KR&ceid=KR:ko')
+
+# 뉴스 수집 설정 (쉼표로 구분된 키워드, 동시 요청 수, 피드당 제한 시간(초))
+NEWS_KEYWORDS = [k.strip() for k in os.environ.get('NEWS_KEYWORDS', '미국 증시,FOMC,연준 금리,환율 전망').split(',') if k.strip()]
+RSS_MAX_WORKERS = int(os.environ.get('RSS_MAX_WORKERS', 8))
+RSS_FEED_TIMEOUT = float(os.environ.get('RSS_FEED_TIMEOUT', 10))
+# 피드 연결 제한 시간 상한 (TCP 재전송 간격 3초보다 조금 길게 - requests 문서 권장값)
+FEED_CONNECT_TIMEOUT = 3.05
+USE_FEED_CACHE = os.environ.get('USE_FEED_CACHE', 'true').lower() == 'true'
+# 피드 수집에 실패했을 때 대신 쓸 수 있는 저장된 피드의 최대 나이(시간) - 예약 실행 간격의 2배 정도
+FEED_STALE_MAX_HOURS = float(os.environ.get('FEED_STALE_MAX_HOURS', 48))
+NEWS_PER_KEYWORD = int(os.environ.get('NEWS_PER_KEYWORD', 3))
+USE_NEWS_DEDUP = os.environ.get('USE_NEWS_DEDUP', 'true').lower() == 'true'
+NEWS_DEDUP_TTL_DAYS = float(os.environ.get('NEWS_DEDUP_TTL_DAYS', 14))
+NEWS_CLUSTER_CANDIDATES = int(os.environ.get('NEWS_CLUSTER_CANDIDATES', 20))
+HEADLINE_HISTORY_TTL_DAYS = float(os.environ.get('HEADLINE_HISTORY_TTL_DAYS', 90))
+
+# 기사 본문 추출 설정 (동시 요청 수, 기사당 제한 시간(초), 기사당 요약 토큰 수, 본문 캐시 보관 기간(일))
+USE_ARTICLE_BODY = os.environ.get('USE_ARTICLE_BODY', 'true').lower() == 'true'
+ARTICLE_MAX_WORKERS = int(os.environ.get('ARTICLE_MAX_WORKERS', 8))
+ARTICLE_FETCH_TIMEOUT = float(os.environ.get('ARTICLE_FETCH_TIMEOUT', 8))
+ARTICLE_SUMMARY_TOKENS = int(os.environ.get('ARTICLE_SUMMARY_TOKENS', 200))
+ARTICLE_CACHE_TTL_DAYS = float(os.environ.get('ARTICLE_CACHE_TTL_DAYS', 30))
+ARTICLE_MAX_BYTES = int(os.environ.get('ARTICLE_MAX_BYTES', 2 * 1024 * 1024))
+
+# 파이프라인 설정 (동시 글 생성 수, Gemini 요청 사이 최소 간격(초), 단계 사이 큐 크기)
+GENERATE_CONCURRENCY = int(os.environ.get('GENERATE_CONCURRENCY', 3))
+GENERATE_MIN_INTERVAL = float(os.environ.get('GENERATE_MIN_INTERVAL', 2))
+PIPELINE_QUEUE_SIZE = int(os.environ.get('PIPELINE_QUEUE_SIZE', 2))
+
+# 스트리밍 생성 설정 (형식 오류를 조기에 발견하면 생성을 중단하고 다시 요청)
+USE_STREAMING = os.environ.get('USE_STREAMING', 'false').lower() == 'true'
+STREAM_MAX_RETRIES = int(os.environ.get('STREAM_MAX_RETRIES', 1))
+STREAM_MIN_CONTENT_CHARS = int(os.environ.get('STREAM_MIN_CONTENT_CHARS', 3000))
+STREAM_MIN_SECTIONS = int(os.environ.get('STREAM_MIN_SECTIONS', 4))
+STREAM_MAX_PREAMBLE = int(os.environ.get('STREAM_MAX_PREAMBLE', 500))
+
+# 생성 결과 캐시 설정 (재실행 시 같은 뉴스면 Gemini 호출 생략)
+USE_GENERATION_CACHE = os.environ.get('USE_GENERATION_CACHE', 'true').lower() == 'true'
+GENERATION_CACHE_TTL = float(os.environ.get('GENERATION_CACHE_TTL', 12 * 3600))
+GENERATION_CACHE_MAX_ENTRIES = int(os.environ.get('GENERATION_CACHE_MAX_ENTRIES', 50))
+
+# 구조화 출력 설정 (JSON MIME 타입 + 응답 스키마로 형식을 강제, 검증 실패 시 재생성)
+USE_STRUCTURED_OUTPUT = os.environ.get('USE_STRUCTURED_OUTPUT', 'false').lower() == 'true'
+STRUCTURED_MAX_RETRIES = int(os.environ.get('STRUCTURED_MAX_RETRIES', 1))
+
+# 프롬프트 입력 토큰 예산 (지시문 + 뉴스, 추정치). 뉴스가 넘치면 중요한 기사부터 골라 담음 (0이면 제한 없음)
+PROMPT_TOKEN_BUDGET = int(os.environ.get('PROMPT_TOKEN_BUDGET', 8000))
+
+# AI 응답 원문 기록 폴더 (파서 벤치마크 말뭉치, 비워 두면 기록 안 함)
+RECORD_RESPONSES_DIR = os.environ.get('RECORD_RESPONSES_DIR', '')
+
+# 프롬프트 템플릿을 고치면 버전을 올려 이전 생성 결과 캐시를 무효화
+PROMPT_VERSION = '2025-01-v2'
+
+# Gemini 모델 및 생성 설정
+GENERATION_SETTINGS = {
+    'model': 'gemini-2.5-flash',
+    'temperature': 0.7,  # 더 일관된 품질
+    'max_output_tokens': 16384,  # 글이 잘리지 않도록 충분한 토큰 수
+    'top_p': 0.95,
+}
+
+# 글 생성 백엔드 ('gemini' 또는 기록된 응답을 재생하는 'mock')와 실패 시 순서대로 시도할 대체 모델
+LLM_BACKEND = os.environ.get('LLM_BACKEND', 'gemini').lower()
+LLM_FALLBACK_MODELS = [m.strip() for m in os.environ.get('LLM_FALLBACK_MODELS', '').split(',') if m.strip()]
+
+# mock 백엔드 설정 (응답 폴더, 첫 응답 지연(초), 출력 속도(글자/초), 오류/잘림 주입 확률, 시드)
+MOCK_RESPONSES_DIR = os.environ.get('MOCK_RESPONSES_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'responses'))
+MOCK_LATENCY = float(os.environ.get('MOCK_LATENCY', 1.0))
+MOCK_CHARS_PER_SECOND = float(os.environ.get('MOCK_CHARS_PER_SECOND', 0))
+MOCK_ERROR_RATE = float(os.environ.get('MOCK_ERROR_RATE', 0))
+MOCK_TRUNCATE_RATE = float(os.environ.get('MOCK_TRUNCATE_RATE', 0))
+MOCK_SEED = int(os.environ.get('MOCK_SEED', 0))
+
+# API 할당량 (여러 프로세스가 .cache/rate_limits.db로 공유). Gemini는 모델별 분당 요청/토큰 수, Unsplash는 시간당 요청 수
+USE_RATE_LIMIT = os.environ.get('USE_RATE_LIMIT', 'true').lower() == 'true'
+GEMINI_RPM = int(os.environ.get('GEMINI_RPM', 10))
+GEMINI_TPM = int(os.environ.get('GEMINI_TPM', 250000))
+GEMINI_MAX_CONCURRENCY = int(os.environ.get('GEMINI_MAX_CONCURRENCY', 4))
+UNSPLASH_REQUESTS_PER_HOUR = int(os.environ.get('UNSPLASH_REQUESTS_PER_HOUR', 50))
+
+# Unsplash 이미지 풀 (한 번에 받을 장수, 다시 채우는 기준 장수, 같은 이미지를 다시 쓰지 않는 기간(일))
+USE_IMAGE_POOL = os.environ.get('USE_IMAGE_POOL', 'true').lower() == 'true'
+IMAGE_POOL_BATCH_SIZE = int(os.environ.get('IMAGE_POOL_BATCH_SIZE', 30))
+IMAGE_POOL_LOW_WATERMARK = int(os.environ.get('IMAGE_POOL_LOW_WATERMARK', 5))
+IMAGE_REPEAT_WINDOW_DAYS = float(os.environ.get('IMAGE_REPEAT_WINDOW_DAYS', 30))
+
+# 대표 이미지를 워드프레스 미디어 라이브러리에 올려 featured_media로 지정 (본문 상단 이미지도 올린 이미지 사용)
+USE_MEDIA_UPLOAD = os.environ.get('USE_MEDIA_UPLOAD', 'true').lower() == 'true'
+INLINE_FEATURED_IMAGE = os.environ.get('INLINE_FEATURED_IMAGE', 'true').lower() == 'true'
+
+# 반응형 이미지 파생본 (폭/형식별로 압축해 올리고 <picture> srcset으로 삽입, Pillow 필요)
+USE_IMAGE_DERIVATIVES = os.environ.get('USE_IMAGE_DERIVATIVES', 'true').lower() == 'true'
+IMAGE_WIDTHS = [int(w) for w in os.environ.get('IMAGE_WIDTHS', '480,768,1080').split(',') if w.strip()]
+IMAGE_FORMATS = [f.strip().lower() for f in os.environ.get('IMAGE_FORMATS', 'avif,webp,jpeg').split(',') if f.strip()]
+IMAGE_QUALITY = int(os.environ.get('IMAGE_QUALITY', 80))
+
+# 카테고리/태그 설정 (쉼표로 구분된 태그, 캐시 유효 시간(초), 없는 항목 자동 생성 여부)
+POST_TAGS = [t.strip() for t in os.environ.get('POST_TAGS', '').split(',') if t.strip()]
+TAXONOMY_CACHE_TTL = float(os.environ.get('TAXONOMY_CACHE_TTL', 6 * 3600))
+TAXONOMY_CREATE_MISSING = os.environ.get('TAXONOMY_CREATE_MISSING', 'true').lower() == 'true'
+
+# 발행 기록 (중복 발행 방지, 결과를 모르는 발행은 다음 실행에서 확인 후 재시도)
+USE_OUTBOX = os.environ.get('USE_OUTBOX', 'true').lower() == 'true'
+OUTBOX_RESUME_HOURS = float(os.environ.get('OUTBOX_RESUME_HOURS', 24))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 5))
+OUTBOX_RETENTION_DAYS = float(os.environ.get('OUTBOX_RETENTION_DAYS', 90))
+
+# 여러 글을 발행할 때 batch/v1(워드프레스 5.6 이상)으로 묶어 보냄 (지원하지 않으면 한 건씩)
+# 완성된 글이 WP_BATCH_FLUSH_SIZE개 모이거나 첫 글이 WP_BATCH_FLUSH_SECONDS초 기다리면 그때까지 모인 글을 발행
+WP_BATCH_PUBLISH = os.environ.get('WP_BATCH_PUBLISH', 'true').lower() == 'true'
+WP_BATCH_FLUSH_SIZE = int(os.environ.get('WP_BATCH_FLUSH_SIZE', 5))
+WP_BATCH_FLUSH_SECONDS = float(os.environ.get('WP_BATCH_FLUSH_SECONDS', 20))
 
 # 설정 검증
-if not GEMINI_API_KEY:
+if not GEMINI_API_KEY and LLM_BACKEND == 'gemini':
     print("⚠️ GEMINI_API_KEY가 설정되지 않았습니다!")
 if not WORDPRESS_URL or not WORDPRESS_USERNAME or not WORDPRESS_APP_PASSWORD:
     print("⚠️ 워드프레스 설정이 완료되지 않았습니다!")
     print("   로컬: config.py 파일 확인")
     print("   GitHub Actions: Secrets 설정 확인")
 
-# Gemini 연결
-genai.configure(api_key=GEMINI_API_KEY)
+# ==========================================
+# 0. API 할당량 (토큰 버킷 + 적응형 동시성)
+# ==========================================
+_rate_limit_store = None
+_rate_limiters = {}
+_rate_limit_lock = threading.Lock()
+
+def get_rate_limiter(provider):
+    """
+    제공자별 속도 제한기를 돌려줍니다. (비활성화되어 있거나 저장소를 열 수 없으면 None)
+    provider: 'unsplash' 또는 'gemini:<모델 이름>'
+    """
+    global _rate_limit_store
+    if not USE_RATE_LIMIT:
+        return None
+    with _rate_limit_lock:
+        if provider in _rate_limiters:
+            return _rate_limiters[provider]
+        if _rate_limit_store is None:
+            try:
+                _rate_limit_store = RateLimitStore()
+            except Exception as e:
+                print(f"⚠️ 속도 제한 저장소 열기 실패: {e}")
+                return None
+        if provider == 'unsplash':
+            limiter = ProviderLimiter(provider, _rate_limit_store,
+                                      requests_per_hour=UNSPLASH_REQUESTS_PER_HOUR, max_concurrency=2)
+        else:
+            limiter = ProviderLimiter(provider, _rate_limit_store, requests_per_minute=GEMINI_RPM,
+                                      tokens_per_minute=GEMINI_TPM, max_concurrency=GEMINI_MAX_CONCURRENCY)
+        _rate_limiters[provider] = limiter
+        return limiter
 
 # ==========================================
-# 1. 금융 뉴스 수집 (기존과 동일)
+# 1. 금융 뉴스 수집 (병렬 수집)
 # ==========================================
-def get_finance_news():
+def build_news_feed_url(keyword):
+    """
+    키워드에 해당하는 구글 뉴스 RSS URL을 만듭니다.
+    """
+    return NEWS_FEED_URL.format(query=urllib.parse.quote(keyword))
+
+def _feed_entries(feed):
+    """
+    feedparser 결과에서 필요한 필드만 뽑아 캐시 가능한 딕셔너리 목록으로 만듭니다.
+    """
+    entries = []
+    for entry in feed.entries:
+        published = entry.get('published_parsed') or entry.get('updated_parsed')
+        entries.append({
+            'title': entry.get('title', ''),
+            'link': entry.get('link', ''),
+            'published': entry.get('published', ''),
+            'published_ts': calendar.timegm(published) if published else None,
+        })
+    return entries
+
+def _remaining(deadline):
+    return max(0.1, deadline - time.monotonic())
+
+def _set_read_timeout(response, seconds):
+    """
+    스트리밍 중인 응답의 소켓 읽기 제한 시간을 바꿉니다. (소켓에 접근할 수 없으면 그대로 둠)
+    """
+    sock = getattr(getattr(response.raw, 'connection', None), 'sock', None)
+    if sock is not None:
+        try:
+            sock.settimeout(seconds)
+        except OSError:
+            pass
+
+def _iter_arrived(response, chunk_size):
+    """
+    도착한 만큼씩 본문을 돌려줍니다. (urllib3 2.x의 read1, 없으면 chunk_size 단위)
+    조각이 찰 때까지 기다리지 않아야 조각 사이에 줄인 읽기 제한 시간이 바로 적용됩니다.
+    """
+    read1 = getattr(response.raw, 'read1', None)
+    if read1 is None:
+        yield from response.iter_content(chunk_size=chunk_size)
+        return
+    while True:
+        chunk = read1(chunk_size, decode_content=True)
+        if not chunk:
+            return
+        yield chunk
+
+def fetch_feed(url, timeout=RSS_FEED_TIMEOUT, cache=None):
+    """
+    RSS 피드 하나를 내려받아 기사 목록으로 돌려줍니다.
+    느리게 흘러오는 응답도 timeout(초)을 넘기면 중단합니다.
+    
+    cache가 주어지면 ETag/Last-Modified로 조건부 요청을 보내고,
+    304 응답이거나 일시적으로 수집에 실패하면 저장된 기사를 재사용합니다.
+    (실패했을 때는 FEED_STALE_MAX_HOURS 안에 받은 기사만 재사용)
+    """
+    headers = cache.conditional_headers(url) if cache else {}
+    started = time.monotonic()
+    deadline = started + timeout
+    chunks = []
+    try:
+        # 연결 대기 + 첫 응답 대기가 timeout 안에 들도록 나눔 (연결은 최대 3.05초 또는 절반)
+        connect_timeout = min(FEED_CONNECT_TIMEOUT, timeout / 2)
+        with requests.get(url, headers=headers, timeout=(connect_timeout, max(0.1, timeout - connect_timeout)),
+                          stream=True) as response:
+            if response.status_code == 304 and cache:
+                telemetry.record_request('rss', seconds=time.monotonic() - started)
+                telemetry.count('rss_not_modified')
+                cache.touch(url)
+                return cache.cached_entries(url)
+            response.raise_for_status()
+            _set_read_timeout(response, _remaining(deadline))
+            for chunk in _iter_arrived(response, 16384):
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"피드 수신 시간 초과 ({timeout}초)")
+                chunks.append(chunk)
+                # 다음 조각을 기다리는 시간도 남은 시간으로 줄임 (마감 직전에 읽기가 오래 멈추지 않도록)
+                _set_read_timeout(response, _remaining(deadline))
+            etag = response.headers.get('ETag')
+            modified = response.headers.get('Last-Modified')
+    except Exception as e:
+        telemetry.record_request('rss', bytes_in=sum(map(len, chunks)), seconds=time.monotonic() - started, error=True)
+        # 오래 수집하지 못한 피드의 옛 기사로 글을 쓰지 않도록 FEED_STALE_MAX_HOURS 안에 받은 것만 사용
+        stale = cache.cached_entries(url, max_age=FEED_STALE_MAX_HOURS * 3600) if cache else None
+        if stale is None:
+            if cache and cache.get(url):
+                print(f"⚠️ 저장된 피드가 {FEED_STALE_MAX_HOURS:g}시간보다 오래되어 사용하지 않습니다.")
+            raise
+        print(f"⚠️ 피드 수집 실패, 캐시 사용: {e}")
+        return stale
+    telemetry.record_request('rss', bytes_in=sum(map(len, chunks)), seconds=time.monotonic() - started)
+
+    # feedparser는 불러오는 데 시간이 걸려 피드를 실제로 읽을 때만 불러옴 (카테고리 조회 등은 빠르게 시작)
+    import feedparser
+    entries = _feed_entries(feedparser.parse(b"".join(chunks)))
+    if cache:
+        cache.store(url, entries, etag=etag, modified=modified)
+    return entries
+
+def fetch_feeds_concurrently(keywords, max_workers=RSS_MAX_WORKERS, timeout=RSS_FEED_TIMEOUT, use_cache=USE_FEED_CACHE):
+    """
+    여러 키워드의 RSS 피드를 동시에 수집합니다.
+    
+    Args:
+        keywords: 검색 키워드 목록
+        max_workers: 동시에 요청할 최대 피드 수
+        timeout: 피드 하나당 제한 시간(초)
+        use_cache: 조건부 요청 캐시 사용 여부
+    
+    Returns:
+        {키워드: 기사 목록} 딕셔너리 (실패한 키워드는 None)
+    """
+    feeds = {keyword: None for keyword in keywords}
+    if not keywords:
+        return feeds
+    
+    cache = FeedCache() if use_cache else None
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keywords)))) as executor:
+        futures = {
+            executor.submit(fetch_feed, build_news_feed_url(keyword), timeout, cache): keyword
+            for keyword in keywords
+        }
+        for future in as_completed(futures):
+            keyword = futures[future]
+            try:
+                feeds[keyword] = future.result()
+            except Exception as e:
+                # 느리거나 죽은 피드 하나가 전체 수집을 막지 않도록 건너뜀
+                print(f"⚠️ '{keyword}' 피드 수집 실패: {e}")
+    
+    if cache:
+        try:
+            cache.save()
+        except OSError as e:
+            print(f"⚠️ 피드 캐시 저장 실패: {e}")
+    
+    return feeds
+
+_news_stores = {}
+_news_store_lock = threading.Lock()
+
+def _shared_store(name, factory, label):
+    """
+    SQLite 기록 저장소를 프로세스 안에서 한 번만 열어 재사용합니다.
+    상주 모드에서 실행마다 새 연결을 열면 파일 핸들이 쌓이므로, 다시 쓸 때는 만료된 기록만 정리합니다.
+    (열 수 없으면 None - 다음 호출에서 다시 시도)
+    """
+    with _news_store_lock:
+        store = _news_stores.get(name)
+        if store is not None:
+            store.evict_expired()
+            return store
+        try:
+            store = _news_stores[name] = factory()
+        except Exception as e:
+            print(f"⚠️ {label} 열기 실패: {e}")
+        return store
+
+def get_news_index():
+    """
+    기사 중복 제거 인덱스를 돌려줍니다. (비활성화되어 있거나 열 수 없으면 None)
+    """
+    if not USE_NEWS_DEDUP:
+        return None
+    return _shared_store('news_index', lambda: SeenNewsIndex(ttl_days=NEWS_DEDUP_TTL_DAYS), "중복 제거 인덱스")
+
+def get_headline_history():
+    """
+    유사 헤드라인 기록(MinHash/LSH)을 돌려줍니다. (비활성화되어 있거나 열 수 없으면 None)
+    """
+    if not USE_NEWS_DEDUP:
+        return None
+    return _shared_store('headline_history', lambda: HeadlineHistory(ttl_days=HEADLINE_HISTORY_TTL_DAYS), "헤드라인 기록")
+
+def get_article_cache():
+    """
+    기사 본문 캐시를 돌려줍니다. (열 수 없으면 None - 캐시 없이 매번 받음)
+    """
+    return _shared_store('article_cache', lambda: ArticleCache(ttl_days=ARTICLE_CACHE_TTL_DAYS), "기사 본문 캐시")
+
+@instrumented('article')
+def enrich_news_items(items, cache=None, max_workers=ARTICLE_MAX_WORKERS, timeout=ARTICLE_FETCH_TIMEOUT,
+                      summary_tokens=ARTICLE_SUMMARY_TOKENS):
+    """
+    기사 원문을 동시에 받아 본문을 추출하고, 기사마다 summary_tokens 안으로 요약해 붙입니다.
+    본문을 얻지 못한 기사는 지금처럼 제목과 링크만 씁니다.
+    
+    Args:
+        items: 기사 딕셔너리 목록 (프롬프트에 넣을 후보)
+        cache: ArticleCache (기본값: 캐시 폴더의 articles.db)
+    
+    Returns:
+        기사 목록 (본문을 얻은 기사에는 'summary' 포함)
+    """
+    if not USE_ARTICLE_BODY or not items:
+        return items
+    cache = cache or get_article_cache()
+    workers = max(1, min(max_workers, len(items)))
+    session = new_session(workers)
+    enriched = [dict(item) for item in items]
+
+    def enrich(item):
+        try:
+            article = fetch_article(session, item['link'], cache, timeout=timeout, max_bytes=ARTICLE_MAX_BYTES)
+        except Exception as e:
+            # 죽은 페이지를 실행마다 다시 받지 않도록 실패도 잠시 기록
+            if cache:
+                cache.store_failure(item['link'])
+            telemetry.count('article_failures')
+            print(f"⚠️ 기사 본문 수집 실패 ({item['title'][:30]}): {e}")
+            return
+        if article['ok']:
+            item['summary'] = summarize_text(article['text'], summary_tokens, title=item['title'])
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(enrich, enriched))
+    session.close()
+    
+    found = sum(1 for item in enriched if item.get('summary'))
+    print(f"📄 기사 본문 {found}/{len(enriched)}개 요약")
+    return enriched
+
+@instrumented('news')
+def collect_news_items(keywords=None, per_keyword=NEWS_PER_KEYWORD, news_index=None):
+    """
+    키워드별 뉴스를 수집하고 중복 기사를 걸러냅니다.
+    
+    Args:
+        keywords: 검색 키워드 목록 (기본값: NEWS_KEYWORDS)
+        per_keyword: 키워드당 최대 기사 수 (None이면 제한 없음)
+        news_index: 이전 실행에서 다룬 기사를 거를 SeenNewsIndex (선택)
+    
+    Returns:
+        기사 딕셔너리 목록 (키워드 순서 유지, 각 기사에 'keyword' 포함)
+    """
     print("🔍 오늘의 금융 뉴스를 수집합니다...")
-    keywords = ["미국 증시", "FOMC", "연준 금리", "환율 전망"]
-    news_data = []
+    keywords = keywords or NEWS_KEYWORDS
+    feeds = fetch_feeds_concurrently(keywords)
+    items = []
+    run_fingerprints = set()
+    dropped = 0
 
+    # 프롬프트가 매번 같은 순서가 되도록 키워드 순서대로 합침
     for keyword in keywords:
-        encoded = urllib.parse.quote(keyword)
-        url = f"https://news.google.com/rss/search?q={encoded}&hl=ko&gl=KR&ceid=KR:ko"
-        feed = feedparser.parse(url)
-        
-        if feed.entries:
-            for i, entry in enumerate(feed.entries[:3], 1):
-                news_data.append(f"[{keyword} - 뉴스 #{i}]\n- 제목: {entry.title}\n- 링크: {entry.link}")
+        entries = [dict(entry, keyword=keyword) for entry in feeds.get(keyword) or []]
+        unique, removed = filter_duplicates(entries, news_index, run_fingerprints, limit=per_keyword)
+        items.extend(unique)
+        dropped += removed
     
+    if dropped:
+        print(f"🧹 중복 기사 {dropped}개 제외")
+    return items
+
+def format_news_items(items, with_summary=True):
+    """
+    기사 목록을 프롬프트용 텍스트로 만듭니다.
+    with_summary=False면 본문 요약을 빼고 제목과 링크만 넣습니다. (글에 붙이는 참고 뉴스용)
+    """
+    news_data = []
+    counters = {}
+    for item in items:
+        counters[item['keyword']] = counters.get(item['keyword'], 0) + 1
+        text = f"[{item['keyword']} - 뉴스 #{counters[item['keyword']]}]\n- 제목: {item['title']}\n- 링크: {item['link']}"
+        # 여러 언론사가 함께 보도한 기사는 중요도 신호로 표시
+        if item.get('cluster_size', 1) > 1:
+            text += f"\n- 관련 보도: {item['cluster_size']}건"
+        if with_summary and item.get('summary'):
+            text += f"\n- 본문 요약: {item['summary']}"
+        news_data.append(text)
     return "\n\n".join(news_data)
 
+def fit_news_to_budget(items, keywords=None, budget=PROMPT_TOKEN_BUDGET):
+    """
+    프롬프트 입력 토큰 예산에서 지시문 몫을 뺀 만큼만 기사를 담습니다.
+    
+    Returns:
+        (고른 기사 목록, 프롬프트용 뉴스 텍스트)
+    """
+    news_budget = budget - BLOG_PROMPT.static_tokens if budget > 0 else 0
+    if budget > 0 and news_budget <= 0:
+        print(f"⚠️ 토큰 예산({budget})이 지시문({BLOG_PROMPT.static_tokens})보다 작아 뉴스 예산을 제한하지 않습니다.")
+        news_budget = 0
+    selected, news_text, dropped = fit_news_items(
+        items, news_budget, format_news_items, keywords=keywords or NEWS_KEYWORDS
+    )
+    if dropped:
+        print(f"✂️ 토큰 예산 초과로 중요도가 낮은 기사 {dropped}개 제외 (뉴스 예산 {news_budget}토큰)")
+    return selected, news_text
+
+@instrumented('news')
+def get_finance_news(keywords=None):
+    candidates = collect_news_items(keywords, per_keyword=NEWS_CLUSTER_CANDIDATES)
+    items = enrich_news_items(cluster_news_items(candidates, per_keyword=NEWS_PER_KEYWORD))
+    _, news_text = fit_news_to_budget(items, keywords)
+    return news_text
+
 # ==========================================
 # 1-1. Unsplash에서 금융 관련 이미지 가져오기
 # ==========================================
+# 금융 관련 이미지 검색어 - 더 구체적으로
+UNSPLASH_QUERIES = [
+    "stock market chart screen",  # 주식 차트 화면
+    "financial trading graph",     # 금융 거래 그래프
+    "money investment business",   # 투자 비즈니스
+    "economy dollar currency",     # 달러 통화
+    "wall street stock exchange",  # 월스트리트 증권거래소
+    "cryptocurrency bitcoin chart", # 암호화폐 차트
+    "forex trading chart",         # 외환 거래 차트
+    "stock market bull bear"       # 주식시장 불/베어
+]
+
+def fetch_unsplash_photos(query, count=1):
+    """
+    Unsplash /photos/random에서 이미지를 count장(최대 30) 받아 옵니다. 요청 1회로 할당량 1회만 씁니다.
+    
+    Returns:
+        [{'id', 'url', 'credit', 'download_location', 'photographer'}, ...]
+    """
+    url = f"{UNSPLASH_API_URL}/photos/random"
+    params = {'query': query, 'orientation': 'landscape', 'count': min(count, 30)}
+    headers = {"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"}
+    
+    limiter = get_rate_limiter('unsplash')
+    started = time.perf_counter()
+    if limiter:
+        # 이미지는 없어도 발행할 수 있으므로 할당량이 없으면 기다리지 않고 생략
+        with limiter.slot(max_wait=0) as slot:
+            response = requests.get(url, params=params, headers=headers, timeout=10)
+            # 실패한 호출(401, 5xx 등)이 동시 호출 한도를 늘리지 않도록 응답 코드를 그대로 기록
+            slot.status = response.status_code
+            # Unsplash는 시간당 한도를 넘으면 403/429와 X-Ratelimit-Remaining: 0을 돌려줌
+            if response.status_code in (403, 429) and response.headers.get('X-Ratelimit-Remaining') == '0':
+                slot.status = 429
+                slot.retry_after = 3600
+    else:
+        response = requests.get(url, params=params, headers=headers, timeout=10)
+    telemetry.record_request('unsplash', bytes_in=len(response.content), seconds=time.perf_counter() - started,
+                             error=response.status_code != 200)
+    
+    if response.status_code != 200:
+        print(f"⚠️ Unsplash API 오류: {response.status_code}")
+        return []
+    
+    photos = []
+    for data in response.json():
+        photographer = data['user']['name']
+        photo_link = data['links']['html']
+        # Unsplash 이용 약관: 출처 표기 HTML
+        credit_html = f'<p style="font-size:12px;color:#999;margin-top:30px;">Photo by <a href="{photo_link}?utm_source=quanroot&utm_medium=referral" target="_blank">{photographer}</a> on <a href="https://unsplash.com?utm_source=quanroot&utm_medium=referral" target="_blank">Unsplash</a></p>'
+        photos.append({
+            'id': data['id'],
+            'url': data['urls']['regular'],  # 1080px 폭
+            'credit': credit_html,
+            'download_location': data['links'].get('download_location'),
+            'photographer': photographer,
+        })
+    return photos
+
+def track_unsplash_download(image):
+    """
+    Unsplash 이용 약관: 이미지를 실제로 사용할 때 다운로드 추적 링크를 호출해야 합니다.
+    """
+    if not image.get('download_location'):
+        return
+    try:
+        requests.get(
+            image['download_location'],
+            headers={"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"},
+            timeout=10,
+        )
+    except requests.RequestException as e:
+        print(f"⚠️ Unsplash 다운로드 추적 실패: {e}")
+
+_image_pool = None
+_image_pool_lock = threading.Lock()
+
+def get_image_pool():
+    """
+    Unsplash 이미지 풀을 돌려줍니다. (처음 호출할 때 한 번만 생성)
+    """
+    global _image_pool
+    with _image_pool_lock:
+        if _image_pool is None:
+            _image_pool = ImagePool(
+                fetch_unsplash_photos, UNSPLASH_QUERIES,
+                batch_size=IMAGE_POOL_BATCH_SIZE,
+                low_watermark=IMAGE_POOL_LOW_WATERMARK,
+                repeat_window_days=IMAGE_REPEAT_WINDOW_DAYS,
+            )
+        return _image_pool
+
+@instrumented('image')
 def get_finance_image_from_unsplash():
     """
-    Unsplash API를 사용하여 금융 관련 이미지 URL을 가져옵니다.
-    Returns: 이미지 URL 또는 None
+    Unsplash 금융 관련 이미지를 가져옵니다. (이미지 풀을 쓰면 저장해 둔 이미지에서 꺼냄)
+    Returns: {'id', 'url', 'credit'} 또는 None
     """
     if not UNSPLASH_ACCESS_KEY:
         print("⚠️ Unsplash API 키가 없습니다. 이미지 생략.")
         return None
     
     try:
-        # 금융 관련 키워드 - 더 구체적으로
-        import random
-        keywords = [
-            "stock market chart screen",  # 주식 차트 화면
-            "financial trading graph",     # 금융 거래 그래프
-            "money investment business",   # 투자 비즈니스
-            "economy dollar currency",     # 달러 통화
-            "wall street stock exchange",  # 월스트리트 증권거래소
-            "cryptocurrency bitcoin chart", # 암호화폐 차트
-            "forex trading chart",         # 외환 거래 차트
-            "stock market bull bear"       # 주식시장 불/베어
-        ]
-        query = random.choice(keywords)
-        
-        url = f"https://api.unsplash.com/photos/random?query={query}&orientation=landscape"
-        headers = {"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"}
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            image_url = data['urls']['regular']  # 1080px 폭
-            photographer = data['user']['name']
-            photo_link = data['links']['html']
-            
-            print(f"📷 이미지 가져옴: {image_url}")
-            print(f"   촬영: {photographer}")
-            
-            # Unsplash 이용 약관: 출처 표기 HTML
-            credit_html = f'<p style="font-size:12px;color:#999;margin-top:30px;">Photo by <a href="{photo_link}?utm_source=quanroot&utm_medium=referral" target="_blank">{photographer}</a> on <a href="https://unsplash.com?utm_source=quanroot&utm_medium=referral" target="_blank">Unsplash</a></p>'
-            
-            return {"url": image_url, "credit": credit_html}
+        if USE_IMAGE_POOL:
+            image = get_image_pool().take()
         else:
-            print(f"⚠️ Unsplash API 오류: {response.status_code}")
+            import random
+            photos = fetch_unsplash_photos(random.choice(UNSPLASH_QUERIES))
+            image = photos[0] if photos else None
+        if not image:
             return None
+        
+        print(f"📷 이미지 가져옴: {image['url']}")
+        print(f"   촬영: {image['photographer']}")
+        track_unsplash_download(image)
+        
+        return {"id": image['id'], "url": image['url'], "credit": image['credit']}
             
+    except RateLimitTimeout as e:
+        print(f"⚠️ 이미지 생략: {e}")
+        return None
     except Exception as e:
         print(f"⚠️ 이미지 가져오기 실패: {e}")
         return None
@@ -125,10 +654,8 @@ def get_finance_image_from_unsplash():
 # ==========================================
 # 2. Gemini Pro로 SEO 최적화된 제목과 본문 작성
 # ==========================================
-def generate_blog_content(news_text):
-    print("🧠 Gemini가 '쉽고 깊이 있는' 금융 분석 콘텐츠를 작성합니다...")
-    
-    prompt = f"""
+# 글 작성 프롬프트 템플릿 (import 시 한 번만 컴파일, 요청마다 뉴스 부분만 채움)
+BLOG_PROMPT_TEMPLATE = """
     당신은 **SEO 전문가이자 금융 블로그 작가**입니다.
     금융을 전혀 모르는 초보자도 쉽게 이해하면서도, 검색엔진 상위 노출이 가능한 고품질 콘텐츠를 작성합니다.
 
@@ -342,6 +869,7 @@ def generate_blog_content(news_text):
     6. **용어 설명**: 진짜 어려운 금융 전문 용어만 설명 (FOMC, 양적완화, S&P500 등)
     7. **중복 금지**: "환율(환율)", "달러(달러)" 같은 같은 단어 반복 절대 금지
     8. **현실적 비유**: 실제로 존재하는 가격과 검증 가능한 사실만 사용 (100만원짜리 자동차 같은 터무니없는 비유 절대 금지)
+    9. **본문 요약 활용**: 뉴스에 '본문 요약'이 있으면 그 안의 사실과 수치를 근거로 분석 (요약에 없는 수치나 발언은 지어내지 않음)
 
 
     [오늘의 뉴스 데이터]
@@ -354,64 +882,392 @@ def generate_blog_content(news_text):
         "content": "초등학생도 이해 가능한 HTML 본문 (5,000자 이상 필수!!)"
     }}}}
     """
+BLOG_PROMPT = PromptTemplate(BLOG_PROMPT_TEMPLATE)
 
-    # Gemini 2.5 Flash - 안정적이고 빠른 모델, 긴 출력
-    model = genai.GenerativeModel('gemini-2.5-flash')
-    response = model.generate_content(
-        prompt,
-        generation_config=genai.types.GenerationConfig(
-            temperature=0.7,  # 더 일관된 품질
-            max_output_tokens=16384,  # 글이 잘리지 않도록 충분한 토큰 수
-            top_p=0.95,
-        )
+# 구조화 출력일 때 덧붙이는 sections 필드 안내
+STRUCTURED_PROMPT_SUFFIX = """
+    - "sections": 본문의 H2 섹션마다 {"heading": "H2 제목", "summary": "한 줄 요약"} 목록
+    """
+
+def build_blog_prompt(news_text, structured=False):
+    """
+    뉴스 데이터로 글 작성 프롬프트를 만듭니다.
+    structured=True면 구조화 출력용 sections 필드 안내를 덧붙입니다.
+    """
+    prompt = BLOG_PROMPT.render(news_text=news_text)
+    if structured:
+        prompt += STRUCTURED_PROMPT_SUFFIX
+    return prompt
+
+def prompt_token_report(news_text, structured=False):
+    """
+    프롬프트 부분별 입력 토큰 수(추정)를 돌려줍니다.
+    {'static': 지시문, 'news_text': 뉴스, 'structured': 구조화 안내, 'total': 합계}
+    """
+    report = BLOG_PROMPT.breakdown(news_text=news_text)
+    total = report.pop('total')
+    report['structured'] = estimate_tokens(STRUCTURED_PROMPT_SUFFIX) if structured else 0
+    report['total'] = total + report['structured']
+    return report
+
+def _generation_config(structured=False):
+    config = {
+        'temperature': GENERATION_SETTINGS['temperature'],
+        'max_output_tokens': GENERATION_SETTINGS['max_output_tokens'],
+        'top_p': GENERATION_SETTINGS['top_p'],
+    }
+    if structured:
+        # JSON만 출력하도록 강제하고 응답 스키마(title, meta_description, content, sections) 지정
+        config['response_mime_type'] = 'application/json'
+        config['response_schema'] = RESPONSE_SCHEMA
+    return config
+
+_llm_backend = None
+_llm_backend_lock = threading.Lock()
+
+def get_llm_backend():
+    """
+    글 생성 백엔드를 돌려줍니다. (처음 호출할 때 한 번만 생성)
+    """
+    global _llm_backend
+    with _llm_backend_lock:
+        if _llm_backend is None:
+            _llm_backend = create_backend(
+                LLM_BACKEND,
+                [GENERATION_SETTINGS['model']] + LLM_FALLBACK_MODELS,
+                api_key=GEMINI_API_KEY,
+                limiter_for=lambda model: get_rate_limiter(f"gemini:{model}"),
+                mock_options={
+                    'responses': MOCK_RESPONSES_DIR,
+                    'latency': MOCK_LATENCY,
+                    'chars_per_second': MOCK_CHARS_PER_SECOND,
+                    'error_rate': MOCK_ERROR_RATE,
+                    'truncate_rate': MOCK_TRUNCATE_RATE,
+                    'seed': MOCK_SEED,
+                },
+            )
+            print(f"🔌 글 생성 백엔드: {_llm_backend.name}")
+        return _llm_backend
+
+def set_llm_backend(backend):
+    """
+    글 생성 백엔드를 바꿉니다. (벤치마크에서 MockBackend를 끼울 때 등)
+    """
+    global _llm_backend
+    with _llm_backend_lock:
+        _llm_backend = backend
+
+_generation_cache = None
+_generation_cache_lock = threading.Lock()
+
+def get_generation_cache():
+    """
+    생성 결과 캐시를 돌려줍니다. (열 수 없으면 None)
+    """
+    global _generation_cache
+    with _generation_cache_lock:
+        if _generation_cache is None:
+            try:
+                _generation_cache = GenerationCache(
+                    max_entries=GENERATION_CACHE_MAX_ENTRIES, ttl=GENERATION_CACHE_TTL
+                )
+            except OSError as e:
+                print(f"⚠️ 생성 결과 캐시 열기 실패: {e}")
+                return None
+        return _generation_cache
+
+def record_response(text, key):
+    """
+    파서 벤치마크용 말뭉치로 쓰도록 AI 응답 원문을 저장합니다.
+    """
+    try:
+        os.makedirs(RECORD_RESPONSES_DIR, exist_ok=True)
+        filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{key[:8]}.txt"
+        with open(os.path.join(RECORD_RESPONSES_DIR, filename), 'w', encoding='utf-8') as f:
+            f.write(text)
+    except OSError as e:
+        print(f"⚠️ 응답 기록 실패: {e}")
+
+@instrumented('generate')
+def generate_blog_content(news_text, use_cache=USE_GENERATION_CACHE):
+    print("🧠 Gemini가 '쉽고 깊이 있는' 금융 분석 콘텐츠를 작성합니다...")
+    
+    # 같은 뉴스/프롬프트/설정으로 이미 생성한 결과가 있으면 그대로 사용
+    # (어느 모델이 답할지는 호출해 봐야 알 수 있으므로 대체 모델까지 포함한 모델 순서를 키에 넣음)
+    cache = get_generation_cache() if use_cache else None
+    cache_key = generation_key(
+        PROMPT_VERSION, news_text,
+        dict(GENERATION_SETTINGS, structured=USE_STRUCTURED_OUTPUT, streaming=USE_STREAMING,
+             backend=LLM_BACKEND, models=[GENERATION_SETTINGS['model']] + LLM_FALLBACK_MODELS),
     )
+    if cache:
+        cached = cache.get(cache_key)
+        if cached:
+            print("♻️ 저장된 생성 결과 사용 (Gemini 호출 생략)")
+            telemetry.count('generation_cache_hits')
+            return cached
+    
+    tokens = prompt_token_report(news_text, structured=USE_STRUCTURED_OUTPUT)
+    parts = f"지시문 {tokens['static']} + 뉴스 {tokens['news_text']}"
+    if tokens['structured']:
+        parts += f" + 구조화 안내 {tokens['structured']}"
+    print(f"📏 입력 토큰(추정): {parts} = {tokens['total']}")
     
-    return response.text
+    if USE_STREAMING:
+        text = generate_blog_content_stream(news_text)
+    elif USE_STRUCTURED_OUTPUT:
+        text = generate_structured_content(news_text)
+    else:
+        prompt = build_blog_prompt(news_text)
+
+        # Gemini 2.5 Flash - 안정적이고 빠른 모델, 긴 출력 (실패 시 대체 모델 순서대로)
+        text = get_llm_backend().generate(prompt, _generation_config())
+        errors = validate_response(parse_response(text), require_sections=False)
+        record_generation('freeform', 1, not errors, errors)
+    
+    if RECORD_RESPONSES_DIR:
+        record_response(text, cache_key)
+    
+    # 제목과 본문이 온전한 응답만 저장 (깨진 응답을 재사용하지 않도록)
+    if cache and is_complete_response(text):
+        try:
+            cache.put(cache_key, text)
+        except OSError as e:
+            print(f"⚠️ 생성 결과 저장 실패: {e}")
+    
+    return text
+
+def generate_structured_content(news_text, max_retries=None):
+    """
+    응답 스키마를 지정한 구조화 출력으로 글을 생성하고 스키마로 검증합니다.
+    검증에 실패하면 오류 내용을 덧붙여 다시 요청합니다.
+    
+    Returns:
+        AI 응답 텍스트 (JSON, 재시도를 모두 실패하면 마지막 응답)
+    """
+    max_retries = STRUCTURED_MAX_RETRIES if max_retries is None else max_retries
+    base_prompt = build_blog_prompt(news_text, structured=True)
+    prompt = base_prompt
+    backend = get_llm_backend()
+    
+    text = ""
+    errors = []
+    for attempt in range(max_retries + 1):
+        text = backend.generate(prompt, _generation_config(structured=True))
+        try:
+            data = json.loads(text)
+        except ValueError:
+            # 출력 토큰 한도로 잘린 경우 등 - 살릴 수 있는 필드만 검증
+            data = parse_response(text)
+        errors = validate_response(data)
+        if not errors:
+            record_generation('structured', attempt + 1, True)
+            return text
+        
+        print(f"⚠️ 구조화 응답 검증 실패 ({attempt + 1}/{max_retries + 1}): {', '.join(errors[:3])}")
+        telemetry.count('regenerations')
+        prompt = (
+            f"{base_prompt}\n\n[재작성 요청] 이전 응답이 형식 검증에 실패했습니다: {'; '.join(errors[:3])}. "
+            "모든 필드를 빠짐없이 끝까지 작성하세요."
+        )
+    
+    record_generation('structured', max_retries + 1, False, errors)
+    return text
 
 # ==========================================
-# 3. 워드프레스 REST API로 포스팅
+# 2-1. 스트리밍 생성 (점진적 JSON 추출 + 조기 중단)
 # ==========================================
-def post_to_wordpress(title, content, category_id=1, status='publish', meta_description=None, featured_image_url=None):
+def check_stream_progress(extractor):
     """
-    워드프레스에 포스트를 생성합니다.
+    스트리밍 중인 응답을 검사합니다.
+    
+    Returns:
+        형식 오류 사유 문자열 (문제가 없으면 None)
+    """
+    # JSON이 시작되지 않은 채 설명 문장만 길게 이어지는 경우
+    if not extractor.started and extractor.skipped > STREAM_MAX_PREAMBLE:
+        return f"JSON 없이 {extractor.skipped}자 출력"
+    
+    content = extractor.fields.get('content')
+    if content is None:
+        return None
+    if not isinstance(content, str):
+        return "content 필드가 문자열이 아님"
+    if len(content) < STREAM_MIN_CONTENT_CHARS:
+        return f"본문이 너무 짧음 ({len(content)}자)"
+    if content.count('<h2') < STREAM_MIN_SECTIONS:
+        return f"H2 섹션 부족 ({content.count('<h2')}개)"
+    return None
+
+def generate_blog_content_stream(news_text, on_field=None, checker=check_stream_progress, max_retries=None):
+    """
+    Gemini 응답을 스트리밍으로 받으면서 JSON 필드를 점진적으로 추출합니다.
     
     Args:
-        title: 포스트 제목
-        content: 포스트 본문 (HTML)
-        category_id: 카테고리 ID (기본값: 1 - Uncategorized)
-        status: 'publish' (공개) 또는 'draft' (임시저장)
-        meta_description: SEO 메타 디스크립션 (선택)
-        featured_image_url: 대표 이미지 URL (선택)
+        news_text: 프롬프트에 넣을 뉴스 데이터
+        on_field: 필드가 완성될 때마다 호출할 함수 (키, 값) - 예: 제목을 먼저 사용
+        checker: 조각을 받을 때마다 호출할 검사 함수. 사유 문자열을 돌려주면
+                 생성을 즉시 중단하고 사유를 덧붙여 다시 요청합니다.
+        max_retries: 형식 오류 시 재요청 횟수 (기본값: STREAM_MAX_RETRIES)
     
     Returns:
-        생성된 포스트의 URL 또는 None
+        AI 응답 전체 텍스트 (재시도를 모두 실패하면 마지막 응답)
     """
+    max_retries = STREAM_MAX_RETRIES if max_retries is None else max_retries
+    base_prompt = build_blog_prompt(news_text, structured=USE_STRUCTURED_OUTPUT)
+    prompt = base_prompt
+    backend = get_llm_backend()
+    
+    def report_field(key, value):
+        if key in ('title', 'meta_description'):
+            print(f"⚡ {key} 수신: {str(value)[:60]}")
+        if on_field:
+            on_field(key, value)
+    
+    text = ""
+    for attempt in range(max_retries + 1):
+        extractor = IncrementalJSONExtractor(on_field=report_field)
+        parts = []
+        reason = None
+        chunks = backend.generate(prompt, _generation_config(structured=USE_STRUCTURED_OUTPUT), stream=True)
+        for piece in chunks:
+            parts.append(piece)
+            extractor.feed(piece)
+            reason = checker(extractor) if checker else None
+            if reason:
+                # 남은 생성을 기다리지 않도록 스트림을 바로 닫음
+                if hasattr(chunks, 'close'):
+                    chunks.close()
+                break
+        
+        text = "".join(parts)
+        if reason is None and not extractor.done:
+            reason = "응답이 중간에 끊김"
+        if reason is None:
+            record_generation('stream', attempt + 1, True)
+            return text
+        
+        print(f"⚠️ 스트리밍 응답 형식 오류 ({attempt + 1}/{max_retries + 1}): {reason}")
+        telemetry.count('regenerations')
+        prompt = (
+            f"{base_prompt}\n\n[재작성 요청] 이전 응답에 문제가 있었습니다: {reason}. "
+            "반드시 지정된 JSON 형식으로 모든 섹션을 끝까지 완성해서 다시 작성하세요."
+        )
+    
+    record_generation('stream', max_retries + 1, False, [reason])
+    return text
+
+# ==========================================
+# 3. 워드프레스 REST API로 포스팅
+# ==========================================
+_wp_client = None
+_taxonomy_cache = None
+_media_index = None
+_outbox = None
+_wp_client_lock = threading.Lock()
+
+def get_wp_client():
+    """
+    워드프레스 클라이언트를 돌려줍니다. (실행 중 하나를 만들어 연결을 재사용)
+    설정이 완료되지 않았으면 None을 돌려줍니다.
+    """
+    global _wp_client
     
     # 환경 변수에서 워드프레스 설정 읽기 (GitHub Actions용)
     wp_url = os.environ.get('WORDPRESS_URL', WORDPRESS_URL)
     wp_user = os.environ.get('WORDPRESS_USERNAME', WORDPRESS_USERNAME)
     wp_pass = os.environ.get('WORDPRESS_APP_PASSWORD', WORDPRESS_APP_PASSWORD)
     
-    # 필수 정보 검증
     if not wp_url or not wp_user or not wp_pass:
-        print("❌ 오류: 워드프레스 설정이 완료되지 않았습니다!")
-        print("   WORDPRESS_URL, WORDPRESS_USERNAME, WORDPRESS_APP_PASSWORD를 설정하세요.")
         return None
     
-    # API 엔드포인트
-    api_url = f"{wp_url.rstrip('/')}/wp-json/wp/v2/posts"
+    with _wp_client_lock:
+        if _wp_client is None:
+            _wp_client = WordPressClient(wp_url, wp_user, wp_pass)
+        return _wp_client
+
+def get_taxonomy_cache():
+    """
+    카테고리/태그 캐시를 돌려줍니다. (워드프레스 설정이 없으면 None)
+    """
+    global _taxonomy_cache
     
-    # Basic Authentication 인코딩
-    credentials = f"{wp_user}:{wp_pass}"
-    token = base64.b64encode(credentials.encode()).decode('utf-8')
+    client = get_wp_client()
+    if client is None:
+        return None
     
-    # 헤더 설정
-    headers = {
-        'Authorization': f'Basic {token}',
-        'Content-Type': 'application/json',
-    }
+    with _wp_client_lock:
+        if _taxonomy_cache is None:
+            _taxonomy_cache = TaxonomyCache(client, ttl=TAXONOMY_CACHE_TTL)
+        return _taxonomy_cache
+
+def get_media_index():
+    """
+    사진 ID → 미디어 ID 색인을 돌려줍니다. (워드프레스 설정이 없으면 None)
+    """
+    global _media_index
     
-    # 포스트 데이터
+    client = get_wp_client()
+    if client is None:
+        return None
+    
+    with _wp_client_lock:
+        if _media_index is None:
+            _media_index = MediaIndex(client.base_url)
+        return _media_index
+
+@instrumented('media')
+def upload_featured_image(image_data):
+    """
+    이미지를 미디어 라이브러리에 올리고 image_data에 'media_id', 'media_url'을 채워 돌려줍니다.
+    이미 올린 이미지(같은 사진 ID/URL)는 다시 올리지 않고, 실패하면 image_data를 그대로 돌려줍니다.
+    """
+    client = get_wp_client()
+    if not image_data or not USE_MEDIA_UPLOAD or client is None:
+        return image_data
+    
+    key = f"unsplash:{image_data['id']}" if image_data.get('id') else image_data['url']
+    filename = f"unsplash-{image_data['id']}.jpg" if image_data.get('id') else os.path.basename(urllib.parse.urlparse(image_data['url']).path) or 'featured.jpg'
+    use_derivatives = USE_IMAGE_DERIVATIVES and image_derivatives.available()
+    try:
+        if use_derivatives:
+            media = ensure_media_variants(
+                client, get_media_index(), key, image_data['url'], os.path.splitext(filename)[0],
+                IMAGE_WIDTHS, IMAGE_FORMATS, IMAGE_QUALITY,
+                alt_text="금융 시장 분석", caption=image_data.get('credit', ''),
+            )
+        else:
+            media = ensure_media(
+                client, get_media_index(), key, image_data['url'], filename,
+                alt_text="금융 시장 분석", caption=image_data.get('credit', ''),
+            )
+    except (requests.exceptions.RequestException, OSError) as e:
+        print(f"⚠️ 미디어 업로드 실패: {e}")
+        media = None
+    if not media:
+        return image_data
+    return dict(
+        image_data, media_id=media['id'], media_url=media['source_url'] or image_data['url'],
+        variants=media.get('variants') if use_derivatives else None,
+    )
+
+def get_outbox():
+    """
+    발행 기록을 돌려줍니다. (USE_OUTBOX=false면 None)
+    """
+    global _outbox
+    
+    if not USE_OUTBOX:
+        return None
+    with _wp_client_lock:
+        if _outbox is None:
+            _outbox = Outbox()
+        return _outbox
+
+def build_post_data(title, content, category_id=1, status='publish', meta_description=None, tag_ids=None, featured_media_id=None, slug=None):
+    """
+    포스트 생성 요청 본문을 만듭니다.
+    """
     post_data = {
         'title': title,
         'content': content,
@@ -419,6 +1275,12 @@ def post_to_wordpress(title, content, category_id=1, status='publish', meta_desc
         'categories': [category_id],
         'format': 'standard',
     }
+    if slug:
+        post_data['slug'] = slug
+    if tag_ids:
+        post_data['tags'] = list(tag_ids)
+    if featured_media_id:
+        post_data['featured_media'] = featured_media_id
     
     # 메타 디스크립션 추가 (Yoast SEO 또는 excerpt 사용)
     if meta_description:
@@ -427,23 +1289,75 @@ def post_to_wordpress(title, content, category_id=1, status='publish', meta_desc
         post_data['meta'] = {
             '_yoast_wpseo_metadesc': meta_description
         }
+    return post_data
+
+def find_posts_by_slug(client, slugs):
+    """
+    슬러그 목록으로 이미 만들어진 포스트를 한 번에 찾습니다. (임시저장/예약 글 포함)
+    
+    Returns:
+        {슬러그: {'id', 'link', 'status'}}
+    """
+    params = {'slug': ','.join(slugs), 'per_page': 100, '_fields': 'id,link,slug,status'}
+    response = client.list_posts(status='publish,future,draft,pending,private', context='edit', **params)
+    if response.status_code != 200:
+        # 다른 상태 글을 볼 권한이 없으면 공개 글만 조회
+        response = client.list_posts(**params)
+    if response.status_code != 200:
+        raise requests.exceptions.RequestException(f"슬러그 조회 실패: {response.status_code}")
+    # 한글 슬러그는 URL 인코딩된 형태로 돌아옴
+    return {urllib.parse.unquote(post['slug']).lower(): post for post in response.json()}
+
+def find_post_by_slug(client, slug):
+    """
+    슬러그로 이미 만들어진 포스트를 찾습니다.
+    
+    Returns:
+        {'id', 'link', 'status'} 또는 None
+    """
+    return find_posts_by_slug(client, [slug]).get(slug.lower())
+
+def send_post(client, post_data, key=None):
+    """
+    포스트 생성 요청을 보냅니다.
+    key(멱등 키)를 주면 발행 기록을 확인해 이미 발행된 글은 다시 보내지 않고,
+    지난 실행에서 결과를 모른 채 끝난 글은 워드프레스에서 먼저 찾아봅니다.
     
-    print(f"🚀 워드프레스에 포스팅 중... ({api_url})")
+    Returns:
+        생성된 포스트의 URL 또는 None
+    """
+    outbox = get_outbox() if key else None
+    if outbox:
+        record = outbox.get(key)
+        if record and record['state'] == PUBLISHED:
+            print(f"♻️ 이미 발행된 글입니다 (포스트 ID: {record['remote_id']}): {record['link']}")
+            return record['link']
+        slug = post_data.get('slug') or (record or {}).get('slug')
+        if record and record['state'] == PUBLISHING and slug:
+            try:
+                existing = find_post_by_slug(client, slug)
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️ 발행 여부 확인 실패 - 중복을 피하려고 이번에는 보내지 않습니다: {e}")
+                return None
+            if existing:
+                print(f"🔁 지난 실행에서 이미 만들어진 글을 찾았습니다 (포스트 ID: {existing['id']})")
+                outbox.mark_published(key, existing['id'], existing.get('link', ''))
+                return existing.get('link', '')
+        outbox.mark_publishing(key, post_data, slug=slug)
+    
+    print(f"🚀 워드프레스에 포스팅 중... ({client.api_url('wp/v2/posts')})")
     
     try:
         # POST 요청
-        response = requests.post(
-            api_url,
-            headers=headers,
-            data=json.dumps(post_data),
-            timeout=30
-        )
+        response = client.create_post(post_data)
         
         # 응답 처리
         if response.status_code == 201:  # Created
             post_info = response.json()
             post_url = post_info.get('link', '')
             post_id = post_info.get('id', '')
+            if outbox:
+                outbox.mark_published(key, post_id, post_url)
             
             print(f"✅ 포스팅 성공!")
             print(f"   📝 포스트 ID: {post_id}")
@@ -451,160 +1365,629 @@ def post_to_wordpress(title, content, category_id=1, status='publish', meta_desc
             
             return post_url
         else:
+            # 5xx는 서버가 글을 만든 뒤 실패했을 수도 있으므로 결과 미확인(publishing)으로 둠
+            if outbox and response.status_code < 500:
+                outbox.mark_failed(key, f"{response.status_code} {response.text[:200]}")
             print(f"❌ 포스팅 실패!")
             print(f"   상태 코드: {response.status_code}")
             print(f"   응답: {response.text}")
             return None
             
     except requests.exceptions.RequestException as e:
+        # 시간 초과 등은 글이 만들어졌을 수 있으므로 publishing으로 두고 다음 실행에서 확인
         print(f"❌ 네트워크 오류: {e}")
         return None
 
+@instrumented('publish', success=bool)
+def post_to_wordpress(title, content, category_id=1, status='publish', meta_description=None, featured_image_url=None, tag_ids=None, featured_media_id=None, slug=None, idempotency_key=None):
+    """
+    워드프레스에 포스트를 생성합니다.
+    
+    Args:
+        title: 포스트 제목
+        content: 포스트 본문 (HTML)
+        category_id: 카테고리 ID (기본값: 1 - Uncategorized)
+        status: 'publish' (공개) 또는 'draft' (임시저장)
+        meta_description: SEO 메타 디스크립션 (선택)
+        featured_image_url: 대표 이미지 URL (선택) - 미디어 라이브러리에 올려 대표 이미지로 지정
+        tag_ids: 태그 ID 목록 (선택)
+        featured_media_id: 이미 올린 대표 이미지의 미디어 ID (선택)
+        slug: 포스트 슬러그 (선택)
+        idempotency_key: 멱등 키 (선택) - 같은 키의 글은 한 번만 발행
+    
+    Returns:
+        생성된 포스트의 URL 또는 None
+    """
+    client = get_wp_client()
+    
+    # 필수 정보 검증
+    if client is None:
+        print("❌ 오류: 워드프레스 설정이 완료되지 않았습니다!")
+        print("   WORDPRESS_URL, WORDPRESS_USERNAME, WORDPRESS_APP_PASSWORD를 설정하세요.")
+        return None
+    
+    if featured_media_id is None and featured_image_url:
+        featured_media_id = upload_featured_image({'url': featured_image_url}).get('media_id')
+    
+    post_data = build_post_data(
+        title, content, category_id=category_id, status=status, meta_description=meta_description,
+        tag_ids=tag_ids, featured_media_id=featured_media_id, slug=slug,
+    )
+    return send_post(client, post_data, key=idempotency_key)
+
+@instrumented('publish', success=all)
+def publish_posts(entries):
+    """
+    여러 포스트를 batch/v1 요청으로 묶어 발행합니다.
+    배치를 지원하지 않는 서버(워드프레스 5.6 미만)에서는 한 건씩 보냅니다.
+    
+    Args:
+        entries: [{'post_data': 요청 본문 (build_post_data), 'key': 멱등 키 (선택)}, ...]
+    
+    Returns:
+        entries 순서대로 포스트 URL 또는 None
+    """
+    client = get_wp_client()
+    if client is None:
+        print("❌ 오류: 워드프레스 설정이 완료되지 않았습니다!")
+        return [None] * len(entries)
+    
+    batch_size = 0
+    if WP_BATCH_PUBLISH and len(entries) > 1:
+        try:
+            batch_size = client.batch_size()
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ 배치 지원 여부 확인 실패: {e}")
+        if not batch_size:
+            print("⚠️ 배치 API(batch/v1)를 쓸 수 없어 한 건씩 발행합니다.")
+    if not batch_size:
+        return [send_post(client, entry['post_data'], key=entry.get('key')) for entry in entries]
+    
+    outbox = get_outbox()
+    results = [None] * len(entries)
+    todo = []
+    unsure = {}
+    for i, entry in enumerate(entries):
+        record = outbox.get(entry['key']) if outbox and entry.get('key') else None
+        if record and record['state'] == PUBLISHED:
+            print(f"♻️ 이미 발행된 글입니다 (포스트 ID: {record['remote_id']}): {record['link']}")
+            results[i] = record['link']
+            continue
+        slug = entry['post_data'].get('slug') or (record or {}).get('slug')
+        if record and record['state'] == PUBLISHING and slug:
+            unsure[slug.lower()] = i
+        todo.append(i)
+    
+    # 지난 실행에서 결과를 모른 채 끝난 글은 슬러그 한 번 조회로 먼저 확인
+    if unsure:
+        try:
+            existing = find_posts_by_slug(client, list(unsure))
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ 발행 여부 확인 실패 - 중복을 피하려고 이번에는 보내지 않습니다: {e}")
+            existing = None
+            todo = [i for i in todo if i not in unsure.values()]
+        for slug, post in (existing or {}).items():
+            i = unsure.get(slug)
+            if i is None:
+                continue
+            print(f"🔁 지난 실행에서 이미 만들어진 글을 찾았습니다 (포스트 ID: {post['id']})")
+            outbox.mark_published(entries[i]['key'], post['id'], post.get('link', ''))
+            results[i] = post.get('link', '')
+            todo.remove(i)
+    
+    if todo:
+        print(f"🚀 워드프레스에 {len(todo)}건 배치 포스팅 중... (요청 {-(-len(todo) // batch_size)}회)")
+    for start in range(0, len(todo), batch_size):
+        chunk = todo[start:start + batch_size]
+        for i in chunk:
+            if outbox and entries[i].get('key'):
+                post_data = entries[i]['post_data']
+                outbox.mark_publishing(entries[i]['key'], post_data, slug=post_data.get('slug'))
+        try:
+            responses = client.batch([
+                {'method': 'POST', 'path': '/wp/v2/posts', 'body': entries[i]['post_data']} for i in chunk
+            ])
+        except BatchUnsupported:
+            print("⚠️ 배치 API(batch/v1)를 쓸 수 없어 한 건씩 발행합니다.")
+            for i in todo[start:]:
+                results[i] = send_post(client, entries[i]['post_data'], key=entries[i].get('key'))
+            break
+        except requests.exceptions.RequestException as e:
+            # 결과를 모르는 글은 publishing으로 남아 다음 실행에서 확인
+            print(f"❌ 배치 포스팅 네트워크 오류: {e}")
+            continue
+        
+        for i, result in zip(chunk, responses):
+            key = entries[i].get('key')
+            body = result['body'] or {}
+            if result['status'] == 201:
+                if outbox and key:
+                    outbox.mark_published(key, body.get('id'), body.get('link', ''))
+                results[i] = body.get('link', '')
+                print(f"✅ 포스팅 성공! (포스트 ID: {body.get('id')}) {results[i]}")
+            else:
+                if outbox and key and (result['status'] or 500) < 500:
+                    outbox.mark_failed(key, f"{result['status']} {body.get('message', '')}")
+                print(f"❌ 포스팅 실패: {entries[i]['post_data'].get('title')} ({result['status']} {body.get('message', '')})")
+    return results
+
+def resume_outbox():
+    """
+    지난 실행에서 발행을 끝내지 못한 글을 확인하고 다시 보냅니다.
+    (결과를 모르는 글은 슬러그로 먼저 찾아보므로 중복 발행되지 않음)
+    
+    Returns:
+        [(제목, 포스트 URL 또는 None), ...]
+    """
+    outbox = get_outbox()
+    client = get_wp_client()
+    if outbox is None or client is None:
+        return []
+    
+    outbox.prune(OUTBOX_RETENTION_DAYS * 86400)
+    records = outbox.pending(max_age=OUTBOX_RESUME_HOURS * 3600, max_attempts=OUTBOX_MAX_ATTEMPTS)
+    if not records:
+        return []
+    
+    print(f"📮 발행이 끝나지 않은 글 {len(records)}건을 이어서 처리합니다.")
+    news_index = get_news_index()
+    headline_history = get_headline_history()
+    post_urls = publish_posts([{'post_data': record['payload'], 'key': record['key']} for record in records])
+    for record, post_url in zip(records, post_urls):
+        if post_url and record['news_items']:
+            if news_index:
+                news_index.mark_seen(record['news_items'])
+            if headline_history:
+                headline_history.add(record['news_items'])
+    return [(record['title'], post_url) for record, post_url in zip(records, post_urls)]
+
 # ==========================================
 # 4. 워드프레스 카테고리 목록 조회 (참고용)
 # ==========================================
-def get_wordpress_categories():
+def get_wordpress_categories(force_refresh=False):
     """
-    워드프레스 카테고리 목록을 조회합니다.
+    워드프레스 카테고리 목록을 조회합니다. (로컬 캐시 사용, 모든 페이지 포함)
     """
-    wp_url = os.environ.get('WORDPRESS_URL', WORDPRESS_URL)
-    wp_user = os.environ.get('WORDPRESS_USERNAME', WORDPRESS_USERNAME)
-    wp_pass = os.environ.get('WORDPRESS_APP_PASSWORD', WORDPRESS_APP_PASSWORD)
+    taxonomy_cache = get_taxonomy_cache()
     
-    if not wp_url or not wp_user or not wp_pass:
+    if taxonomy_cache is None:
         print("❌ 워드프레스 설정이 완료되지 않았습니다!")
         return []
     
-    api_url = f"{wp_url.rstrip('/')}/wp-json/wp/v2/categories"
-    
-    credentials = f"{wp_user}:{wp_pass}"
-    token = base64.b64encode(credentials.encode()).decode('utf-8')
-    
-    headers = {
-        'Authorization': f'Basic {token}',
-    }
-    
     try:
-        response = requests.get(api_url, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            categories = response.json()
-            print("📂 사용 가능한 카테고리:")
-            for cat in categories:
-                print(f"   ID: {cat['id']} - {cat['name']}")
-            return categories
-        else:
-            print(f"❌ 카테고리 조회 실패: {response.status_code}")
-            return []
+        if force_refresh:
+            taxonomy_cache.refresh('categories', force=True)
+        categories = taxonomy_cache.terms('categories')
+        print("📂 사용 가능한 카테고리:")
+        for cat in categories:
+            print(f"   ID: {cat['id']} - {cat['name']}")
+        return categories
     except Exception as e:
         print(f"❌ 오류: {e}")
         return []
 
 # ==========================================
-# 메인 실행
+# 5. AI 응답 분리 및 포스트 조립
 # ==========================================
-if __name__ == "__main__":
-    import re
+def parse_ai_response(ai_response, raw_news):
+    """
+    AI 응답에서 제목/본문/메타 디스크립션을 추출합니다.
+    추출에 실패하면 뉴스 키워드 기반 SEO 제목으로 대체합니다.
+    
+    Returns:
+        (제목, 본문 HTML, 메타 디스크립션)
+    """
+    blog_title = ""
+    blog_content = ""
+    meta_description = ""
     
+    # JSON 파싱 (코드 블록 제거, 이스케이프 처리, 잘린 응답 복구를 한 번에)
+    parsed = parse_response(ai_response)
+
     try:
-        # 1. 뉴스 수집
-        raw_news = get_finance_news()
+        if parsed['title'] and parsed['content']:
+            blog_title = parsed['title']
+            blog_content = parsed['content'].replace('\n', '<br>')
+            meta_description = parsed['meta_description'].replace('\n', ' ')
+            
+            if parsed['repaired']:
+                print("⚠️ 응답이 중간에 끊겨 받은 부분까지 복구했습니다.")
+            print(f"\n📌 제목: {blog_title}")
+            print(f"📝 본문 길이: {len(blog_content)}자")
+            print(f"📋 메타 디스크립션: {meta_description[:100]}...\n")
+        else:
+            raise Exception("JSON 필드 추출 실패")
+    except Exception as parse_error:
+        print(f"⚠️ 제목/본문 분리 실패: {parse_error}")
+        print("→ SEO 최적화 제목 자동 생성 모드")
         
-        # 2. AI로 제목과 본문 생성
-        ai_response = generate_blog_content(raw_news)
+        # SEO에 유리한 제목 생성 - 검색 쿼리 기반
+        today_str = datetime.now().strftime("%Y년 %m월")
         
-        print(f"🤖 AI 응답 길이: {len(ai_response)}자")
+        # 실제 검색 쿼리 스타일로 제목 생성
+        if "금리" in raw_news and "인하" in raw_news:
+            blog_title = f"미국 금리 인하 언제? {today_str} FOMC 일정과 전망 정리"
+            meta_description = f"미국 금리 인하 시기와 한국 경제 영향을 초보자도 이해할 수 있게 정리했습니다. {today_str} 최신 FOMC 전망을 확인하세요."
+        elif "금리" in raw_news and "동결" in raw_news:
+            blog_title = f"미국 금리 동결 발표 - 한국 주식 영향 5가지 ({today_str})"
+            meta_description = f"미국 금리 동결이 국내 증시와 환율에 미치는 영향을 분석했습니다. 투자자가 알아야 할 핵심 정보를 확인하세요."
+        elif "환율" in raw_news:
+            blog_title = f"원달러 환율 {today_str} 전망 - 1500원 돌파 가능성은?"
+            meta_description = f"원달러 환율 전망과 달러 강세 원인을 쉽게 설명합니다. 환율 변동이 내 자산에 미치는 영향까지 확인하세요."
+        elif "나스닥" in raw_news or "급등" in raw_news:
+            blog_title = f"나스닥 급등 원인 분석 - {today_str} 빅테크 실적 총정리"
+            meta_description = f"나스닥이 급등한 이유를 초보 투자자도 이해할 수 있게 설명합니다. 빅테크 기업 실적과 투자 전략을 확인하세요."
+        else:
+            blog_title = f"{today_str} 글로벌 금융시장 - 주식·금리·환율 핵심 정리"
+            meta_description = f"복잡한 금융 뉴스를 3분 만에 이해하세요. 오늘의 주요 경제 소식과 투자 포인트를 초보자 눈높이에 맞춰 정리했습니다."
         
-        # 3. 제목/본문/메타 디스크립션 추출
-        blog_title = ""
-        blog_content = ""
-        meta_description = ""
+        # 본문만이라도 추출되었으면 사용, 아니면 응답 전체를 본문으로 사용
+        blog_content = parsed['content']
+        if not blog_content:
+            blog_content = ai_response.replace('```json', '').replace('```', '').strip()
+            blog_content = blog_content.replace('\\n', '<br>').replace('\\"', '"')
+        blog_content = blog_content.replace('\n', '<br>')
 
-        try:
-            # JSON 파싱 시도
-            title_match = re.search(r'"title"\s*:\s*"(.*?)"', ai_response, re.DOTALL)
-            content_match = re.search(r'"content"\s*:\s*"(.*?)"', ai_response, re.DOTALL)
-            meta_match = re.search(r'"meta_description"\s*:\s*"(.*?)"', ai_response, re.DOTALL)
-            
-            if title_match and content_match:
-                blog_title = title_match.group(1)
-                blog_content = content_match.group(1)
-                meta_description = meta_match.group(1) if meta_match else ""
-                
-                # 이스케이프 문자 처리
-                blog_content = blog_content.replace('\\n', '<br>').replace('\\"', '"').replace('\n', '<br>')
-                meta_description = meta_description.replace('\\n', ' ').replace('\\"', '"').replace('\n', ' ')
-                
-                print(f"\n📌 제목: {blog_title}")
-                print(f"📝 본문 길이: {len(blog_content)}자")
-                print(f"📋 메타 디스크립션: {meta_description[:100]}...\n")
-            else:
-                raise Exception("정규식 패턴 매칭 실패")
-        except Exception as parse_error:
-            print(f"⚠️ 제목/본문 분리 실패: {parse_error}")
-            print("→ SEO 최적화 제목 자동 생성 모드")
-            
-            # SEO에 유리한 제목 생성 - 검색 쿼리 기반
-            today_str = datetime.now().strftime("%Y년 %m월")
-            
-            # 실제 검색 쿼리 스타일로 제목 생성
-            if "금리" in raw_news and "인하" in raw_news:
-                blog_title = f"미국 금리 인하 언제? {today_str} FOMC 일정과 전망 정리"
-                meta_description = f"미국 금리 인하 시기와 한국 경제 영향을 초보자도 이해할 수 있게 정리했습니다. {today_str} 최신 FOMC 전망을 확인하세요."
-            elif "금리" in raw_news and "동결" in raw_news:
-                blog_title = f"미국 금리 동결 발표 - 한국 주식 영향 5가지 ({today_str})"
-                meta_description = f"미국 금리 동결이 국내 증시와 환율에 미치는 영향을 분석했습니다. 투자자가 알아야 할 핵심 정보를 확인하세요."
-            elif "환율" in raw_news:
-                blog_title = f"원달러 환율 {today_str} 전망 - 1500원 돌파 가능성은?"
-                meta_description = f"원달러 환율 전망과 달러 강세 원인을 쉽게 설명합니다. 환율 변동이 내 자산에 미치는 영향까지 확인하세요."
-            elif "나스닥" in raw_news or "급등" in raw_news:
-                blog_title = f"나스닥 급등 원인 분석 - {today_str} 빅테크 실적 총정리"
-                meta_description = f"나스닥이 급등한 이유를 초보 투자자도 이해할 수 있게 설명합니다. 빅테크 기업 실적과 투자 전략을 확인하세요."
+    return blog_title, blog_content, meta_description
+
+def compose_post_content(blog_content, image_data, raw_news):
+    """
+    본문에 이미지와 출처를 붙이고, 본문이 너무 짧으면 원본 뉴스로 보강합니다.
+    """
+    if image_data:
+        # 이미지를 본문 상단에 삽입 (미디어 라이브러리에 올렸으면 우리 사이트 주소 사용)
+        # 대표 이미지를 테마가 따로 보여 주고 본문에는 넣지 않으려면 INLINE_FEATURED_IMAGE=false
+        if INLINE_FEATURED_IMAGE or not image_data.get('media_id'):
+            image_style = "width:100%;max-width:800px;height:auto;margin:20px 0;border-radius:8px;"
+            if image_data.get('variants'):
+                # 화면 폭에 맞는 크기/형식(AVIF, WebP, JPEG)을 브라우저가 고르도록 srcset 사용
+                image_html = image_derivatives.build_picture_html(image_data['variants'], "금융 시장 분석", style=image_style)
             else:
-                blog_title = f"{today_str} 글로벌 금융시장 - 주식·금리·환율 핵심 정리"
-                meta_description = f"복잡한 금융 뉴스를 3분 만에 이해하세요. 오늘의 주요 경제 소식과 투자 포인트를 초보자 눈높이에 맞춰 정리했습니다."
-            
-            blog_content = ai_response.replace('```json', '').replace('```', '').strip()
-            if '"content":' in blog_content:
-                blog_content = blog_content.split('"content":')[-1].strip().strip('"}')
-            
-            # 이스케이프 문자 처리
-            blog_content = blog_content.replace('\\n', '<br>').replace('\n', '<br>').replace('\\"', '"')
-
-        # 4. Unsplash 이미지 가져오기
-        image_data = get_finance_image_from_unsplash()
-        if image_data:
-            # 이미지를 본문 상단에 삽입
-            image_html = f'<img src="{image_data["url"]}" alt="금융 시장 분석" style="width:100%;max-width:800px;height:auto;margin:20px 0;border-radius:8px;" />'
+                image_src = image_data.get('media_url') or image_data["url"]
+                image_html = f'<img src="{image_src}" alt="금융 시장 분석" style="{image_style}" />'
             blog_content = image_html + "<br>" + blog_content
-            # 이미지 출처 하단에 추가
-            blog_content += "<br>" + image_data["credit"]
+        # 이미지 출처 하단에 추가
+        blog_content += "<br>" + image_data["credit"]
+    
+    # 안전장치: 본문 길이 체크 및 보강
+    if len(blog_content) < 1000:
+        print(f"⚠️ 경고: 본문이 너무 짧습니다 ({len(blog_content)}자)")
+        print("   → 원본 뉴스를 추가합니다")
+        blog_content += "<br><br><h2>📰 참고: 오늘의 주요 뉴스</h2><div style='background:#f5f5f5;padding:20px;border-radius:8px;'><pre style='white-space:pre-wrap;'>" + raw_news + "</pre></div>"
+    
+    return blog_content
+
+# ==========================================
+# 6. 포스팅 파이프라인 (수집 → 생성 → 이미지 → 발행)
+# ==========================================
+def default_topic():
+    """
+    단일 실행에서 사용하는 기본 주제 (환경 변수/config.py 설정 기반)
+    """
+    return {
+        'name': '오늘의 금융 뉴스',
+        'keywords': list(NEWS_KEYWORDS),
+        'category_id': WORDPRESS_CATEGORY_ID,
+        'tags': list(POST_TAGS),
+        'status': POST_STATUS,
+    }
+
+class PostPipeline:
+    """
+    주제 목록으로 포스팅 파이프라인을 구성하고 실행합니다.
+    
+    - fetch: 모든 주제의 키워드 피드를 한 번만 수집해 주제별로 나누고, 고른 기사의 원문 본문을 요약해 붙임
+    - generate: Gemini 글 생성 (동시에 이미지 검색과 카테고리 확인을 미리 시작, 생성에 실패하면 취소)
+    - image: 생성과 동시에 고른 이미지를 미디어 라이브러리에 올리고, 이미지와 출처를 본문에 붙여 최종 본문 완성
+    - publish: 워드프레스 발행 및 사용한 기사 기록
+      (주제가 여럿이면 완성된 글을 flush_size개 또는 flush_seconds초 단위로 모아 batch/v1 요청으로 발행)
+    
+    사용 예:
+        results = PostPipeline([default_topic()]).run()
+    """
+
+    def __init__(self, topics, generate_concurrency=GENERATE_CONCURRENCY,
+                 min_interval=GENERATE_MIN_INTERVAL, queue_size=PIPELINE_QUEUE_SIZE, batch_publish=None,
+                 flush_size=WP_BATCH_FLUSH_SIZE, flush_seconds=WP_BATCH_FLUSH_SECONDS):
+        self.topics = topics
+        self.batch_publish = WP_BATCH_PUBLISH and len(topics) > 1 if batch_publish is None else batch_publish
+        self.flush_size = max(1, flush_size)
+        self.flush_seconds = flush_seconds
+        self.news_index = get_news_index()
+        self.headline_history = get_headline_history()
+        self.article_cache = get_article_cache() if USE_ARTICLE_BODY else None
+        self.spacer = RequestSpacer(min_interval)
+        self.pipeline = Pipeline([
+            # 기사 원문 받기는 주제마다 기다리는 시간이 길어 여러 주제를 동시에 처리
+            Stage('fetch', self.fetch_stage, workers=generate_concurrency),
+            Stage('generate', self.generate_stage, workers=generate_concurrency),
+            # 미디어 업로드가 이 단계에서 일어나므로 글 생성과 같은 수만큼 동시에 처리
+            Stage('image', self.image_stage, workers=generate_concurrency),
+            Stage('publish', self.publish_stage, workers=generate_concurrency),
+        ], queue_size=queue_size, on_error=self._on_error)
+        self._candidates = None
+        self._fetch_lock = None
+
+    def _on_error(self, stage_name, job, error):
+        print(f"❌ [{job['topic']['name']}] {stage_name} 단계 에러: {error}")
+        job['error'] = f"{stage_name}: {error}"
+        self._finished.append(job)
+
+    def _union_keywords(self):
+        keywords = []
+        for topic in self.topics:
+            for keyword in topic['keywords']:
+                if keyword not in keywords:
+                    keywords.append(keyword)
+        return keywords
+
+    async def fetch_stage(self, job):
+        # 첫 주제가 들어올 때 전체 키워드를 한 번만 수집
+        async with self._fetch_lock:
+            if self._candidates is None:
+                self._candidates = await asyncio.to_thread(
+                    collect_news_items, self._union_keywords(),
+                    NEWS_CLUSTER_CANDIDATES, self.news_index,
+                )
+        
+        topic = job['topic']
+        items = [item for item in self._candidates if item['keyword'] in topic['keywords']]
+        items = cluster_news_items(items, history=self.headline_history, per_keyword=NEWS_PER_KEYWORD)
+        if not items:
+            print(f"⚠️ [{topic['name']}] 새로운 기사가 없어 건너뜁니다.")
+            job['error'] = "새로운 기사 없음"
+            self._finished.append(job)
+            return None
+        
+        # 원문 본문 요약을 붙인 뒤 예산에 맞춤 (이미 받은 기사는 캐시에서 바로 읽음)
+        items = await asyncio.to_thread(enrich_news_items, items, self.article_cache)
+        
+        # 실제로 프롬프트에 들어간 기사만 발행 후 기록되도록 예산에 맞춘 목록으로 교체
+        job['news_items'], job['raw_news'] = fit_news_to_budget(items, topic['keywords'])
+        return job
+
+    def _resolve_terms(self, topic):
+        """
+        주제의 카테고리 이름/태그 이름을 ID로 바꿉니다. (캐시가 유효하면 네트워크 요청 없음)
         
-        # 5. 안전장치: 본문 길이 체크 및 보강
-        if len(blog_content) < 1000:
-            print(f"⚠️ 경고: 본문이 너무 짧습니다 ({len(blog_content)}자)")
-            print("   → 원본 뉴스를 추가합니다")
-            blog_content += "<br><br><h2>📰 참고: 오늘의 주요 뉴스</h2><div style='background:#f5f5f5;padding:20px;border-radius:8px;'><pre style='white-space:pre-wrap;'>" + raw_news + "</pre></div>"
+        Returns:
+            (카테고리 ID, 태그 ID 목록)
+        """
+        category_id = topic.get('category_id') or WORDPRESS_CATEGORY_ID
+        tag_ids = []
+        if not topic.get('category') and not topic.get('tags'):
+            return category_id, tag_ids
+        
+        taxonomy_cache = get_taxonomy_cache()
+        if taxonomy_cache is None:
+            return category_id, tag_ids
+        
+        try:
+            if topic.get('category') and not topic.get('category_id'):
+                if TAXONOMY_CREATE_MISSING:
+                    category_id = taxonomy_cache.ensure('categories', topic['category'])
+                else:
+                    category_id = taxonomy_cache.find('categories', topic['category']) or WORDPRESS_CATEGORY_ID
+            if topic.get('tags'):
+                tag_ids = taxonomy_cache.resolve('tags', topic['tags'], create=TAXONOMY_CREATE_MISSING)
+        except Exception as e:
+            print(f"⚠️ [{topic['name']}] 카테고리/태그 확인 실패: {e}")
+        return category_id, tag_ids
+
+    async def _drop_side_tasks(self, job):
+        """
+        글 생성과 함께 시작한 이미지 검색/카테고리 확인을 취소하고 끝날 때까지 기다립니다.
+        (아직 시작하지 않은 작업은 실행되지 않고, 이미 스레드에서 실행 중인 작업은 끝까지 기다림)
+        """
+        tasks = [job.pop('image_task'), job.pop('terms_task')]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def generate_stage(self, job):
+        topic = job['topic']
+        # 이미지 검색과 카테고리/태그 확인은 Gemini 결과와 무관하므로 생성과 동시에 진행
+        # (미디어 업로드는 글 생성이 성공한 뒤 이미지 단계에서 - 발행하지 않을 글에 업로드하지 않도록)
+        job['image_task'] = asyncio.create_task(asyncio.to_thread(get_finance_image_from_unsplash))
+        job['terms_task'] = asyncio.create_task(asyncio.to_thread(self._resolve_terms, topic))
+        
+        def generate():
+            self.spacer.wait()
+            print(f"🧠 [{topic['name']}] 글 생성 시작")
+            return generate_blog_content(job['raw_news'])
+        
+        try:
+            ai_response = await asyncio.to_thread(generate)
+            print(f"🤖 [{topic['name']}] AI 응답 길이: {len(ai_response)}자")
+            job['title'], job['content'], job['meta_description'] = parse_ai_response(ai_response, job['raw_news'])
+            
+            # 이미지를 붙이기 전 본문으로 멱등 키를 만들어, 같은 글이 다시 생성되어도 한 번만 발행
+            outbox = get_outbox()
+            record = None
+            if outbox:
+                job['idempotency_key'] = idempotency_key(job['title'], job['content'])
+                job['slug'] = make_slug(job['title'], job['idempotency_key'])
+                record = await asyncio.to_thread(
+                    outbox.record_generated, job['idempotency_key'], topic['name'],
+                    job['title'], job['slug'], job['news_items'],
+                )
+        except BaseException:
+            # 발행하지 않을 글에 이미지 할당량/미디어 업로드를 쓰지 않도록 함께 시작한 작업을 정리
+            await self._drop_side_tasks(job)
+            raise
+        
+        if record and record['state'] == PUBLISHED:
+            # 이미지 업로드/발행 없이 기존 글 주소로 끝냄
+            print(f"♻️ [{topic['name']}] 이미 발행된 글과 같은 내용입니다: {record['link']}")
+            await self._drop_side_tasks(job)
+            job['post_url'] = record['link']
+            self._finished.append(job)
+            return None
+        return job
+
+    async def image_stage(self, job):
+        image_data = await asyncio.to_thread(upload_featured_image, await job['image_task'])
+        job['image'] = image_data
+        if job.get('idempotency_key') and (image_data or {}).get('media_id'):
+            await asyncio.to_thread(get_outbox().mark_media, job['idempotency_key'], image_data['media_id'])
+        job['content'] = compose_post_content(job['content'], image_data, format_news_items(job['news_items'], with_summary=False))
         
-        # 최종 정보 출력
-        print(f"\n✅ 최종 제목: {blog_title}")
-        print(f"✅ 메타 설명: {meta_description[:80]}...")
-        print(f"✅ 본문 길이: {len(blog_content)}자")
+        print(f"\n✅ 최종 제목: {job['title']}")
+        print(f"✅ 메타 설명: {job['meta_description'][:80]}...")
+        print(f"✅ 본문 길이: {len(job['content'])}자")
         print(f"✅ 이미지: {'포함' if image_data else '없음'}")
+        return job
 
-        # 6. 워드프레스에 포스팅
-        post_url = post_to_wordpress(
-            title=blog_title,
-            content=blog_content,
-            meta_description=meta_description,
-            category_id=WORDPRESS_CATEGORY_ID,
-            status=POST_STATUS
+    async def publish_stage(self, job):
+        job['category_id'], job['tag_ids'] = await job['terms_task']
+        if self.batch_publish:
+            # 다른 글과 묶어 발행 (flush_size개가 모이거나 첫 글이 flush_seconds초 기다리면 발행)
+            self._ready.append(job)
+            if len(self._ready) >= self.flush_size:
+                await self._flush_ready()
+            elif self._flush_timer is None:
+                self._flush_timer = asyncio.create_task(self._flush_later(self.flush_seconds))
+                self._flush_tasks.append(self._flush_timer)
+            return job
+        return await asyncio.to_thread(self._publish, job)
+
+    def _publish(self, job):
+        topic = job['topic']
+        job['post_url'] = post_to_wordpress(
+            title=job['title'],
+            content=job['content'],
+            meta_description=job['meta_description'],
+            category_id=job['category_id'],
+            tag_ids=job['tag_ids'],
+            status=topic.get('status', POST_STATUS),
+            featured_media_id=(job.get('image') or {}).get('media_id'),
+            slug=job.get('slug'),
+            idempotency_key=job.get('idempotency_key'),
         )
-        
-        if post_url:
-            print(f"\n🎉 작업 완료! 블로그를 확인하세요: {post_url}")
+        self._record_result(job)
+        return job
+
+    async def _flush_ready(self):
+        """
+        지금까지 모인 글을 발행합니다. (발행 중에 완성된 글은 다음 묶음으로)
+        """
+        jobs, self._ready = self._ready, []
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not jobs:
+            return
+        try:
+            await asyncio.to_thread(self._publish_ready, jobs)
+        except Exception as e:
+            # 이미 발행 단계를 통과한 글이므로 묶음 전체에 원인을 남김 (결과를 받기 전에 실패한 글만)
+            print(f"❌ 묶음 발행 에러 ({len(jobs)}건): {e}")
+            for job in jobs:
+                if not job.get('post_url'):
+                    job['error'] = f"publish: {e}"
+
+    async def _flush_later(self, delay):
+        await asyncio.sleep(delay)
+        # 발행 중에는 취소되지 않도록 타이머를 먼저 비움
+        self._flush_timer = None
+        await self._flush_ready()
+
+    def _publish_ready(self, jobs):
+        """
+        준비된 글을 batch/v1 요청으로 묶어 발행합니다.
+        """
+        entries = [{
+            'post_data': build_post_data(
+                job['title'], job['content'],
+                category_id=job['category_id'],
+                status=job['topic'].get('status', POST_STATUS),
+                meta_description=job['meta_description'],
+                tag_ids=job['tag_ids'],
+                featured_media_id=(job.get('image') or {}).get('media_id'),
+                slug=job.get('slug'),
+            ),
+            'key': job.get('idempotency_key'),
+        } for job in jobs]
+        for job, post_url in zip(jobs, publish_posts(entries)):
+            job['post_url'] = post_url
+            self._record_result(job)
+
+    def _record_result(self, job):
+        topic = job['topic']
+        if job['post_url']:
+            # 다음 실행에서 같은 기사를 다시 다루지 않도록 기록
+            if self.news_index:
+                self.news_index.mark_seen(job['news_items'])
+            if self.headline_history:
+                self.headline_history.add(job['news_items'])
+            print(f"🎉 [{topic['name']}] 발행 완료: {job['post_url']}")
         else:
-            print("\n⚠️ 포스팅 실패. 설정을 확인하세요.")
+            print(f"⚠️ [{topic['name']}] 포스팅 실패. 설정을 확인하세요.")
+
+    async def run_async(self):
+        """
+        파이프라인을 실행하고 주제별 작업 결과(딕셔너리) 목록을 돌려줍니다.
+        """
+        self._fetch_lock = asyncio.Lock()
+        self._finished = []
+        self._ready = []
+        self._flush_timer = None
+        self._flush_tasks = []
+        jobs = [{'topic': topic} for topic in self.topics]
+        published = await self.pipeline.run(jobs)
+        await self._flush_ready()
+        # 타이머가 시작한 발행이 끝날 때까지 기다림 (대기 중이던 타이머는 위에서 취소됨)
+        for result in await asyncio.gather(*self._flush_tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                print(f"❌ 묶음 발행 타이머 에러: {result}")
+        return published + self._finished
+
+    def run(self):
+        results = asyncio.run(self.run_async())
+        self.pipeline.print_report()
+        return results
+
+def run_posts(topics=None, run_name='', **kwargs):
+    """
+    주제 목록(기본값: 단일 기본 주제)으로 파이프라인을 실행합니다.
+    단계별 소요 시간, 전송량, 토큰/비용을 계측해 실행 리포트(RUN_REPORT_DIR)로 남깁니다.
+    
+    Returns:
+        [(주제 이름, 포스트 URL 또는 None), ...]
+    """
+    run = telemetry.start_run(run_name)
+    results = []
+    try:
+        # 지난 실행에서 끝내지 못한 발행을 먼저 정리
+        for title, post_url in resume_outbox():
+            run.record_post(title, post_url, resumed=True)
+        post_pipeline = PostPipeline(topics or [default_topic()], **kwargs)
+        results = post_pipeline.run()
+        run.attach('pipeline', post_pipeline.pipeline.report())
+        # 백그라운드 이미지 풀 채우기가 프로세스 종료로 끊기지 않도록 잠시 기다림
+        if _image_pool is not None:
+            _image_pool.join(timeout=30)
+    except Exception as e:
+        run.error = str(e)
+        raise
+    finally:
+        for job in results:
+            run.record_post(job['topic']['name'], job.get('post_url'), job.get('error'))
+        telemetry.finish_run(run)
+    return [(job['topic']['name'], job.get('post_url')) for job in results]
+
+# ==========================================
+# 메인 실행
+# ==========================================
+if __name__ == "__main__":
+    try:
+        results = run_posts()
+        
+        for name, post_url in results:
+            if post_url:
+                print(f"\n🎉 작업 완료! 블로그를 확인하세요: {post_url}")
+            else:
+                print("\n⚠️ 포스팅 실패. 설정을 확인하세요.")
         
     except Exception as e:
         print(f"❌ 에러 발생: {e}")
@@ -0,0 +1,237 @@
+"""
+워드프레스 REST API 클라이언트
+
+requests.Session 하나로 연결을 재사용(keep-alive)하고, 인증 헤더를 미리 만들어 두며,
+429/5xx 응답은 간격을 늘려 가며 다시 시도합니다.
+글, 카테고리, 태그, 미디어 요청은 모두 이 클라이언트를 거칩니다.
+워드프레스 5.6 이상에서는 여러 요청을 batch/v1 한 번으로 묶어 보낼 수 있습니다.
+"""
+
+import base64
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import telemetry
+
+# 다시 시도할 응답 코드
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# POST처럼 멱등이 아닌 요청은 서버가 처리하지 않았음이 확실한 코드만 재시도
+NON_IDEMPOTENT_RETRY_STATUSES = {429, 503}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+# batch/v1 한 번에 묶을 수 있는 요청 수 (서버가 알려 주지 않을 때 기본값)
+DEFAULT_BATCH_SIZE = 25
+
+class BatchUnsupported(Exception):
+    """
+    서버가 batch/v1을 지원하지 않음 (워드프레스 5.6 미만 또는 플러그인이 막음)
+    """
+
+def _retry_after_seconds(response):
+    """
+    Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 돌려줍니다. (없으면 None)
+    """
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def _body_size(body):
+    """
+    요청 본문 크기(바이트) - 길이를 알 수 없는 스트리밍 본문은 0
+    """
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+    try:
+        return len(body)
+    except TypeError:
+        return 0
+
+class WordPressClient:
+    """
+    워드프레스 REST API 클라이언트
+
+    Args:
+        base_url: 블로그 URL (예: https://yourblog.com)
+        username: 워드프레스 사용자명
+        app_password: 애플리케이션 비밀번호
+        timeout: 요청 제한 시간(초)
+        max_retries: 429/5xx 및 연결 오류 재시도 횟수
+        backoff_factor: 재시도 간격 배수 (1초, 2초, 4초 ...)
+        pool_size: 호스트당 유지할 연결 수
+    """
+
+    def __init__(self, base_url, username, app_password, timeout=30,
+                 max_retries=3, backoff_factor=1.0, pool_size=10):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._batch_size = None
+
+        credentials = f"{username}:{app_password}"
+        token = base64.b64encode(credentials.encode()).decode('utf-8')
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Basic {token}',
+            'Accept': 'application/json',
+        })
+        # 연결 단계 오류는 요청이 서버에 도달하지 않았으므로 어떤 메서드든 재시도
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=max_retries, connect=max_retries, read=0, status=0,
+                              backoff_factor=backoff_factor),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def api_url(self, endpoint):
+        """
+        엔드포인트 경로(예: 'wp/v2/posts')를 전체 URL로 바꿉니다.
+        """
+        if endpoint.startswith('http'):
+            return endpoint
+        return f"{self.base_url}/wp-json/{endpoint.lstrip('/')}"
+
+    def request(self, method, endpoint, max_retries=None, **kwargs):
+        """
+        REST 요청을 보내고 응답을 돌려줍니다.
+        429/5xx 응답은 Retry-After 또는 지수 백오프 간격으로 다시 시도합니다.
+        max_retries로 이 요청만 재시도 횟수를 바꿀 수 있습니다. (스트리밍 업로드는 0)
+        """
+        method = method.upper()
+        kwargs.setdefault('timeout', self.timeout)
+        retry_statuses = RETRY_STATUSES if method in IDEMPOTENT_METHODS else NON_IDEMPOTENT_RETRY_STATUSES
+        url = self.api_url(endpoint)
+        max_retries = self.max_retries if max_retries is None else max_retries
+
+        for attempt in range(max_retries + 1):
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException:
+                telemetry.record_request('wordpress', seconds=time.perf_counter() - started, error=True)
+                raise
+            telemetry.record_request(
+                'wordpress',
+                bytes_in=len(response.content),
+                bytes_out=_body_size(response.request.body),
+                seconds=time.perf_counter() - started,
+                error=response.status_code >= 400,
+            )
+            if response.status_code not in retry_statuses or attempt == max_retries:
+                return response
+
+            delay = _retry_after_seconds(response)
+            if delay is None:
+                delay = self.backoff_factor * (2 ** attempt)
+            print(f"⏳ 워드프레스 응답 {response.status_code} - {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries})")
+            telemetry.record_retry('wordpress')
+            response.close()
+            time.sleep(delay)
+        return response
+
+    def get(self, endpoint, **kwargs):
+        return self.request('GET', endpoint, **kwargs)
+
+    def post(self, endpoint, **kwargs):
+        return self.request('POST', endpoint, **kwargs)
+
+    # ------------------------------------------
+    # 묶음 요청 (batch/v1)
+    # ------------------------------------------
+    def batch_size(self):
+        """
+        batch/v1 한 번에 보낼 수 있는 최대 요청 수를 돌려줍니다. (지원하지 않으면 0)
+        처음 한 번만 서버에 물어보고 기억합니다.
+        """
+        if self._batch_size is None:
+            response = self.request('OPTIONS', 'batch/v1')
+            if response.status_code != 200:
+                self._batch_size = 0
+            else:
+                try:
+                    self._batch_size = int(response.json()['endpoints'][0]['args']['requests']['maxItems'])
+                except (KeyError, IndexError, TypeError, ValueError):
+                    self._batch_size = DEFAULT_BATCH_SIZE
+        return self._batch_size
+
+    def batch(self, requests_list, validation='normal'):
+        """
+        여러 REST 요청을 한 번에 보냅니다. (batch_size() 개수 이하)
+
+        Args:
+            requests_list: [{'method': 'POST', 'path': '/wp/v2/posts', 'body': {...}}, ...]
+            validation: 'normal'(항목별 처리) 또는 'require-all-validate'(하나라도 검증 실패면 모두 취소)
+
+        Returns:
+            요청 순서대로 [{'status': 응답 코드, 'body': 응답 JSON}, ...]
+        """
+        response = self.post('batch/v1', json={'validation': validation, 'requests': requests_list})
+        if response.status_code == 404:
+            self._batch_size = 0
+            raise BatchUnsupported("batch/v1을 지원하지 않는 서버입니다.")
+        if response.status_code not in (200, 207):
+            raise requests.exceptions.HTTPError(
+                f"batch/v1 요청 실패: {response.status_code} {response.text[:200]}", response=response
+            )
+        return [
+            {'status': item.get('status'), 'body': item.get('body')}
+            for item in response.json().get('responses', [])
+        ]
+
+    # ------------------------------------------
+    # 글
+    # ------------------------------------------
+    def create_post(self, post_data):
+        return self.post('wp/v2/posts', json=post_data)
+
+    def update_post(self, post_id, post_data):
+        return self.post(f'wp/v2/posts/{post_id}', json=post_data)
+
+    def list_posts(self, **params):
+        return self.get('wp/v2/posts', params=params)
+
+    # ------------------------------------------
+    # 카테고리/태그
+    # ------------------------------------------
+    def list_terms(self, taxonomy, **params):
+        """
+        taxonomy: 'categories' 또는 'tags'
+        """
+        return self.get(f'wp/v2/{taxonomy}', params=params)
+
+    def create_term(self, taxonomy, name, **fields):
+        return self.post(f'wp/v2/{taxonomy}', json=dict(fields, name=name))
+
+    # ------------------------------------------
+    # 미디어
+    # ------------------------------------------
+    def upload_media(self, data, filename, content_type, **kwargs):
+        """
+        미디어 라이브러리에 파일을 올립니다.
+        data는 bytes 또는 파일 객체/이터레이터(스트리밍 업로드)일 수 있습니다.
+        """
+        headers = {
+            'Content-Type': content_type,
+            'Content-Disposition': f'attachment; filename="{filename}"',
+        }
+        headers.update(kwargs.pop('headers', {}))
+        return self.post('wp/v2/media', data=data, headers=headers, **kwargs)
+
+    def close(self):
+        self.session.close()